@@ -0,0 +1,95 @@
+"""
+Cold-start time of the command line and the GUI, checked against a time budget.
+
+Every measurement starts a fresh interpreter, so it includes the interpreter start
+and all imports, as a user launching the tool would see it:
+
+* CLI: ``python survey_analyzer.py --help`` until it exits.
+* GUI: ``gui.MainWindow()`` created and drawn once (needs a display).
+
+Afterwards it checks that none of the heavy dependencies (torch, sentence
+transformers, scikit-learn, matplotlib, fpdf2) was imported by then.  The exit
+code is 1 if a budget is exceeded or a heavy module was loaded.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--cli-budget 1.0] [--gui-budget 2.0]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "sklearn", "matplotlib", "fpdf")
+
+# Prints the heavy modules loaded once the program is ready, as JSON on the last line
+_CLI_PROBE = f"""
+import json, sys
+sys.argv = ["survey_analyzer.py", "--help"]
+try:
+    import runpy
+    runpy.run_path("survey_analyzer.py", run_name="__main__")
+except SystemExit:
+    pass
+print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))
+"""
+_GUI_PROBE = f"""
+import json, sys
+import gui
+app = gui.MainWindow()
+app.update()
+print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))
+app.destroy()
+"""
+
+
+def _measure(probe: str, runs: int) -> dict:
+    """Median wall time of *runs* fresh interpreters running *probe*, and the heavy modules it loaded."""
+    times, loaded = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return {"seconds": statistics.median(times), "runs": [round(t, 3) for t in times], "heavy_modules": loaded}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cli-budget", type=float, default=1.0, help="seconds (default: %(default)s)")
+    parser.add_argument("--gui-budget", type=float, default=2.0, help="seconds (default: %(default)s)")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    ok = True
+    for name, probe, budget in (("cli", _CLI_PROBE, args.cli_budget), ("gui", _GUI_PROBE, args.gui_budget)):
+        result = _measure(probe, args.runs)
+        result["budget_seconds"] = budget
+        results[name] = result
+        if "error" in result:
+            print(f"{name}: skipped ({result['error']})")
+            continue
+        within = result["seconds"] <= budget and not result["heavy_modules"]
+        ok = ok and within
+        heavy = ", ".join(result["heavy_modules"]) or "none"
+        print(f"{name}: {result['seconds']:.2f} s (budget {budget:.2f} s), heavy modules loaded: {heavy}"
+              f" -> {'OK' if within else 'OVER BUDGET'}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Parity and throughput of the ONNX embedding backend against the torch backend.
+
+Parity: the organisation comments and topic suggestions of a survey export are
+clustered once per backend, exactly as for the overall report (segmentation,
+merge tree and cut at the default thresholds).  Reported are the cosine
+similarity between the two embeddings of every embedded text and whether every
+text ends up in the same cluster.  The exit code is 1 if the lowest cosine
+similarity is below --min-cosine or any cluster assignment differs.
+
+Throughput: every backend embeds the same texts (the survey's comments, repeated
+to --texts texts) after a warm-up call; the median of --runs runs is reported in
+texts per second, together with the model load time and the size of the model.
+
+Usage:
+    python benchmarks/embedding_parity.py [dummy_survey.json] [--onnx-model DIR] [--texts 2000] [--output FILE]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from embedding_backends import DEFAULT_MODEL_PATH, DEFAULT_ONNX_MODEL_PATH, load_backend  # noqa: E402
+from survey_analyzer import LanguageModelLoader, SurveyAnalyzer  # noqa: E402
+
+
+def _model_size_mb(path: str) -> float:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files) / (1 << 20)
+
+
+def _cluster_labels(data_path: str, loader: LanguageModelLoader) -> tuple:
+    """Cluster id of every organisation and topic segment, and the embedding of every text."""
+    with tempfile.TemporaryDirectory(prefix="hgsfp-parity-") as output:
+        analyzer = SurveyAnalyzer(data_path, output, use_embedding_cache=False, model_loader=loader)
+        analyzer._prepare_results()
+        labels = {}
+        for name, clustering in zip(("organization", "topics"), analyzer._comment_clusterings()):
+            grouped, summaries, _ = clustering.cut(analyzer.cluster_distance_threshold,
+                                                   analyzer.split_similarity_threshold)
+            # Segments in cluster order with the index of their cluster
+            sizes = [int(s.rsplit("(x", 1)[1].rstrip(")")) for s in summaries]
+            labels[name] = list(zip(grouped, np.repeat(np.arange(len(sizes)), sizes).tolist()))
+        return labels, dict(analyzer._embedding_memo)
+
+
+def parity(data_path: str, onnx_model: str) -> dict:
+    torch_labels, torch_embeddings = _cluster_labels(data_path, LanguageModelLoader(DEFAULT_MODEL_PATH, "torch"))
+    onnx_labels, onnx_embeddings = _cluster_labels(data_path, LanguageModelLoader(onnx_model, "onnx"))
+    texts = sorted(set(torch_embeddings) & set(onnx_embeddings))
+    a = np.array([torch_embeddings[t] for t in texts], dtype=np.float64)
+    b = np.array([onnx_embeddings[t] for t in texts], dtype=np.float64)
+    cosine = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    clusters = {}
+    for name in torch_labels:
+        clusters[name] = {"segments": len(torch_labels[name]),
+                          "identical": _same_partition(torch_labels[name], onnx_labels[name])}
+    return {"texts": len(texts), "cosine_min": float(cosine.min()) if len(texts) else None,
+            "cosine_mean": float(cosine.mean()) if len(texts) else None, "clusters": clusters}
+
+
+def _same_partition(left: list, right: list) -> bool:
+    """Whether two (segment, cluster id) lists group the same segments together, whatever the cluster ids."""
+    def groups(pairs: list) -> set:
+        by_cluster = {}
+        for segment, cluster in pairs:
+            by_cluster.setdefault(cluster, []).append(segment)
+        return {tuple(sorted(members)) for members in by_cluster.values()}
+    return groups(left) == groups(right)
+
+
+def throughput(texts: list, backend: str, model_path: str, runs: int) -> dict:
+    start = time.perf_counter()
+    model = load_backend(backend, model_path)
+    load_seconds = time.perf_counter() - start
+    model.encode(texts[:32])
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.encode(texts)
+        times.append(time.perf_counter() - start)
+    seconds = statistics.median(times)
+    return {"backend": backend, "model_mb": round(_model_size_mb(model_path), 2), "load_seconds": round(load_seconds, 3),
+            "seconds": round(seconds, 4), "texts_per_second": round(len(texts) / seconds, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("data_path", nargs="?", default=os.path.join(ROOT, "dummy_survey.json"))
+    parser.add_argument("--onnx-model", default=DEFAULT_ONNX_MODEL_PATH, help="exported model folder (default: %(default)s)")
+    parser.add_argument("--texts", type=int, default=2000, help="texts per throughput run (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="lowest acceptable cosine similarity (default: %(default)s)")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    result = {"parity": parity(args.data_path, args.onnx_model)}
+    p = result["parity"]
+    print(f"Parity on {p['texts']} texts: cosine similarity min {p['cosine_min']:.5f}, mean {p['cosine_mean']:.5f}")
+    for name, c in p["clusters"].items():
+        print(f"  {name}: {c['segments']} segments, cluster assignments {'identical' if c['identical'] else 'DIFFERENT'}")
+
+    analyzer = SurveyAnalyzer(args.data_path, tempfile.gettempdir(), use_embedding_cache=False)
+    analyzer._prepare_results()
+    corpus = list(dict.fromkeys(analyzer.organization + analyzer.topics + [
+        c for store in (analyzer.ml_results, analyzer.al_results, analyzer.il_results)
+        for comments in store.comments.values() for c in comments]))
+    texts = [corpus[i % len(corpus)] for i in range(args.texts)]
+    result["throughput"] = [throughput(texts, "torch", DEFAULT_MODEL_PATH, args.runs),
+                            throughput(texts, "onnx", args.onnx_model, args.runs)]
+    for t in result["throughput"]:
+        print(f"{t['backend']:>6}: {t['texts_per_second']:>9.1f} texts/s, load {t['load_seconds']:.2f} s, "
+              f"model {t['model_mb']:.1f} MB")
+    speedup = result["throughput"][0]["seconds"] / result["throughput"][1]["seconds"]
+    print(f"onnx speed-up: {speedup:.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+    ok = (p["cosine_min"] is None or p["cosine_min"] >= args.min_cosine) and all(
+        c["identical"] for c in p["clusters"].values())
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Time saved by parsing the DejaVu fonts once per process instead of once per document.
+
+Writes one two-page document per lecture (title page and comment page, as in the
+lecture reports but without the chart) plus a combined document with all pages,
+once registering the fonts with FPDF.add_font and once with add_shared_font.
+Before timing, every document is written both ways with a fixed creation date;
+add_shared_font must give byte for byte the same files as add_font, otherwise the
+exit code is 1.
+
+Usage:
+    python benchmarks/font_cache.py [--lectures 60] [--comments 15]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import fpdf
+from fpdf import FPDF
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from survey_analyzer import add_shared_font, shared_fonts_supported  # noqa: E402
+
+FONTS = (("", "DejaVuSans.ttf"), ("b", "DejaVuSans-Bold.ttf"),
+         ("i", "DejaVuSans-Oblique.ttf"), ("bi", "DejaVuSans-BoldOblique.ttf"))
+
+# Otherwise every output embeds the time it was written
+CREATION_DATE = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _document(register, lectures, comments) -> bytes:
+    pdf = FPDF()
+    pdf.set_creation_date(CREATION_DATE)
+    for style, fname in FONTS:
+        register(pdf, "dejavu-sans", style, os.path.join(ROOT, "fonts", fname))
+    for lecture in lectures:
+        pdf.add_page(orientation="landscape")
+        pdf.set_font("dejavu-sans", style="B", size=18)
+        pdf.write(text=f"Survey Results for {lecture}\n\n")
+        pdf.set_font("dejavu-sans", size=18)
+        pdf.write(text="A total of 100 questionnaires have been submitted.")
+        pdf.add_page(orientation="landscape")
+        pdf.set_font("dejavu-sans", style="B", size=18)
+        pdf.write(text="Comments \n\n")
+        pdf.set_font("dejavu-sans", size=11)
+        for txt in comments:
+            pdf.multi_cell(w=0, h=5, text=txt)
+            pdf.ln()
+    return bytes(pdf.output())
+
+
+def _documents(lectures):
+    return [[lecture] for lecture in lectures] + [lectures]
+
+
+def _report(register, lectures, comments) -> float:
+    start = time.perf_counter()
+    for document in _documents(lectures):
+        _document(register, document, comments)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lectures", type=int, default=60)
+    parser.add_argument("--comments", type=int, default=15)
+    args = parser.parse_args()
+
+    lectures = [f"Lecture {i + 1}" for i in range(args.lectures)]
+    comments = [f"Comment {i + 1}: the pace was fine, the examples were helpful (äöü ± ×)." for i in range(args.comments)]
+
+    def add_font(pdf, family, style, fname):
+        pdf.add_font(family, style=style, fname=fname)
+
+    if not shared_fonts_supported():
+        print(f"fpdf2 {fpdf.FPDF_VERSION} is not supported by add_shared_font, which falls back to add_font")
+    # The documents use different glyphs, so state leaking from one copy of a font into the next shows up
+    for document in _documents(lectures):
+        if _document(add_shared_font, document, comments) != _document(add_font, document, comments):
+            print(f"add_shared_font output differs from add_font for {', '.join(document)}")
+            sys.exit(1)
+    print(f"add_shared_font output is identical to add_font for {args.lectures + 1} documents")
+
+    per_document = _report(add_font, lectures, comments)
+    shared = _report(add_shared_font, lectures, comments)
+    print(f"documents: {args.lectures + 1}")
+    print(f"fonts parsed per document: {per_document:.2f} s")
+    print(f"fonts parsed once:         {shared:.2f} s (saves {per_document - shared:.2f} s, {per_document / shared:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
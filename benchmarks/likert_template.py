@@ -0,0 +1,62 @@
+"""
+Per-page render time of the Likert figure: rebuilt for every page vs. cached template.
+
+Usage:
+    python benchmarks/likert_template.py [--pages 40]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from survey_analyzer import LikertFigureTemplate, SurveyConstants  # noqa: E402
+
+
+def _random_pages(n_pages: int, n_questions: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    pages = []
+    for _ in range(n_pages):
+        pct, labels, stats = [], [], []
+        for _ in range(n_questions):
+            counts = rng.integers(0, 30, size=5)
+            p = np.round(counts / max(counts.sum(), 1) * 100, decimals=1)
+            pct.append(p)
+            labels.append([f"{k+1} ({p[k]}%)" if p[k] != 0 else "" for k in range(5)])
+            stats.append(f"Mean and standard deviation: ${rng.uniform(1, 5):.2f} \\pm {rng.uniform(0, 2):.2f}$ $(n={counts.sum()})$")
+        pages.append((pct, labels, stats))
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    args = parser.parse_args()
+
+    constants = SurveyConstants()
+    pages = _random_pages(args.pages, len(constants.answ_keys) - 1)
+
+    start = time.perf_counter()
+    for page in pages:
+        # Previous behaviour: a new figure with all axes and legends per page
+        LikertFigureTemplate(constants).render(*page)
+    rebuilt = (time.perf_counter() - start) / len(pages)
+
+    template = LikertFigureTemplate(constants)
+    start = time.perf_counter()
+    for page in pages:
+        template.render(*page)
+    cached = (time.perf_counter() - start) / len(pages)
+
+    print(f"pages: {len(pages)}")
+    print(f"rebuilt per page: {rebuilt * 1000:.1f} ms")
+    print(f"cached template:  {cached * 1000:.1f} ms ({rebuilt / cached:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Regression run of the command line on the bundled dummy_survey.json.
+
+The sample export is analysed in a fresh interpreter once per chart mode, as a
+user would run it.  For every mode the run must exit cleanly and write all
+expected reports, including the one of the industry lecture, whose number of
+responses (read back from the trend archive the run writes) must match the
+responses that attended it; the wall time and the total size of the PDFs are
+printed.
+Afterwards the export is shuffled and analysed with --append into an empty
+folder, which must give the same statistics as the normal run.  The exit code is
+1 if any check fails.
+
+Usage:
+    python benchmarks/sample_run.py [--data dummy_survey.json] [--output FILE]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from survey_analyzer import CHART_MODES, DEFAULT_INDUSTRY_LECTURE, SurveyAnalyzer  # noqa: E402
+
+# Written for every export, besides one file per lecture
+_FIXED_OUTPUTS = ("results_overall.pdf", "statistics_overview.pdf", "comments_all_lectures.pdf",
+                  "results_all_lectures_combined.pdf")
+
+
+def _industry_attendance(data_path: str) -> Dict[str, int]:
+    """Number of responses per industry lecture title, read from the export like the analyzer does."""
+    with open(data_path, "r", encoding="utf-8") as f:
+        responses = json.load(f)["Data"]
+    counts: Dict[str, int] = {}
+    for response in responses:
+        title = response.get("il_title")
+        if title is None:
+            title = DEFAULT_INDUSTRY_LECTURE if response.get("il_attended") else "DnA"
+        if title != "DnA":
+            counts[title] = counts.get(title, 0) + 1
+    return counts
+
+
+def _archived_industry_counts(archive_path: str) -> Dict[str, int]:
+    """Number of responses per industry lecture the run recorded in the trend archive."""
+    with contextlib.closing(sqlite3.connect(archive_path)) as conn:
+        return dict(conn.execute("SELECT lecture, MAX(n) FROM lecture_answers WHERE timeslot = 'industry' "
+                                 "GROUP BY lecture").fetchall())
+
+
+def _run_mode(data_path: str, output: str, chart_mode: str) -> dict:
+    archive_path = output + ".sqlite"
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "survey_analyzer.py"), data_path, output, "--local",
+                             "--no-embedding-cache", "--chart-mode", chart_mode, "--archive", archive_path],
+                            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    seconds = time.perf_counter() - start
+    pdfs = sorted(name for name in os.listdir(output) if name.endswith(".pdf")) if os.path.isdir(output) else []
+    run = {"chart_mode": chart_mode, "exit_code": result.returncode, "seconds": round(seconds, 2),
+           "pdfs": len(pdfs), "pdf_mb": round(sum(os.path.getsize(os.path.join(output, n)) for n in pdfs) / (1 << 20), 2)}
+    attendance = _industry_attendance(data_path)
+    expected = list(_FIXED_OUTPUTS) + [f"results_{title.lower().replace(' ', '_')}.pdf" for title in attendance]
+    missing = [name for name in expected if name not in pdfs]
+    if result.returncode != 0:
+        run["error"] = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+    elif missing:
+        run["error"] = f"missing {', '.join(missing)}"
+    else:
+        run["industry_responses"] = archived = _archived_industry_counts(archive_path)
+        if archived != attendance:
+            run["error"] = f"industry lecture responses {archived}, expected {attendance}"
+    return run
+
+
+def _append_matches(data_path: str, workdir: str) -> bool:
+    """Whether --append on a shuffled copy of the export reads every response, like a normal run."""
+    with open(data_path, "r", encoding="utf-8") as f:
+        export = json.load(f)
+    random.Random(0).shuffle(export["Data"])
+    shuffled = os.path.join(workdir, "shuffled.json")
+    with open(shuffled, "w", encoding="utf-8") as f:
+        json.dump(export, f)
+    runs = []
+    for append in (False, True):
+        analyzer = SurveyAnalyzer(shuffled, os.path.join(workdir, f"append-{append}"), append=append,
+                                  use_embedding_cache=False)
+        analyzer._fill_results_list()
+        runs.append((analyzer.new_responses, analyzer.ml_results.histograms.tolist(),
+                     analyzer.al_results.histograms.tolist(), analyzer.il_results.histograms.tolist()))
+    return runs[0] == runs[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default=os.path.join(ROOT, "dummy_survey.json"))
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {"data": os.path.basename(args.data), "runs": []}
+    with tempfile.TemporaryDirectory(prefix="hgsfp-sample-") as workdir:
+        for chart_mode in CHART_MODES:
+            run = _run_mode(args.data, os.path.join(workdir, chart_mode), chart_mode)
+            results["runs"].append(run)
+            status = run.get("error", "ok")
+            print(f"{chart_mode:>7}: {run['seconds']:6.2f} s, {run['pdfs']} PDFs, {run['pdf_mb']:.2f} MB, "
+                  f"industry {run.get('industry_responses', '-')} -> {status}")
+        results["append_matches"] = _append_matches(args.data, workdir)
+    print(f" append: shuffled export {'matches' if results['append_matches'] else 'DIFFERS FROM'} the normal run")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    ok = results["append_matches"] and not any("error" in run for run in results["runs"])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Wall time and peak memory of every analysis stage for synthetic surveys of growing size.
+
+Every size is run in a fresh process: a survey is generated with survey_generator,
+then the stages of SurveyAnalyzer._perform_automated_analysis are run one by one
+(reading, statistics, comment clustering, charts and writing the documents).  Per
+stage, the wall time and the peak resident set size of the process so far are
+recorded.  With --trace-memory, the peak of the memory traced by tracemalloc
+(Python objects and NumPy arrays) within each stage is recorded as well; tracing
+slows down the Python-heavy stages several times, so their timings are inflated.
+
+Usage:
+    python benchmarks/scaling.py [--sizes 100 1000 10000 100000] [--output scaling_results.json] [--trace-memory]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from profiling import peak_rss_mb  # noqa: E402
+
+
+class _Stages:
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self.results = []
+        if trace_memory:
+            tracemalloc.start()
+
+    def run(self, name: str, fn) -> None:
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - start
+        traced = tracemalloc.get_traced_memory()[1] / (1 << 20) if self.trace_memory else None
+        rss = peak_rss_mb()
+        self.results.append({"stage": name, "seconds": round(seconds, 4),
+                             "peak_traced_mb": None if traced is None else round(traced, 2),
+                             "peak_rss_mb": None if rss is None else round(rss, 1)})
+        print(f"  {name:<12} {seconds:8.2f} s", file=sys.stderr)
+
+
+def _run_size(responses: int, workdir: str, options: dict) -> dict:
+    """Generate a survey of *responses* responses and time the analysis stages on it."""
+    from survey_generator import write_survey
+    from survey_analyzer import SurveyAnalyzer
+
+    data_path = os.path.join(workdir, f"survey_{responses}.json")
+    generate_start = time.perf_counter()
+    write_survey(data_path, responses, seed=options["seed"])
+    generate_seconds = time.perf_counter() - generate_start
+
+    analyzer = SurveyAnalyzer(data_path, os.path.join(workdir, f"output_{responses}"),
+                              use_embedding_cache=options["embedding_cache"], chart_mode=options["chart_mode"],
+                              render_workers=options["render_workers"])
+    stages = _Stages(options["trace_memory"])
+
+    def statistics() -> None:
+        # The remainder of _prepare_results after reading the responses
+        analyzer._create_overall_results()
+        analyzer._create_overall_morning()
+        analyzer._create_overall_afternoon()
+        for store in (analyzer.ml_results, analyzer.al_results, analyzer.il_results):
+            analyzer._calculate_lecture_statistics(store)
+        analyzer._calculate_overall_statistics(analyzer.overall_results, "Overall Results")
+        analyzer._calculate_overall_statistics(analyzer.overall_morning, "Overall Morning Lecture Results")
+        analyzer._calculate_overall_statistics(analyzer.overall_afternoon, "Overall Afternoon Lecture Results")
+        analyzer._prepared = True
+
+    backends = {}
+
+    def clustering() -> None:
+        # Embedding, segmentation, merge trees and the cut, as for the overall report
+        orga, topics = analyzer._comment_clusterings()
+        backends["organization"] = orga.cut(analyzer.cluster_distance_threshold)[2]
+        backends["topics"] = topics.cut(analyzer.cluster_distance_threshold, analyzer.split_similarity_threshold)[2]
+
+    def charts() -> None:
+        keys = [lecture for lecture, _ in analyzer._ordered_lectures()]
+        keys += ["Overall Results", "Overall Morning Lecture Results", "Overall Afternoon Lecture Results"]
+        with analyzer._rendering():
+            analyzer._render_charts(keys)
+
+    stages.run("read", analyzer._fill_results_list)
+    stages.run("statistics", statistics)
+    stages.run("model_load", lambda: analyzer.language_model)
+    stages.run("clustering", clustering)
+    stages.run("charts", charts)
+    # Everything prepared above is reused, so this is the document assembly and output
+    stages.run("documents", analyzer._perform_automated_analysis)
+    return {
+        "responses": responses,
+        "comments": {"lectures": sum(len(c) for store in (analyzer.ml_results, analyzer.al_results, analyzer.il_results)
+                                     for c in store.comments.values()),
+                     "organization": len(analyzer.organization), "topics": len(analyzer.topics)},
+        "clustering_backends": backends,
+        "generate_seconds": round(generate_seconds, 4),
+        "stages": stages.results,
+        "total_seconds": round(sum(stage["seconds"] for stage in stages.results), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--output", default="scaling_results.json", help="JSON results file")
+    parser.add_argument("--chart-mode", default="raster")
+    parser.add_argument("--render-workers", type=int, default=1)
+    parser.add_argument("--embedding-cache", action="store_true",
+                        help="use the persistent embedding cache (default: embed every comment)")
+    parser.add_argument("--trace-memory", action="store_true", help="also record the tracemalloc peak per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--run-one", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    options = {"chart_mode": args.chart_mode, "render_workers": args.render_workers,
+               "embedding_cache": args.embedding_cache, "trace_memory": args.trace_memory, "seed": args.seed}
+
+    if args.run_one is not None:
+        print(json.dumps(_run_size(args.run_one, args.workdir, options)))
+        return
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="hgsfp-scaling-") as workdir:
+        for size in args.sizes:
+            print(f"{size} responses", file=sys.stderr)
+            command = [sys.executable, os.path.abspath(__file__), "--run-one", str(size), "--workdir", workdir,
+                       "--chart-mode", args.chart_mode, "--render-workers", str(args.render_workers),
+                       "--seed", str(args.seed)]
+            command += ["--embedding-cache"] if args.embedding_cache else []
+            command += ["--trace-memory"] if args.trace_memory else []
+            result = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+            if result.returncode != 0:
+                runs.append({"responses": size, "error": f"exit code {result.returncode}"})
+                continue
+            runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    results = {
+        "benchmark": "scaling",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "options": options,
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=1)
+
+    stages = [stage["stage"] for stage in next((run["stages"] for run in runs if "stages" in run), [])]
+    print(f"{'responses':>10} " + " ".join(f"{name:>11}" for name in stages) + "       total")
+    for run in runs:
+        if "stages" not in run:
+            print(f"{run['responses']:>10} {run['error']}")
+            continue
+        print(f"{run['responses']:>10} " + " ".join(f"{stage['seconds']:>10.2f}s" for stage in run["stages"])
+              + f" {run['total_seconds']:>10.2f}s")
+    print(f"Results written to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
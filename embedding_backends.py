@@ -0,0 +1,246 @@
+# Interchangeable engines computing the sentence embeddings used for comment clustering.
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+DEFAULT_MODEL_PATH = os.path.join(MODELS_DIR, "all-MiniLM-L6-v2")
+# Written by ``export_onnx`` for the default model
+DEFAULT_ONNX_MODEL_PATH = os.path.join(MODELS_DIR, "all-MiniLM-L6-v2-onnx-int8")
+
+# "torch" runs the sentence-transformers model; "onnx" runs a model exported with
+# export_onnx in ONNX Runtime, which needs neither torch nor sentence_transformers;
+# "auto" picks "onnx" if the exported model and onnxruntime are available.
+EMBEDDING_BACKENDS = ("auto", "torch", "onnx")
+# Used by the command line, the GUI, batch runs and the analysis service alike,
+# so a survey gets the same embeddings (and clusters) whichever way it is run.
+DEFAULT_EMBEDDING_BACKEND = "torch"
+DEFAULT_MODEL_PATHS = {"torch": DEFAULT_MODEL_PATH, "onnx": DEFAULT_ONNX_MODEL_PATH}
+
+ONNX_MODEL_FILENAME = "model.onnx"
+EXPORT_INFO_FILENAME = "onnx_export.json"
+# Files of a sentence-transformers model folder the ONNX backend reads
+_ONNX_SUPPORT_FILES = ("config.json", "modules.json", "sentence_bert_config.json", "tokenizer.json",
+                       "tokenizer_config.json", "special_tokens_map.json")
+_ONNX_INPUTS = ("input_ids", "attention_mask", "token_type_ids")
+
+
+class TorchBackend:
+    """The sentence-transformers model, run by PyTorch."""
+
+    name = "torch"
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH) -> None:
+        from sentence_transformers import SentenceTransformer
+        self.model_path = model_path
+        self.model: SentenceTransformer = SentenceTransformer(model_path)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed *texts*; one float32 row per text."""
+        return self.model.encode(texts, convert_to_numpy=True)
+
+
+class OnnxBackend:
+    """
+    A model exported by ``export_onnx``, run by ONNX Runtime on the CPU.
+
+    Tokenisation, mean or CLS pooling and the final normalisation follow the
+    configuration files copied from the sentence-transformers model, so the
+    embeddings match the torch backend up to the error of the int8 weights.
+    Like sentence-transformers, texts are encoded in batches of similar length to
+    keep the padding small.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str = DEFAULT_ONNX_MODEL_PATH, batch_size: int = 32,
+                 threads: int | None = None) -> None:
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError("The onnx embedding backend needs onnxruntime (pip install onnxruntime).") from e
+        from tokenizers import Tokenizer
+
+        onnx_file = os.path.join(model_path, ONNX_MODEL_FILENAME)
+        if not os.path.isfile(onnx_file):
+            raise FileNotFoundError(
+                f"No {ONNX_MODEL_FILENAME} in {model_path}; create it with 'python embedding_backends.py export'.")
+        self.model_path = model_path
+        self.batch_size = batch_size
+        options = onnxruntime.SessionOptions()
+        if threads is not None:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(onnx_file, options, providers=["CPUExecutionProvider"])
+        self._inputs = [i.name for i in self.session.get_inputs()]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_path, "tokenizer.json"))
+        tokenizer_config = _read_json(os.path.join(model_path, "tokenizer_config.json"))
+        st_config = _read_json(os.path.join(model_path, "sentence_bert_config.json"))
+        max_length = st_config.get("max_seq_length") or tokenizer_config.get("model_max_length") or 512
+        self.tokenizer.enable_truncation(max_length=int(max_length))
+        pad_token = tokenizer_config.get("pad_token") or "[PAD]"
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token)
+
+        modules = _read_json(os.path.join(model_path, "modules.json")) or []
+        self.normalize = any(m.get("type", "").endswith("Normalize") for m in modules)
+        pooling = next((m for m in modules if m.get("type", "").endswith("Pooling")), None)
+        pooling_config = _read_json(os.path.join(model_path, pooling["path"], "config.json")) if pooling else {}
+        self.pooling = pooling_config.get("pooling_mode", "mean")
+        if pooling_config.get("pooling_mode_cls_token"):
+            self.pooling = "cls"
+        if self.pooling not in ("mean", "cls"):
+            raise ValueError(f"Unsupported pooling mode {self.pooling!r} in {model_path}")
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed *texts*; one float32 row per text."""
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        embeddings: List[np.ndarray] = []
+        for start in range(0, len(texts), self.batch_size):
+            embeddings.append(self._encode_batch([texts[i] for i in order[start:start + self.batch_size]]))
+        if not embeddings:
+            return np.zeros((0, self.session.get_outputs()[0].shape[-1] or 0), dtype=np.float32)
+        result = np.empty((len(texts), embeddings[0].shape[1]), dtype=np.float32)
+        result[order] = np.concatenate(embeddings)
+        return result
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        feed = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        tokens = self.session.run(None, {name: feed[name] for name in self._inputs})[0]
+        if self.pooling == "cls":
+            pooled = tokens[:, 0]
+        else:
+            mask = feed["attention_mask"][..., np.newaxis].astype(tokens.dtype)
+            pooled = (tokens * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            pooled = pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype(np.float32, copy=False)
+
+
+def _read_json(path: str) -> Any:
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    The concrete backend for *backend*, resolving "auto".
+
+    Only checks that the exported model and onnxruntime exist, without importing
+    anything, so it can be called while the program starts.
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; choose one of {', '.join(EMBEDDING_BACKENDS)}.")
+    if backend != "auto":
+        return backend
+    if (os.path.isfile(os.path.join(DEFAULT_ONNX_MODEL_PATH, ONNX_MODEL_FILENAME))
+            and importlib.util.find_spec("onnxruntime") is not None):
+        return "onnx"
+    return "torch"
+
+
+def default_model_path(backend: str) -> str:
+    """The bundled model folder of *backend*."""
+    return DEFAULT_MODEL_PATHS[resolve_backend(backend)]
+
+
+def load_backend(backend: str, model_path: str | None = None) -> TorchBackend | OnnxBackend:
+    """Load the model at *model_path* (default: the bundled one) with *backend*."""
+    backend = resolve_backend(backend)
+    model_path = model_path if model_path is not None else default_model_path(backend)
+    if backend == "onnx":
+        return OnnxBackend(model_path)
+    if backend == "torch":
+        return TorchBackend(model_path)
+    raise ValueError(f"Unknown embedding backend {backend!r}; choose one of {', '.join(EMBEDDING_BACKENDS)}.")
+
+
+def export_onnx(model_path: str = DEFAULT_MODEL_PATH, output_path: str = DEFAULT_ONNX_MODEL_PATH,
+                quantize: bool = True, opset: int = 17) -> str:
+    """
+    Export the transformer of a sentence-transformers model for the onnx backend.
+
+    The token embeddings of the transformer are exported with dynamic batch and
+    sequence axes; pooling and normalisation are done by OnnxBackend.  With
+    *quantize*, the weights of the matrix multiplications are stored as int8
+    (dynamic quantisation: activations are quantised per batch at run time), which
+    makes the model about four times smaller and faster on most CPUs.  The tokenizer
+    and module configuration are copied next to the model, so *output_path* is a
+    self-contained model folder.  Needs torch, transformers, onnx and onnxruntime.
+
+    Returns:
+        The path of the written ONNX file.
+    """
+    import torch
+    from transformers import AutoModel
+
+    os.makedirs(output_path, exist_ok=True)
+    onnx_file = os.path.join(output_path, ONNX_MODEL_FILENAME)
+    fp32_file = onnx_file + ".fp32" if quantize else onnx_file
+    class TokenEmbeddings(torch.nn.Module):
+        # Positional inputs and a plain tensor output, as the ONNX exporter needs them
+        def __init__(self) -> None:
+            super().__init__()
+            self.transformer = AutoModel.from_pretrained(model_path)
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.transformer(input_ids=input_ids, attention_mask=attention_mask,
+                                    token_type_ids=token_type_ids).last_hidden_state
+
+    model = TokenEmbeddings().eval()
+    dummy = tuple(torch.ones((1, 8), dtype=torch.int64) for _ in _ONNX_INPUTS)
+    axes = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(model, dummy, fp32_file, input_names=list(_ONNX_INPUTS),
+                          output_names=["token_embeddings"], opset_version=opset, dynamo=False,
+                          dynamic_axes={**{name: axes for name in _ONNX_INPUTS}, "token_embeddings": axes})
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_file, onnx_file, weight_type=QuantType.QInt8)
+        os.remove(fp32_file)
+
+    for name in _ONNX_SUPPORT_FILES:
+        if os.path.isfile(os.path.join(model_path, name)):
+            shutil.copy2(os.path.join(model_path, name), output_path)
+    for module in _read_json(os.path.join(model_path, "modules.json")) or []:
+        if module.get("path"):
+            shutil.copytree(os.path.join(model_path, module["path"]), os.path.join(output_path, module["path"]),
+                            dirs_exist_ok=True)
+    info: Dict[str, Any] = {"source": os.path.basename(os.path.normpath(model_path)), "quantized": quantize,
+                            "opset": opset}
+    with open(os.path.join(output_path, EXPORT_INFO_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=1)
+    return onnx_file
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export the sentence-transformers model for the onnx embedding backend.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="export (and int8-quantise) the model to ONNX")
+    export.add_argument("--model", default=DEFAULT_MODEL_PATH, help="sentence-transformers model folder (default: the bundled one)")
+    export.add_argument("--output", default=DEFAULT_ONNX_MODEL_PATH, help="folder to write (default: %(default)s)")
+    export.add_argument("--no-quantize", action="store_true", help="keep the float32 weights")
+    export.add_argument("--opset", type=int, default=17, help="ONNX opset version (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    path = export_onnx(args.model, args.output, quantize=not args.no_quantize, opset=args.opset)
+    print(f"Wrote {path} ({os.path.getsize(path) / (1 << 20):.1f} MB).")
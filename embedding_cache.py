@@ -0,0 +1,303 @@
+# Persistent, content-addressed cache for sentence embeddings used by survey_analyzer.py.
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import threading
+import unicodedata
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+CACHE_VERSION = 1
+
+# Files of a model directory that define what the model computes; their contents
+# (and the size, first and last bytes of the weight files) make up the model identity.
+_MODEL_CONFIG_FILES = ("modules.json", "config.json", "config_sentence_transformers.json", "sentence_bert_config.json")
+_MODEL_WEIGHT_SUFFIXES = (".safetensors", ".bin", ".onnx")
+# Bytes hashed at the start and at the end of every weight file
+_WEIGHT_SAMPLE_BYTES = 1 << 20
+
+_KEY_BYTES = 16
+
+
+def default_cache_dir() -> str:
+    """
+    Per-user cache folder, e.g. %LOCALAPPDATA%\\hgsfp-survey-tool on Windows.
+
+    The HGSFP_CACHE_DIR environment variable overrides the location.
+    """
+    override = os.environ.get("HGSFP_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "hgsfp-survey-tool")
+
+
+def model_identity(model_path: str) -> str:
+    """
+    Identify a sentence-transformer model directory by its name, configuration and weights.
+
+    Modification times are deliberately ignored, because the PyInstaller executable
+    unpacks the model to a fresh temporary folder on every start.  Hashing whole
+    weight files would cost a noticeable part of the start-up, so only their size
+    and their first and last megabyte are hashed; a fine-tuned or re-quantised model
+    of the same shape differs there (safetensors and ONNX files start with their
+    header and every tensor spans both ends of small files).
+    """
+    digest = hashlib.sha1(os.path.basename(os.path.normpath(model_path)).encode("utf-8"))
+    for root, dirs, files in os.walk(model_path):
+        dirs.sort()
+        for name in sorted(files):
+            rel = os.path.relpath(os.path.join(root, name), model_path).replace(os.sep, "/")
+            if name in _MODEL_CONFIG_FILES:
+                digest.update(rel.encode("utf-8"))
+                with open(os.path.join(root, name), "rb") as f:
+                    digest.update(f.read())
+            elif name.endswith(_MODEL_WEIGHT_SUFFIXES):
+                path = os.path.join(root, name)
+                size = os.path.getsize(path)
+                digest.update(f"{rel}:{size}".encode("utf-8"))
+                with open(path, "rb") as f:
+                    digest.update(f.read(_WEIGHT_SAMPLE_BYTES))
+                    if size > _WEIGHT_SAMPLE_BYTES:
+                        f.seek(max(_WEIGHT_SAMPLE_BYTES, size - _WEIGHT_SAMPLE_BYTES))
+                        digest.update(f.read())
+    return f"{os.path.basename(os.path.normpath(model_path))}-{digest.hexdigest()[:16]}"
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on *path* (created if missing), blocking other processes."""
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    # LK_LOCK itself gives up after ten one-second attempts
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _file_stamp(path: str) -> Tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalise *text* and collapse whitespace, so trivial edits hit the cache."""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+class EmbeddingCache:
+    """
+    Size-bounded on-disk cache of sentence embeddings for one model.
+
+    Vectors live in a memory-mapped float32 matrix (``vectors.f32``); a compact hash
+    index (``index.npz``) maps the 128-bit BLAKE2 digest of model identity and
+    normalised text to a row of that matrix.  When ``max_entries`` is reached, the
+    least recently used rows are overwritten.
+
+    Several processes (the GUI, a batch run and the analysis service) may use the
+    same cache folder.  ``lookup``, ``store`` and ``flush`` therefore hold a lock file
+    while they work and first adopt the rows other processes have written since;
+    ``store`` writes the index before it releases the lock, so no two processes
+    fill the same row.  ``flush`` persists the recency information of lookups.
+    """
+
+    def __init__(self, directory: str, model_id: str, max_entries: int = 200_000) -> None:
+        self.model_id = model_id
+        self.max_entries = max_entries
+        self.directory = os.path.join(directory, hashlib.sha1(model_id.encode("utf-8")).hexdigest()[:16])
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._index_path = os.path.join(self.directory, "index.npz")
+        self._meta_path = os.path.join(self.directory, "cache.json")
+        self._lock_path = os.path.join(self.directory, "cache.lock")
+        self._lock = threading.Lock()
+        self._slots: Dict[bytes, int] = {}
+        self._keys = np.zeros((0, _KEY_BYTES), dtype=np.uint8)
+        self._last_used = np.zeros(0, dtype=np.int64)
+        self._clock = 0
+        self._dim: int | None = None
+        self._vectors: np.memmap | None = None
+        self._dirty = False
+        self._index_stamp: Tuple[int, int, int] | None = None
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        with _file_lock(self._lock_path):
+            self._sync()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(
+            f"{self.model_id}\0{normalize_text(text)}".encode("utf-8"), digest_size=_KEY_BYTES
+        ).digest()
+
+    def _sync(self) -> None:
+        """
+        Re-read the index if another process has written it since this instance did.
+
+        Must be called with the lock file held.  The index on disk decides which text
+        is in which row; recency information of this process is kept for rows that
+        still hold the same text.
+        """
+        stamp = _file_stamp(self._index_path)
+        if stamp is None or stamp == self._index_stamp or not os.path.isfile(self._meta_path):
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION or meta.get("model_id") != self.model_id:
+            return
+        with np.load(self._index_path, allow_pickle=False) as index:
+            keys = index["keys"]
+            last_used = index["last_used"]
+        common = min(len(keys), len(self._slots))
+        if common:
+            same = (keys[:common] == self._keys[:common]).all(axis=1)
+            last_used[:common][same] = np.maximum(last_used[:common][same], self._last_used[:common][same])
+        self._dim = meta["dim"]
+        self._open_vectors(max(len(keys), len(self._keys)))
+        self._keys = np.resize(keys, (max(len(keys), len(self._keys)), _KEY_BYTES))
+        self._last_used = np.resize(last_used, len(self._keys))
+        self._slots = {key.tobytes(): slot for slot, key in enumerate(keys)}
+        self._clock = max(self._clock, int(last_used.max()) if len(last_used) else 0)
+        self._index_stamp = stamp
+
+    def _write_index(self) -> None:
+        """Write vectors and index to disk (atomically for the index); needs the lock file."""
+        self._vectors.flush()
+        size = len(self._slots)
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, keys=self._keys[:size], last_used=self._last_used[:size])
+        os.replace(tmp_path, self._index_path)
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "model_id": self.model_id, "dim": self._dim}, f)
+        self._index_stamp = _file_stamp(self._index_path)
+        self._dirty = False
+
+    def _open_vectors(self, capacity: int) -> None:
+        """(Re-)map the vector file with room for *capacity* rows."""
+        os.makedirs(self.directory, exist_ok=True)
+        nbytes = capacity * self._dim * 4
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < nbytes:
+                f.truncate(nbytes)
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self._dim)) if capacity else None
+
+    def lookup(self, texts: Sequence[str]) -> List[np.ndarray | None]:
+        """Return the cached embedding of every text, or None where there is none."""
+        with self._lock, _file_lock(self._lock_path):
+            self._sync()
+            self._clock += 1
+            result: List[np.ndarray | None] = []
+            for text in texts:
+                slot = self._slots.get(self._key(text))
+                if slot is None:
+                    self.misses += 1
+                    result.append(None)
+                else:
+                    self.hits += 1
+                    self._last_used[slot] = self._clock
+                    result.append(np.array(self._vectors[slot]))
+                    self._dirty = True
+            return result
+
+    def store(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Add embeddings to the cache, evicting the least recently used ones if full, and write it."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock, _file_lock(self._lock_path):
+            self._sync()
+            self._clock += 1
+            if self._dim is None:
+                self._dim = int(vectors.shape[1])
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match cache dimension {self._dim}.")
+            new = {}
+            for text, vector in zip(texts, vectors):
+                new[self._key(text)] = vector
+            for key in [key for key in new if key in self._slots]:
+                self._vectors[self._slots[key]] = new.pop(key)
+                self._last_used[self._slots[key]] = self._clock
+            if not new:
+                self._write_index()
+                return
+            if len(new) > self.max_entries:
+                new = dict(list(new.items())[-self.max_entries:])
+            size = len(self._slots)
+            free = max(0, min(len(new), self.max_entries - size))
+            if size + free > len(self._keys):
+                capacity = min(self.max_entries, max(2 * len(self._keys), size + free, 1024))
+                self._keys = np.resize(self._keys, (capacity, _KEY_BYTES))
+                self._last_used = np.resize(self._last_used, capacity)
+                self._open_vectors(capacity)
+            slots = list(range(size, size + free))
+            if len(new) > free:
+                # Full: reuse the rows that have not been used for the longest time.
+                evict = np.argpartition(self._last_used[:size], len(new) - free - 1)[:len(new) - free]
+                for slot in evict:
+                    del self._slots[self._keys[slot].tobytes()]
+                slots += [int(slot) for slot in evict]
+            for slot, (key, vector) in zip(slots, new.items()):
+                self._slots[key] = slot
+                self._keys[slot] = np.frombuffer(key, dtype=np.uint8)
+                self._last_used[slot] = self._clock
+                self._vectors[slot] = vector
+            self._write_index()
+
+    def flush(self) -> None:
+        """Persist which entries were used recently, so eviction keeps them."""
+        with self._lock:
+            if not self._dirty:
+                return
+            with _file_lock(self._lock_path):
+                self._sync()
+                self._write_index()
+
+
+_shared_caches: Dict[tuple, EmbeddingCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def shared_embedding_cache(directory: str, model_id: str, max_entries: int = 200_000) -> EmbeddingCache:
+    """
+    Return the process-wide cache for *directory* and *model_id*.
+
+    Several analyzers in one process (e.g. a batch run) must share one instance;
+    separate instances would overwrite each other's index and vectors on flush.
+    """
+    key = (os.path.abspath(directory), model_id)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = EmbeddingCache(directory, model_id, max_entries)
+        return cache
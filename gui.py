@@ -1,8 +1,19 @@
 import customtkinter as ctk
+import multiprocessing
 import os
+import queue
+import threading
+import time
 import webbrowser
+from typing import TYPE_CHECKING
 from CTkMessagebox import CTkMessagebox
-from survey_analyzer import SurveyAnalyzer
+# survey_analyzer (and with it the scientific stack) is imported after the window
+# is shown, so the application starts quickly.
+if TYPE_CHECKING:
+    from survey_analyzer import SurveyAnalyzer
+
+# Pause of the cluster preview sliders after which the clusters are re-cut
+PREVIEW_DEBOUNCE_MS = 250
 
 class MainWindow(ctk.CTk):
     def __init__(self) -> None:
@@ -15,6 +26,19 @@ class MainWindow(ctk.CTk):
         # customtkinter variables
         self.input_path = ctk.StringVar(self, value='No input path specified')
         self.output_path = ctk.StringVar(self, value='No output path specified')
+        self.append_mode = ctk.BooleanVar(self, value=False)
+        self.cluster_threshold = ctk.DoubleVar(self, value=0.5)
+        self.split_threshold = ctk.DoubleVar(self, value=0.2)
+        # Analyzer kept from the cluster preview, so the analysis does not read the
+        # data and embed the comments a second time
+        self.prepared_analyzer = None
+        # Running analysis: its worker thread reports progress and the outcome through this queue
+        self.analysis_thread = None
+        self.running_analyzer = None
+        self.task_done = None
+        self.analysis_events = queue.Queue()
+        self.analysis_started = 0.0
+        self.closing = False
         #self.geometry('1080x720')
         # Explanatory text
         self.explanatory_frame = ctk.CTkFrame(self)
@@ -51,9 +75,48 @@ class MainWindow(ctk.CTk):
             width=80,
         )
         self.about_icon.grid(row=0, column=0, padx=(10, 5), pady=(5, 5), sticky='w')
+
+        self.append_checkbox = ctk.CTkCheckBox(self.button_frame,text='Only add new responses',variable=self.append_mode)
+        self.append_checkbox.grid(row=0, column=1, padx=5, pady=(5, 5), sticky='e')
+
+        self.preview_button = ctk.CTkButton(self.button_frame,text='Preview clusters',command=self.OpenClusterPreview)
+        self.preview_button.grid(row=0, column=2, padx=5, pady=(5, 5), sticky='e')
         
         self.perform_analysis = ctk.CTkButton(self.button_frame,text='Perform analysis!',command=self.DoAnalysis)
-        self.perform_analysis.grid(row=0, column=2, padx=(5, 10), pady=(5, 5), sticky='e')
+        self.perform_analysis.grid(row=0, column=3, padx=(5, 10), pady=(5, 5), sticky='e')
+
+        # Progress of a running analysis
+        self.progress_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.progress_frame.pack(padx=5,pady=(0,5),fill='both')
+        self.progress_frame.grid_columnconfigure(0, weight=1)
+        self.progress_bar = ctk.CTkProgressBar(self.progress_frame)
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=0, column=0, columnspan=2, padx=10, pady=(5, 2), sticky='we')
+        self.cancel_button = ctk.CTkButton(self.progress_frame,text='Cancel',command=self.CancelAnalysis,state='disabled',width=80)
+        self.cancel_button.grid(row=0, column=2, rowspan=2, padx=(5, 10), pady=(5, 5), sticky='e')
+        self.progress_label = ctk.CTkLabel(self.progress_frame,text='Ready.')
+        self.progress_label.grid(row=1, column=0, padx=10, pady=(0, 2), sticky='w')
+        self.elapsed_label = ctk.CTkLabel(self.progress_frame,text='')
+        self.elapsed_label.grid(row=1, column=1, padx=5, pady=(0, 2), sticky='e')
+        self.protocol('WM_DELETE_WINDOW', self.OnClose)
+
+        # Import the analysis code and load the language model in the background
+        # while the user picks the files
+        self.after(100, self.WarmUp)
+
+    def WarmUp(self) -> None:
+        def load() -> None:
+            try:
+                from survey_service import service_available
+                if service_available():
+                    # The analysis service has the model loaded already
+                    return
+                from survey_analyzer import shared_model_loader
+                shared_model_loader().get()
+            except Exception:
+                # Failures are reported when the analysis needs the model
+                pass
+        threading.Thread(target=load, name='warm-up', daemon=True).start()
 
 
     def OpenAboutWindow(self):
@@ -111,6 +174,128 @@ class MainWindow(ctk.CTk):
     def open_link(self, url):
         webbrowser.open_new_tab(url)
 
+    def CheckPaths(self) -> bool:
+        if not os.path.isfile(self.input_path.get()):
+            CTkMessagebox(
+                title='Input File Warning',
+                message='Please select a valid input JSON file.',
+                icon='warning',
+            )
+            return False
+        if not os.path.isdir(self.output_path.get()):
+            CTkMessagebox(
+                title='Output Path Warning',
+                message='Please select a valid output folder.',
+                icon='warning',
+            )
+            return False
+        return True
+
+    def GetAnalyzer(self) -> 'SurveyAnalyzer':
+        from survey_analyzer import SurveyAnalyzer, shared_model_loader
+        # Reuse the prepared analyzer as long as the same data is analysed the same way
+        settings = (self.input_path.get(), self.output_path.get(), self.append_mode.get())
+        if self.prepared_analyzer is None or self.prepared_analyzer[0] != settings:
+            analyzer = SurveyAnalyzer(
+                data_path=settings[0],
+                output_path=settings[1],
+                append=settings[2],
+                model_loader=shared_model_loader())
+            self.prepared_analyzer = (settings, analyzer)
+        return self.prepared_analyzer[1]
+
+    def OpenClusterPreview(self) -> None:
+        if self.analysis_thread is not None or not self.CheckPaths():
+            return
+        analyzer = self.GetAnalyzer()
+        # Reading the data and embedding the comments runs on the worker thread
+        self.RunInBackground(
+            analyzer,
+            lambda: analyzer.preview_clusters(self.cluster_threshold.get(), self.split_threshold.get()),
+            lambda clusters: self.ShowClusterPreview(analyzer, clusters),
+            'Preview Error')
+
+    def ShowClusterPreview(self, analyzer: 'SurveyAnalyzer', clusters) -> None:
+        self.progress_bar.set(0)
+        self.progress_label.configure(text='Ready.')
+        preview_win = ctk.CTkToplevel(self)
+        preview_win.title("Cluster preview")
+        preview_win.grab_set()
+        distance = ctk.DoubleVar(preview_win, value=self.cluster_threshold.get())
+        split = ctk.DoubleVar(preview_win, value=self.split_threshold.get())
+
+        slider_frame = ctk.CTkFrame(preview_win, fg_color="transparent")
+        slider_frame.pack(padx=10, pady=(6, 2), fill='x')
+        distance_label = ctk.CTkLabel(slider_frame)
+        distance_label.grid(row=0, column=0, padx=5, pady=2, sticky='w')
+        distance_slider = ctk.CTkSlider(slider_frame, from_=0.1, to=1.5, number_of_steps=140, variable=distance)
+        distance_slider.grid(row=0, column=1, padx=5, pady=2)
+        split_label = ctk.CTkLabel(slider_frame)
+        split_label.grid(row=1, column=0, padx=5, pady=2, sticky='w')
+        split_slider = ctk.CTkSlider(slider_frame, from_=0.0, to=1.0, number_of_steps=100, variable=split)
+        split_slider.grid(row=1, column=1, padx=5, pady=2)
+
+        text_frame = ctk.CTkFrame(preview_win, fg_color="transparent")
+        text_frame.pack(padx=10, pady=2, fill='both', expand=True)
+        orga_box = ctk.CTkTextbox(text_frame, width=380, height=360, wrap='word')
+        orga_box.grid(row=0, column=0, padx=5, pady=2)
+        topics_box = ctk.CTkTextbox(text_frame, width=380, height=360, wrap='word')
+        topics_box.grid(row=0, column=1, padx=5, pady=2)
+
+        def show(box, title, entries):
+            box.configure(state='normal')
+            box.delete('1.0', 'end')
+            box.insert('end', f'{title} ({len(entries)} clusters)\n\n' + '\n'.join(entries))
+            box.configure(state='disabled')
+
+        def show_clusters(clusters):
+            self.progress_bar.set(0)
+            self.progress_label.configure(text='Ready.')
+            if preview_win.winfo_exists():
+                show(orga_box, 'Organisation comments', clusters['organization'])
+                show(topics_box, 'Topic suggestions', clusters['topics'])
+
+        def recut():
+            pending[0] = None
+            if not preview_win.winfo_exists():
+                return
+            if self.analysis_thread is not None:
+                # The previous re-cut is still running; try again once it is done
+                pending[0] = preview_win.after(PREVIEW_DEBOUNCE_MS, recut)
+                return
+            # A new split value embeds the merged topic segments and fits a merge tree
+            # again, so re-cuts run on the worker thread like the first preview
+            thresholds = (distance.get(), split.get())
+            self.RunInBackground(analyzer, lambda: analyzer.preview_clusters(*thresholds), show_clusters,
+                                 'Preview Error')
+
+        # The clusters are only re-cut once the slider has rested for a moment
+        pending = [None]
+
+        def update(_value=None):
+            distance_label.configure(text=f'Cluster distance: {distance.get():.2f}')
+            split_label.configure(text=f'Topic split similarity: {split.get():.2f}')
+            if _value is None:
+                return
+            if pending[0] is not None:
+                preview_win.after_cancel(pending[0])
+            pending[0] = preview_win.after(PREVIEW_DEBOUNCE_MS, recut)
+
+        distance_slider.configure(command=update)
+        split_slider.configure(command=update)
+        update()
+        show_clusters(clusters)
+
+        def apply():
+            self.cluster_threshold.set(round(distance.get(), 2))
+            self.split_threshold.set(round(split.get(), 2))
+            preview_win.destroy()
+
+        button_row = ctk.CTkFrame(preview_win, fg_color="transparent")
+        button_row.pack(padx=10, pady=6)
+        ctk.CTkButton(button_row, text="Use these thresholds", command=apply).pack(side="left", padx=5)
+        ctk.CTkButton(button_row, text="Cancel", command=preview_win.destroy).pack(side="left", padx=5)
+
     def SetInputPath(self) -> None:
         selected_file = ctk.filedialog.askopenfilename()
         if selected_file:
@@ -124,43 +309,137 @@ class MainWindow(ctk.CTk):
             self.label_output_path.configure(text=selected_dir)
     
     def DoAnalysis(self) -> None:
-        input_path = self.input_path.get()
-        output_path = self.output_path.get()
-
-        if not os.path.isfile(input_path):
-            CTkMessagebox(
-                title='Input File Warning',
-                message='Please select a valid input JSON file.',
-                icon='warning',
-            )
-            return
-        if not os.path.isdir(output_path):
-            CTkMessagebox(
-                title='Output Path Warning',
-                message='Please select a valid output folder.',
-                icon='warning',
-            )
+        if self.analysis_thread is not None or not self.CheckPaths():
             return
 
-        try:
-            analyzer = SurveyAnalyzer(
-                data_path=input_path,
-                output_path=output_path)
-            analyzer._perform_automated_analysis()
-        except Exception as exc:
-            CTkMessagebox(
-                title='Analysis Error',
-                message=f'Analysis failed:\n{exc}',
-                icon='warning',
-            )
-            return
+        from survey_service import RemoteAnalysis, service_available
 
+        # A running analysis service (survey_service.py) has the model and fonts loaded;
+        # data already read for the cluster preview and append runs stay local.
+        # The job runs with the embedding backend the service has loaded.
+        if self.prepared_analyzer is None and not self.append_mode.get() and service_available():
+            analyzer = RemoteAnalysis(
+                self.input_path.get(),
+                self.output_path.get(),
+                cluster_distance_threshold=self.cluster_threshold.get(),
+                split_similarity_threshold=self.split_threshold.get())
+            work = analyzer.run
+        else:
+            analyzer = self.GetAnalyzer()
+            analyzer.cluster_distance_threshold = self.cluster_threshold.get()
+            analyzer.split_similarity_threshold = self.split_threshold.get()
+            work = analyzer._perform_automated_analysis
+        self.RunInBackground(analyzer, work, self.AnalysisFinished, 'Analysis Error')
+
+    def AnalysisFinished(self, _written) -> None:
+        # The analysis consumes the prepared data (and advances the append state)
+        self.prepared_analyzer = None
+        self.progress_bar.set(1)
+        self.progress_label.configure(text='Analysis finished.')
         CTkMessagebox(
             title='Analysis Info',
             message='Analysis finished successfully!',
             icon='check',
         )
 
+    def RunInBackground(self, analyzer, work, on_done, error_title: str) -> None:
+        """
+        Run *work* on a worker thread, showing the progress *analyzer* reports and
+        letting the user cancel it; *on_done* gets the result on the main loop.
+        """
+        from survey_analyzer import AnalysisCancelled
+
+        # Called on the worker thread; Tk may only be touched from the main loop
+        analyzer.progress = lambda stage, step, steps: self.analysis_events.put(('progress', (stage, step, steps)))
+
+        def run() -> None:
+            try:
+                result = work()
+            except AnalysisCancelled:
+                self.analysis_events.put(('cancelled', None))
+            except Exception as exc:
+                self.analysis_events.put(('error', exc))
+            else:
+                self.analysis_events.put(('done', result))
+
+        for widget in (self.perform_analysis, self.preview_button, self.jsonbutton, self.savebutton, self.append_checkbox):
+            widget.configure(state='disabled')
+        self.cancel_button.configure(state='normal')
+        self.progress_bar.set(0)
+        self.progress_label.configure(text='Starting...')
+        self.analysis_started = time.monotonic()
+        self.running_analyzer = analyzer
+        self.task_done = (on_done, error_title)
+        self.analysis_thread = threading.Thread(target=run, name='analysis', daemon=True)
+        self.analysis_thread.start()
+        self.after(100, self.PollAnalysis)
+
+    def PollAnalysis(self) -> None:
+        """Show the progress reported by the worker thread and handle its outcome."""
+        outcome = None
+        while True:
+            try:
+                kind, value = self.analysis_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                stage, step, steps = value
+                self.progress_bar.set(step / steps)
+                self.progress_label.configure(text=f'{stage} ({step + 1} of {steps})...' if steps > 1 else f'{stage}...')
+            else:
+                outcome = (kind, value)
+        elapsed = int(time.monotonic() - self.analysis_started)
+        self.elapsed_label.configure(text=f'Elapsed: {elapsed // 60}:{elapsed % 60:02d}')
+        if outcome is None:
+            self.after(100, self.PollAnalysis)
+            return
+
+        # Later calls on the analyzer (e.g. preview re-cuts) run on the main loop
+        self.running_analyzer.progress = None
+        self.analysis_thread = None
+        self.running_analyzer = None
+        on_done, error_title = self.task_done
+        for widget in (self.perform_analysis, self.preview_button, self.jsonbutton, self.savebutton, self.append_checkbox):
+            widget.configure(state='normal')
+        self.cancel_button.configure(state='disabled')
+        if self.closing:
+            self.destroy()
+            return
+        kind, value = outcome
+        if kind == 'done':
+            on_done(value)
+            return
+        # An interrupted run may leave the prepared data half read
+        self.prepared_analyzer = None
+        if kind == 'cancelled':
+            self.progress_bar.set(0)
+            self.progress_label.configure(text='Cancelled.')
+        else:
+            self.progress_label.configure(text='Failed.')
+            CTkMessagebox(
+                title=error_title,
+                message=f'{error_title.split()[0]} failed:\n{value}',
+                icon='warning',
+            )
+
+    def CancelAnalysis(self) -> None:
+        if self.analysis_thread is None:
+            return
+        # Stops the run at its next step; PollAnalysis picks up the outcome
+        self.running_analyzer.cancel()
+        self.cancel_button.configure(state='disabled')
+        self.progress_label.configure(text='Cancelling after the current step...')
+
+    def OnClose(self) -> None:
+        # Let a running analysis stop cleanly instead of leaving a half-written PDF
+        if self.analysis_thread is not None:
+            self.closing = True
+            self.CancelAnalysis()
+        else:
+            self.destroy()
+
 if __name__=='__main__':
+    # Rendering worker processes re-run this module in the packaged executable
+    multiprocessing.freeze_support()
     app = MainWindow()
     app.mainloop()
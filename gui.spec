@@ -30,7 +30,6 @@ hiddenimports = [
     'sentence_transformers',
     'sklearn.cluster',
     'fpdf',
-    'pypdf',
     'matplotlib.backends.backend_tkagg',
     'PIL',
 ]
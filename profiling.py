@@ -0,0 +1,124 @@
+# Optional stage-level instrumentation of the analysis pipeline.
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+# Returned by disabled profilers; entering it does nothing and yields None.
+_NO_STAGE = contextlib.nullcontext()
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size (peak working set on Windows) of this process in MB."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / (1 << 20)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+class StageProfiler:
+    """
+    Wall time, CPU time and peak memory of named pipeline stages, plus event counters.
+
+    Stages may nest and repeat (e.g. one "document" stage per output file).  The
+    recording can be saved as a Chrome trace-event file, which chrome://tracing and
+    https://ui.perfetto.dev show as a timeline, and summarised per stage name.
+
+    A disabled profiler returns a shared no-op context from ``stage`` and ignores
+    ``count``, so instrumented code costs a single method call.  CPU time is that of
+    the whole process, and work done in rendering worker processes is not recorded.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, **args: Any) -> contextlib.AbstractContextManager:
+        """
+        Context manager timing the stage *name*; *args* are stored with it.
+
+        When enabled it yields the argument dictionary, so results known only at the
+        end of the stage (e.g. the bytes written) can be added; otherwise None.
+        """
+        if not self.enabled:
+            return _NO_STAGE
+        return self._record(name, args)
+
+    @contextlib.contextmanager
+    def _record(self, name: str, args: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield args
+        finally:
+            wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+            event = {"name": name, "start": start - self._origin, "wall": wall, "cpu": cpu,
+                     "peak_rss_mb": peak_rss_mb(), "tid": threading.get_ident(), "args": args}
+            with self._lock:
+                self.events.append(event)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add *n* to the counter *name*, e.g. the number of embeddings computed."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary_rows(self) -> List[Dict[str, Any]]:
+        """Calls, total wall and CPU time and the highest peak RSS per stage name, in first-seen order."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for event in sorted(self.events, key=lambda e: e["start"]):
+            row = rows.setdefault(event["name"], {"stage": event["name"], "calls": 0, "wall": 0.0, "cpu": 0.0,
+                                                  "peak_rss_mb": None})
+            row["calls"] += 1
+            row["wall"] += event["wall"]
+            row["cpu"] += event["cpu"]
+            if event["peak_rss_mb"] is not None:
+                row["peak_rss_mb"] = max(row["peak_rss_mb"] or 0.0, event["peak_rss_mb"])
+        return list(rows.values())
+
+    def summary(self) -> str:
+        """Human-readable table of summary_rows and the counters."""
+        lines = [f"{'Stage':<22}{'Calls':>7}{'Wall (s)':>11}{'CPU (s)':>11}{'Peak RSS (MB)':>15}"]
+        for row in self.summary_rows():
+            rss = "-" if row["peak_rss_mb"] is None else f"{row['peak_rss_mb']:.0f}"
+            lines.append(f"{row['stage']:<22}{row['calls']:>7}{row['wall']:>11.2f}{row['cpu']:>11.2f}{rss:>15}")
+        lines += [f"{name}: {value}" for name, value in self.counters.items()]
+        return "\n".join(lines)
+
+    def write(self, path: str) -> None:
+        """Save the stages as complete ("X") trace events, with the summary and counters as metadata."""
+        pid = os.getpid()
+        trace = [{"name": e["name"], "ph": "X", "ts": round(e["start"] * 1e6), "dur": round(e["wall"] * 1e6),
+                  "pid": pid, "tid": e["tid"],
+                  "args": {**e["args"], "cpu_ms": round(e["cpu"] * 1e3, 3), "peak_rss_mb": e["peak_rss_mb"]}}
+                 for e in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms",
+                       "otherData": {"stages": self.summary_rows(), "counters": self.counters}}, f, indent=1, default=str)
@@ -2,22 +2,39 @@
 # Optimized/refactored version of survey_analyzer.py by ChatGPT Codex
 from __future__ import annotations
 
+import argparse
+import contextlib
+import copy
+import datetime
+import hashlib
 import io
 import json
+import re
 import sys
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
-from fpdf import FPDF
-from fpdf import FontFace
-from fpdf.enums import CellBordersLayout, TableCellFillMode
 
-from pypdf import PdfReader, PdfWriter
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import AgglomerativeClustering
+# The heavy dependencies (sentence_transformers and torch, scikit-learn, fpdf2 and
+# matplotlib) are imported by the stage that first needs them, so the command line
+# and the GUI start without loading them.
+if TYPE_CHECKING:
+    from fpdf import FPDF
+    from fpdf.fonts import TTFFont
+
+from embedding_backends import (DEFAULT_EMBEDDING_BACKEND, EMBEDDING_BACKENDS, OnnxBackend, TorchBackend,
+                                default_model_path, load_backend, resolve_backend)
+from embedding_cache import EmbeddingCache, default_cache_dir, model_identity, shared_embedding_cache
+from profiling import StageProfiler
+from trend_archive import DEFAULT_EVENT, TrendArchive
+
+
+class AnalysisCancelled(Exception):
+    """Raised by SurveyAnalyzer when a run is stopped with ``cancel``."""
 
 
 # Change: centralized repeated constants into a dataclass for clarity and reuse.
@@ -64,17 +81,780 @@ class SurveyConstants:
     )
 
 
+# Comment clustering backends; "auto" picks "leader" for corpora larger than
+# large_corpus_size, where the quadratic agglomerative clustering gets too expensive.
+CLUSTERING_BACKENDS = ("auto", "agglomerative", "leader")
+DEFAULT_LARGE_CORPUS_SIZE = 5000
+
+# How the Likert charts are embedded in the PDFs: "raster" as 200-dpi PNG images,
+# "vector" as SVG drawings converted to PDF paths with selectable text, "native" drawn
+# directly with fpdf2 (matplotlib is then not imported at all).
+CHART_MODES = ("raster", "vector", "native")
+
+# Aggregated state persisted next to the outputs in append mode.
+STATE_FILENAME = "survey_state.npz"
+STATE_VERSION = 1
+
+# Hashes of the inputs every output was rendered from, kept next to the outputs, so
+# that outputs whose inputs did not change are not rendered again.  Bump
+# REPORT_FORMAT_VERSION whenever the layout of the reports changes.
+MANIFEST_FILENAME = "report_manifest.json"
+REPORT_FORMAT_VERSION = 1
+
+# Title of the industry lecture for exports that only record whether it was
+# attended (il_attended) but not its title, like dummy_survey.json.
+DEFAULT_INDUSTRY_LECTURE = "Industry Talk"
+
+# Survey timestamps look like "/Date(1704093491541)/" (milliseconds since the epoch),
+# optionally followed by a timezone offset.
+_HAPPENED_AT_PATTERN = re.compile(r"/Date\((-?\d+)")
+
+# Read size used by the streaming JSON reader; only about this much of the export is
+# held in memory at any time, independent of the number of responses.
+_JSON_CHUNK_SIZE = 1 << 16
+
+_SVG_FONT_SIZE_PATTERN = re.compile(r"font-size: ?([\d.]+)px")
+_SVG_FONT_FAMILY_PATTERN = re.compile(r"font-family: ?[^;\"]*")
+_SVG_METADATA_PATTERN = re.compile(r"<metadata>.*?</metadata>", re.DOTALL)
+
+
+def _iter_json_array_items(filepath: str, array_key: str, header: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Stream the elements of the top-level array *array_key* of a JSON object file.
+
+    The file is decoded incrementally: every element of the array is yielded as soon
+    as it has been parsed and is not kept afterwards.  All other top-level members
+    (e.g. ``ResultCount``) are decoded in full and stored in *header* as they are
+    encountered.
+
+    Raises:
+        KeyError: if the object has no member *array_key*.
+        ValueError: if the file is not a JSON object or is truncated.
+    """
+    decoder = json.JSONDecoder()
+    with open(filepath, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = f.read(_JSON_CHUNK_SIZE)
+            if not chunk:
+                eof = True
+                return False
+            # Drop the consumed prefix so the buffer never grows with the file.
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def peek() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    raise ValueError(f"Unexpected end of JSON file: {filepath}")
+
+        def expect(chars: str) -> str:
+            nonlocal pos
+            char = peek()
+            if char not in chars:
+                raise ValueError(f"Malformed JSON in {filepath}: expected {chars!r}, found {char!r}")
+            pos += 1
+            return char
+
+        def value() -> Any:
+            nonlocal pos
+            peek()
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if fill():
+                        continue
+                    raise
+                # A number or literal ending exactly at the buffer edge may continue
+                # in the next chunk.
+                if end == len(buf) and fill():
+                    continue
+                pos = end
+                return obj
+
+        if expect("{[") != "{":
+            raise ValueError(f"Expected a JSON object at the top level of {filepath}")
+        found = False
+        closed = peek() == "}"
+        while not closed:
+            key = value()
+            expect(":")
+            if key == array_key:
+                found = True
+                expect("[")
+                if peek() != "]":
+                    while True:
+                        yield value()
+                        if expect(",]") == "]":
+                            break
+                else:
+                    pos += 1
+            else:
+                header[key] = value()
+            closed = expect(",}") == "}"
+        if not found:
+            raise KeyError(array_key)
+
+
+# Likert values 1-5, used to turn answer histograms into sums and sums of squares.
+_LIKERT_VALUES = np.arange(1, 6, dtype=np.int64)
+
+
+def _svg_for_fpdf(svg: bytes) -> bytes:
+    """
+    Adapt a matplotlib SVG (saved with ``svg.fonttype`` "none") for FPDF.image.
+
+    matplotlib gives font sizes in px but draws in pt user units, while fpdf2 reads
+    px as 0.75 pt, so the sizes are rewritten to pt.  Text is set in the DejaVu fonts
+    registered by _change_pdf_font, which matplotlib also uses by default.
+    """
+    text = svg.decode("utf-8")
+    text = _SVG_METADATA_PATTERN.sub("", text)
+    text = _SVG_FONT_SIZE_PATTERN.sub(r"font-size: \1pt", text)
+    text = _SVG_FONT_FAMILY_PATTERN.sub("font-family: dejavu-sans", text)
+    return text.encode("utf-8")
+
+
+def _sufficient_statistics(hist: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return count, sum and sum of squares of the answers described by *hist*.
+
+    *hist* holds the number of 1-5 answers along its last axis and may have any
+    number of leading (group, question) axes.  Merging groups is a plain sum of
+    their histograms, so these statistics never require the raw answers.
+    """
+    return hist.sum(axis=-1), hist @ _LIKERT_VALUES, hist @ (_LIKERT_VALUES * _LIKERT_VALUES)
+
+
+class ResponseStore:
+    """
+    Columnar store for the Likert answers of one timeslot.
+
+    Answers are kept in a single int8 matrix (responses x questions) next to an
+    int32 array holding the lecture id of every row.  Once all responses have been
+    appended, ``finalize`` turns the matrix into per-lecture answer histograms in one
+    pass; all statistics are computed from those histograms.
+    """
+
+    def __init__(self, n_questions: int, capacity: int = 256) -> None:
+        self._answers = np.empty((capacity, n_questions), dtype=np.int8)
+        self._lecture_ids = np.empty(capacity, dtype=np.int32)
+        self._size = 0
+        self._ids: Dict[str, int] = {}
+        self.histograms = np.zeros((0, n_questions, 5), dtype=np.int64)
+        self._base_histograms = self.histograms
+        self.titles: List[str] = []
+        self.comments: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.titles)
+
+    def __contains__(self, title: object) -> bool:
+        return title in self._ids
+
+    def lecture_id(self, title: str) -> int:
+        """Return the id of *title*, registering the lecture on first sight."""
+        lecture_id = self._ids.get(title)
+        if lecture_id is None:
+            lecture_id = self._ids[title] = len(self.titles)
+            self.titles.append(title)
+            self.comments[title] = []
+        return lecture_id
+
+    def restore(self, titles: List[str], histograms: np.ndarray, comments: Dict[str, List[str]]) -> None:
+        """
+        Seed the store with the aggregated state of a previous run.
+
+        The restored histograms and comments are merged with the responses appended
+        afterwards; only the new responses are kept as rows of the answer matrix.
+        """
+        for title in titles:
+            self.lecture_id(title)
+            self.comments[title] = list(comments.get(title, []))
+        self._base_histograms = np.asarray(histograms, dtype=np.int64)
+
+    def append(self, title: str, answers: List[int]) -> None:
+        """Append one response (one answer per question) for *title*."""
+        if self._size == len(self._lecture_ids):
+            # Amortised growth: double the capacity instead of growing row by row.
+            self._answers = np.resize(self._answers, (2 * self._size, self._answers.shape[1]))
+            self._lecture_ids = np.resize(self._lecture_ids, 2 * self._size)
+        self._answers[self._size] = answers
+        self._lecture_ids[self._size] = self.lecture_id(title)
+        self._size += 1
+
+    def finalize(self) -> None:
+        """
+        Trim the buffers and build the answer histograms.
+
+        ``histograms`` holds the number of 1-5 answers for every (lecture, question)
+        pair, computed in a single vectorised pass over the whole matrix.
+
+        Raises:
+            ValueError: if an answer lies outside the 1-5 Likert range.
+        """
+        self._answers = self._answers[:self._size]
+        self._lecture_ids = self._lecture_ids[:self._size]
+        if self._answers.size and (self._answers.min() < 1 or self._answers.max() > 5):
+            raise ValueError("Survey answers must be integers from 1 to 5.")
+        n_lectures, n_questions = len(self.titles), self._answers.shape[1]
+        bins = (self._lecture_ids[:, None] * n_questions + np.arange(n_questions)) * 5 + (self._answers - 1)
+        self.histograms = np.bincount(
+            bins.ravel(), minlength=n_lectures * n_questions * 5
+        ).reshape(n_lectures, n_questions, 5)
+        self.histograms[:len(self._base_histograms)] += self._base_histograms
+
+
+def _leader_clustering(embeddings: np.ndarray, radius: float, block_size: int = 1024) -> np.ndarray:
+    """
+    Threshold ("leader") clustering in a single pass over *embeddings*.
+
+    Every vector joins the nearest existing leader within *radius* (Euclidean) or
+    becomes a new leader.  Vectors are processed in blocks, so distances are computed
+    as block x leaders matrix products: time grows with n x clusters and memory with
+    the block size, instead of the n x n of agglomerative clustering.
+
+    Returns:
+        The cluster label of every vector (leaders are numbered in order of creation).
+    """
+    X = np.asarray(embeddings, dtype=np.float32)
+    labels = np.empty(len(X), dtype=np.int64)
+    leaders = np.empty((0, X.shape[1]), dtype=np.float32)
+    radius_sq = radius * radius
+    for start in range(0, len(X), block_size):
+        block = X[start:start + block_size]
+        block_sq = np.einsum("ij,ij->i", block, block)
+        block_labels = labels[start:start + block_size]
+        unassigned = np.ones(len(block), dtype=bool)
+        if len(leaders):
+            dist_sq = block_sq[:, None] - 2.0 * block @ leaders.T + np.einsum("ij,ij->i", leaders, leaders)[None, :]
+            nearest = dist_sq.argmin(axis=1)
+            unassigned = dist_sq[np.arange(len(block)), nearest] >= radius_sq
+            block_labels[~unassigned] = nearest[~unassigned]
+        # The remaining vectors are clustered among themselves, leader by leader.
+        rest = np.flatnonzero(unassigned)
+        if len(rest):
+            rest_sq = block_sq[rest]
+            dist_sq = rest_sq[:, None] - 2.0 * block[rest] @ block[rest].T + rest_sq[None, :]
+            new_leaders: List[int] = []
+            for j in range(len(rest)):
+                if new_leaders:
+                    k = int(np.argmin(dist_sq[j, new_leaders]))
+                    if dist_sq[j, new_leaders[k]] < radius_sq:
+                        block_labels[rest[j]] = len(leaders) + k
+                        continue
+                block_labels[rest[j]] = len(leaders) + len(new_leaders)
+                new_leaders.append(j)
+            leaders = np.vstack((leaders, block[rest[new_leaders]]))
+    return labels
+
+
+def _adjacent_similarity(embeddings: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every embedding with its successor."""
+    norms = np.linalg.norm(embeddings, axis=1)
+    return np.einsum("ij,ij->i", embeddings[:-1], embeddings[1:]) / (norms[:-1] * norms[1:])
+
+
+def _segment_spans(part_lists: List[List[str]], similarity: np.ndarray,
+                   similarity_threshold: float) -> List[List[Tuple[int, int]]]:
+    """
+    Decide which adjacent parts are merged, for all texts in one vectorised step.
+
+    Args:
+        part_lists: Candidate parts of every text.
+        similarity: Adjacent cosine similarities of all parts, flattened in text
+            order (pairs straddling two texts are ignored).
+        similarity_threshold: Adjacent parts below this cosine similarity are split.
+
+    Returns:
+        For every text, the half-open (start, stop) ranges of its segments as indices
+        into the flattened part list.
+    """
+    # If similarity is below threshold, start a new segment
+    new_segment = similarity < similarity_threshold
+    spans = []
+    offset = 0
+    for parts in part_lists:
+        text_spans = []
+        start = offset
+        for i in range(offset + 1, offset + len(parts)):
+            if new_segment[i - 1]:
+                text_spans.append((start, i))
+                start = i
+        if parts:
+            text_spans.append((start, offset + len(parts)))
+        spans.append(text_spans)
+        offset += len(parts)
+    return spans
+
+
+def _cut_merge_tree(children: np.ndarray, distances: np.ndarray, distance_threshold: float) -> np.ndarray:
+    """
+    Flat cluster labels from a full agglomerative merge tree.
+
+    Gives the same partition as fitting AgglomerativeClustering with
+    ``distance_threshold``: of the n - 1 merges, exactly those that scikit-learn
+    would keep (all but the ``count(distances >= threshold)`` last ones) are applied.
+    """
+    n_leaves = len(children) + 1
+    n_merges = n_leaves - (int(np.count_nonzero(distances >= distance_threshold)) + 1)
+    parent = np.full(n_leaves + n_merges, -1, dtype=np.int64)
+    for i in range(n_merges):
+        parent[children[i]] = n_leaves + i
+    # Parents always have larger ids, so one sweep from the top finds every root.
+    root = np.arange(n_leaves + n_merges)
+    for node in range(n_leaves + n_merges - 1, -1, -1):
+        if parent[node] >= 0:
+            root[node] = root[parent[node]]
+    return np.unique(root[:n_leaves], return_inverse=True)[1]
+
+
+class CommentClustering:
+    """
+    Clustering of one comment corpus, cached so that it can be re-cut at any threshold.
+
+    Part embeddings and their adjacent similarities are computed once.  For every
+    segmentation threshold the segments, their embeddings and the full agglomerative
+    merge tree are built once; applying another distance threshold only cuts that tree.
+    The leader backend has no merge tree and is re-run per threshold, which is cheap.
+    """
+
+    def __init__(self, analyzer: "SurveyAnalyzer", corpus: List[str | None], use_semantic_split: bool = False,
+                 pool_merged_segments: bool = False) -> None:
+        self._analyzer = analyzer
+        self.use_semantic_split = use_semantic_split
+        self.pool_merged_segments = pool_merged_segments
+        comments = [x for x in corpus if x is not None]
+        if use_semantic_split:
+            # Split on commas to get candidate segments, then let semantic
+            # similarity decide which adjacent ones belong together.
+            self._part_lists = [[p.strip() for p in comment.split(",") if p.strip()] for comment in comments]
+        else:
+            # Keep the full response intact; commas are punctuation here.
+            self._part_lists = [[comment.strip()] for comment in comments if comment.strip()]
+        self._flat = [part for parts in self._part_lists for part in parts]
+        self._part_embeddings: np.ndarray | None = None
+        self._similarity: np.ndarray | None = None
+        self._segmentations: Dict[float | None, Tuple[List[str], np.ndarray]] = {}
+        if not self._flat:
+            self._segmentations[None] = ([], np.zeros((0, 0), dtype=np.float32))
+        self._trees: Dict[float | None, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flat)
+
+    def segments(self, split_similarity_threshold: float | None = None) -> Tuple[List[str], np.ndarray]:
+        """
+        The segments to cluster and one embedding per segment.
+
+        The part embeddings computed for segmentation are reused for segments made
+        of a single part; merged segments are embedded again.  With
+        ``pool_merged_segments``, a merged segment instead gets the normalised mean
+        of its parts' directions, scaled to their mean norm.  That saves the second
+        model pass but is only an approximation of the segment's embedding, so some
+        topics end up in different clusters.
+        """
+        key = split_similarity_threshold if self.use_semantic_split and self._flat else None
+        if key in self._segmentations:
+            return self._segmentations[key]
+        if self._part_embeddings is None:
+            # All parts of all comments are embedded in a single batch.
+            self._part_embeddings = self._analyzer._encode(self._flat)
+            self._similarity = _adjacent_similarity(self._part_embeddings)
+        embeddings = self._part_embeddings
+        if key is None:
+            result = (list(self._flat), embeddings)
+        else:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            unit = embeddings / norms
+            segments: List[str] = []
+            vectors = []
+            merged = []
+            for text_spans in _segment_spans(self._part_lists, self._similarity, key):
+                for start, stop in text_spans:
+                    if stop - start == 1:
+                        vectors.append(embeddings[start])
+                    else:
+                        pooled = unit[start:stop].sum(axis=0)
+                        vectors.append(pooled / np.linalg.norm(pooled) * norms[start:stop].mean())
+                        merged.append(len(segments))
+                    segments.append(" ".join(self._flat[start:stop]))
+            segment_embeddings = np.array(vectors, dtype=embeddings.dtype).reshape(len(vectors), -1)
+            if not self.pool_merged_segments and merged:
+                segment_embeddings[merged] = self._analyzer._encode([segments[i] for i in merged])
+            result = (segments, segment_embeddings)
+        self._segmentations[key] = result
+        return result
+
+    def cut(self, distance_threshold: float = 0.5,
+            split_similarity_threshold: float | None = 0.2) -> Tuple[List[str], List[str], str]:
+        """
+        Cluster the corpus at the given thresholds.
+
+        Returns:
+            The segments grouped by cluster, one "<first member> (xN)" summary per
+            cluster, and the name of the clustering backend used.
+        """
+        segments, embeddings = self.segments(split_similarity_threshold)
+        key = split_similarity_threshold if self.use_semantic_split and self._flat else None
+        backend = self._analyzer._clustering_backend_for(len(segments))
+        with self._analyzer.profiler.stage("clustering", backend=backend, segments=len(segments)):
+            if len(segments) < 2:
+                # Nothing to cluster (scikit-learn rejects fewer than two samples).
+                labels = np.zeros(len(segments), dtype=np.int64)
+            elif backend == "leader":
+                labels = _leader_clustering(embeddings, distance_threshold / np.sqrt(2.0))
+            else:
+                if key not in self._trees:
+                    self._trees[key] = self._analyzer._merge_tree(embeddings)
+                labels = _cut_merge_tree(*self._trees[key], distance_threshold)
+
+        clustered_sentences: Dict[int, List[str]] = {}
+        for sentence_id, cluster_id in enumerate(labels):
+            clustered_sentences.setdefault(cluster_id, []).append(segments[sentence_id])
+
+        clustered_answers = []
+        grouped_answers = []
+        for _, cluster in clustered_sentences.items():
+            answ = f"{cluster[0]} (x{len(cluster)})"
+            clustered_answers.append(answ)
+            grouped_answers += cluster
+        return grouped_answers, clustered_answers, backend
+
+
+class LikertFigureTemplate:
+    """
+    Landscape A4 figure with one stacked Likert bar per question, built once and reused.
+
+    Axes, question titles, legends and the layout are the same for every lecture, so
+    only bar widths and positions, bar labels and the statistics lines are updated
+    per page.  A figure must not be drawn from two threads at once; use
+    ``likert_figure_template``, which keeps one template per thread.
+    """
+
+    # Landscape A4 in inches
+    FIG_W, FIG_H = 11.69, 8.27
+
+    # How much vertical space (in figure-fraction) to reserve for the paragraph above
+    TOP_MARGIN    = 0.08   # blank top edge
+    BOTTOM_MARGIN = 0.05   # blank bottom edge
+    PARA_HEIGHT   = 0.10   # paragraph sits here — caller draws it separately,
+                           # so we just leave this space empty at the top
+
+    def __init__(self, constants: SurveyConstants) -> None:
+        questions = constants.answ_keys[:-1]
+        n_q = len(questions)
+
+        # Divide remaining height equally among questions
+        usable_height = 1.0 - self.TOP_MARGIN - self.BOTTOM_MARGIN - self.PARA_HEIGHT
+        slot_h = usable_height / n_q          # total slot per question
+        bar_frac  = 0.65                      # fraction of slot used by bar axes
+        stat_frac = 0.20                      # fraction used by stats text axes
+
+        LEFT   = 0.03
+        WIDTH  = 0.94
+
+        # matplotlib is only imported when a figure is actually needed
+        from matplotlib.figure import Figure
+
+        # A plain Figure (not pyplot) is not registered with any GUI backend
+        self.figure = Figure(figsize=(self.FIG_W, self.FIG_H))
+        self._bar_axes = []
+        self._bars = []
+        self._bar_labels: List[list] = [[] for _ in questions]
+        self._stat_texts = []
+
+        for i, question in enumerate(questions):
+            # Slots are numbered top-to-bottom, so invert for matplotlib's
+            # bottom-origin coordinate system
+            slot_bottom = 1.0 - self.TOP_MARGIN - self.PARA_HEIGHT - (i + 1) * slot_h
+
+            bar_bottom  = slot_bottom + (1.0 - bar_frac - stat_frac) * slot_h
+            stat_bottom = slot_bottom + (1.0 - bar_frac - stat_frac * 1.4) * slot_h
+
+            ax_bar  = self.figure.add_axes((LEFT, bar_bottom,  WIDTH, bar_frac  * slot_h))
+            ax_stat = self.figure.add_axes((LEFT, stat_bottom, WIDTH, stat_frac * slot_h))
+
+            # ── bar axes ──────────────────────────────────────────────────────
+            ax_bar.invert_yaxis()
+            ax_bar.axis("off")
+            ax_bar.set_xlim(0, 100)
+
+            labels = constants.labels_level if question == "level" else constants.labels
+
+            ax_bar.set_title(
+                f"Question {i+1}: {constants.answer_titles[i]}",
+                loc="left", pad=4, fontsize=9
+            )
+            rects = ax_bar.barh(
+                np.full(len(labels), 0),
+                width=np.zeros(len(labels)),
+                height=0.5,
+                color=constants.likert_palette,
+                linewidth=0.02,
+            )
+            ax_bar.legend(
+                ncols=len(labels),
+                handles=rects,
+                labels=labels,
+                bbox_to_anchor=(1.0, 1.08),
+                loc="lower right",
+                bbox_transform=ax_bar.transAxes,
+                fontsize="small",
+            )
+
+            # ── stats axes ────────────────────────────────────────────────────
+            ax_stat.axis("off")
+            stat_text = ax_stat.text(
+                0.0, 0.1, "",
+                transform=ax_stat.transAxes,
+                va="center", ha="left",
+                fontsize=8, color="black",
+            )
+            self._bar_axes.append(ax_bar)
+            self._bars.append(rects)
+            self._stat_texts.append(stat_text)
+
+    def render(self, pct: List[np.ndarray], pct_labels: List[List[str]], stat_lines: List[str],
+               vector: bool = False) -> io.BytesIO:
+        """
+        Fill in the bars of every question and save the figure as an in-memory image.
+
+        Args:
+            pct: Percentage of answers per Likert value, one array per question.
+            pct_labels: Label drawn in the centre of every bar segment.
+            stat_lines: Statistics line shown below every bar.
+            vector: Save an SVG prepared for FPDF.image (see _svg_for_fpdf) instead
+                of a 200-dpi PNG.
+        """
+        for i, rects in enumerate(self._bars):
+            # start_pct für die linke Position jeder gestapelten Bar
+            start_pct = np.concatenate([[0], np.cumsum(pct[i])[:-1]])
+            for rect, left, width in zip(rects, start_pct, pct[i]):
+                rect.set_x(left)
+                rect.set_width(width)
+            for label in self._bar_labels[i]:
+                label.remove()
+            self._bar_labels[i] = self._bar_axes[i].bar_label(rects, labels=pct_labels[i], label_type="center", fontsize=8)
+            self._stat_texts[i].set_text(stat_lines[i])
+
+        if vector:
+            import matplotlib
+
+            buf = io.BytesIO()
+            # Keep text as text, so that it stays selectable in the PDF
+            with matplotlib.rc_context({"svg.fonttype": "none"}):
+                self.figure.savefig(buf, format="svg", bbox_inches="tight")
+            return io.BytesIO(_svg_for_fpdf(buf.getvalue()))
+
+        # Based on ChatGPT Codex
+        buf = io.BytesIO()
+        self.figure.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+        buf.seek(0)
+        return buf
+
+
+_likert_templates = threading.local()
+
+
+def likert_figure_template(constants: SurveyConstants) -> LikertFigureTemplate:
+    """Return this thread's Likert figure template for *constants*, building it on first use."""
+    templates = getattr(_likert_templates, "by_constants", None)
+    if templates is None:
+        templates = _likert_templates.by_constants = {}
+    template = templates.get(constants)
+    if template is None:
+        template = templates[constants] = LikertFigureTemplate(constants)
+    return template
+
+
+class LanguageModelLoader:
+    """
+    Load the sentence embedding model on first use and share it afterwards.
+
+    Loading takes seconds and hundreds of MB, so it is deferred until an embedding is
+    actually needed.  ``warm_up`` starts loading in a background thread, e.g. while
+    the GUI user is still choosing files; ``get`` then simply waits for it.  The
+    model is run by one of the embedding_backends (torch or ONNX Runtime); without
+    *model_path*, the bundled model of that backend is used.
+    """
+
+    def __init__(self, model_path: str | None = None, backend: str = DEFAULT_EMBEDDING_BACKEND) -> None:
+        self.backend = resolve_backend(backend)
+        self.model_path = model_path if model_path is not None else default_model_path(self.backend)
+        self._model: TorchBackend | OnnxBackend | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> TorchBackend | OnnxBackend:
+        with self._lock:
+            if self._model is None:
+                self._model = load_backend(self.backend, self.model_path)
+            return self._model
+
+    def warm_up(self) -> threading.Thread:
+        """Start loading the model in a daemon thread and return that thread."""
+        def load() -> None:
+            try:
+                self.get()
+            except Exception:
+                # Failures are reported by the next get() call, which retries.
+                pass
+        thread = threading.Thread(target=load, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+
+_shared_loaders: Dict[Tuple[str, str], LanguageModelLoader] = {}
+_shared_loaders_lock = threading.Lock()
+
+
+def shared_model_loader(model_path: str | None = None, backend: str = DEFAULT_EMBEDDING_BACKEND) -> LanguageModelLoader:
+    """Return the process-wide loader for *model_path* and *backend*, so the model is loaded only once."""
+    backend = resolve_backend(backend)
+    model_path = model_path if model_path is not None else default_model_path(backend)
+    with _shared_loaders_lock:
+        loader = _shared_loaders.get((model_path, backend))
+        if loader is None:
+            loader = _shared_loaders[(model_path, backend)] = LanguageModelLoader(model_path, backend)
+        return loader
+
+
+# Parsed TTF fonts and their file contents by path, shared by all documents of the process
+_parsed_fonts: Dict[Tuple[str, str], Tuple[TTFFont, bytes]] = {}
+_parsed_fonts_lock = threading.Lock()
+
+# add_shared_font resets the per-document state of fpdf2's TTFFont by hand, so it is only
+# used with the fpdf2 release it was checked against (benchmarks/font_cache.py compares
+# its output with pdf.add_font) and when TTFFont still has exactly these attributes
+SHARED_FONT_FPDF_VERSIONS = ("2.8.9",)
+_SHARED_FONT_ATTRIBUTES = frozenset((
+    "i", "type", "name", "desc", "glyph_ids", "_hbfont", "sp", "ss", "up", "ut", "cw", "ttffile",
+    "fontkey", "emphasis", "scale", "subset", "cmap", "ttfont", "missing_glyphs", "biggest_size_pt",
+    "color_font", "unicode_range", "palette_index", "is_compressed", "is_cff", "is_cid_keyed",
+    "is_symbol", "cff_ros", "collection_font_number"))
+
+
+def shared_fonts_supported() -> bool:
+    """Whether add_shared_font can copy the fonts of the installed fpdf2, or falls back to pdf.add_font."""
+    import fpdf
+    from fpdf.fonts import TTFFont
+
+    attributes = {name for cls in TTFFont.__mro__ for name in getattr(cls, "__slots__", ())}
+    return fpdf.FPDF_VERSION in SHARED_FONT_FPDF_VERSIONS and attributes == _SHARED_FONT_ATTRIBUTES
+
+
+def add_shared_font(pdf: FPDF, family: str, style: str, fname: str) -> None:
+    """
+    Like ``pdf.add_font``, but parses every font file only once per process.
+
+    Parsing a TTF (character widths and glyph ids of the whole cmap) takes tens of
+    milliseconds, so the parsed font is kept and every document gets a copy that
+    shares the read-only metrics.  Glyph usage and the fontTools font, which fpdf2
+    subsets in place when writing, stay per document, so every output file still
+    embeds only the glyphs it uses.
+
+    With an fpdf2 release other than SHARED_FONT_FPDF_VERSIONS this is plain ``pdf.add_font``.
+    """
+    from fontTools import ttLib
+    from fpdf import FPDF
+    from fpdf.fonts import SubsetMap
+
+    if not shared_fonts_supported():
+        pdf.add_font(family, style=style, fname=fname)
+        return
+    style = "".join(sorted(style.upper()))
+    fontkey = f"{family.lower()}{style}"
+    with _parsed_fonts_lock:
+        cached = _parsed_fonts.get((fname, style))
+        if cached is None:
+            parser = FPDF()
+            parser.add_font(family, style=style, fname=fname)
+            with open(fname, "rb") as f:
+                cached = _parsed_fonts[(fname, style)] = (parser.fonts[fontkey], f.read())
+    template, data = cached
+    if fontkey in pdf.fonts or template.is_cff or template.color_font is not None:
+        # Leave anything unusual (and the duplicate warning) to fpdf2 itself
+        pdf.add_font(family, style=style, fname=fname)
+        return
+    font = copy.copy(template)
+    font.i = len(pdf.fonts) + 1
+    font.fontkey = fontkey
+    font.ttfont = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False, lazy=True)
+    font._hbfont = None
+    font.biggest_size_pt = 0
+    font.missing_glyphs = []
+    font.subset = SubsetMap(font)
+    # The descriptor is a PDF object whose id is assigned while a document is written
+    font.desc = copy.copy(template.desc)
+    pdf.fonts[fontkey] = font
+
+
+# Page recipes that need the comment clusterings, which only the main process has
+_CLUSTERING_PAGES = ("_write_orga_topic_pages",)
+
+# Analyzer copy of a rendering worker process, set by _init_render_worker
+_render_worker_analyzer: "SurveyAnalyzer | None" = None
+
+
+def _init_render_worker(analyzer: "SurveyAnalyzer") -> None:
+    global _render_worker_analyzer
+    _render_worker_analyzer = analyzer
+
+
+def _run_render_job(job: Tuple[str, tuple]) -> bytes | None:
+    """Call the named rendering method of the worker's analyzer copy."""
+    method, args = job
+    return getattr(_render_worker_analyzer, method)(*args)
+
+
 class SurveyAnalyzer:
-    def __init__(self, data_path: str | None = None, output_path: str | None = None) -> None:
+    def __init__(self, data_path: str | None = None, output_path: str | None = None, append: bool = False,
+                 embedding_cache_dir: str | None = None, use_embedding_cache: bool = True,
+                 model_loader: LanguageModelLoader | None = None, pool_merged_segments: bool = False,
+                 clustering_backend: str = "auto", large_corpus_size: int = DEFAULT_LARGE_CORPUS_SIZE,
+                 cluster_distance_threshold: float = 0.5, split_similarity_threshold: float = 0.2,
+                 render_workers: int = 1, chart_mode: str = "raster", archive_path: str | None = None,
+                 event: str = DEFAULT_EVENT, year: int | None = None, profile_path: str | None = None,
+                 progress: Callable[[str, int, int], None] | None = None, embedding_backend: str = DEFAULT_EMBEDDING_BACKEND,
+                 log: Callable[[str], None] | None = None) -> None:
         # Change: allow passing an explicit data path to make the class easier to reuse/test.
-        self.data, self.overall_count = self._read_data(data_path)
+        # The responses themselves are streamed in _fill_results_list, so only the
+        # per-lecture result buckets are kept in memory.
+        self.data_path = data_path if data_path is not None else sys.argv[1]
+        self.overall_count = 0
         self.path_out = os.path.join(output_path if output_path is not None else sys.argv[2], "")
-        self.ml_titles, self.al_titles, self.il_title = self._determine_lecture_titles()
+        self.ml_titles: set[str] = set()
+        self.al_titles: set[str] = set()
+        self.il_title: set[str] = set()
         self.constants = SurveyConstants()
-        self.ml_results, self.al_results, self.il_results = self._initialize_results_list()
-        self.overall_results = self._create_lecture_dictionary()
-        self.overall_morning = self._create_lecture_dictionary()
-        self.overall_afternoon = self._create_lecture_dictionary()
+        self.questions = self.constants.answ_keys[:-1]
+        self.ml_results = ResponseStore(len(self.questions))
+        self.al_results = ResponseStore(len(self.questions))
+        self.il_results = ResponseStore(len(self.questions))
+        # Overall answer histograms (questions x Likert values), merged from the lectures
+        self.overall_results = np.zeros((len(self.questions), 5), dtype=np.int64)
+        self.overall_morning = np.zeros((len(self.questions), 5), dtype=np.int64)
+        self.overall_afternoon = np.zeros((len(self.questions), 5), dtype=np.int64)
         self.organization: List[str] = []
         self.topics: List[str] = []
         self.dna_morning = 0
@@ -82,19 +862,84 @@ class SurveyAnalyzer:
         self.dna_il = 0
         # Dictionaries containing mean and standard deviation for each question and lecture timeslot
         self.statistics = {}
+        # Answer histograms (questions x Likert values) under the same keys as self.statistics
+        self.histograms: Dict[str, np.ndarray] = {}
+        # Append mode: resume from the state persisted by the previous run and only
+        # process (and re-render) what the new responses touch.
+        self.append = append
+        self.resumed = False
+        self.new_responses = 0
+        self._last_seen: Dict[str, Any] = {"happend_at": None, "instance_ids": []}
+        # Latest response read so far; it only becomes _last_seen once the whole
+        # export has been read, since exports need not be ordered by HappendAt.
+        self._newest_seen: Dict[str, Any] = {"happend_at": None, "instance_ids": []}
+        # Input hashes of the outputs already in the output folder, by file name
+        self._manifest: Dict[str, str] = {}
+        # Sentence embeddings by text, shared by segmentation and clustering
+        self._embedding_memo: Dict[str, np.ndarray] = {}
+        # Persistent embedding cache shared across runs (opened on first use)
+        self.use_embedding_cache = use_embedding_cache
+        self.embedding_cache_dir = embedding_cache_dir if embedding_cache_dir is not None else os.path.join(default_cache_dir(), "embeddings")
+        self._embedding_cache: EmbeddingCache | None = None
+        self._model_id: str | None = None
+        # Topic segments merged from several parts are embedded again exactly unless
+        # pooling their part embeddings (faster, but approximate) is asked for.
+        self.pool_merged_segments = pool_merged_segments
+        if clustering_backend not in CLUSTERING_BACKENDS:
+            raise ValueError(f"Unknown clustering backend {clustering_backend!r}; choose one of {', '.join(CLUSTERING_BACKENDS)}.")
+        self.clustering_backend = clustering_backend
+        self.large_corpus_size = large_corpus_size
+        # Backend actually used by the most recent _comment_grouper call
+        self.last_clustering_backend: str | None = None
+        # Clustering thresholds used for the PDFs; the merge trees behind them are
+        # cached, so they can be changed (e.g. from a GUI preview) without refitting.
+        self.cluster_distance_threshold = cluster_distance_threshold
+        self.split_similarity_threshold = split_similarity_threshold
+        self._clusterings: Tuple[CommentClustering, CommentClustering] | None = None
+        self._prepared = False
+        # Worker processes for rendering the report pages (0 = one per CPU core)
+        self.render_workers = render_workers if render_workers > 0 else (os.cpu_count() or 1)
+        self._render_pool: ProcessPoolExecutor | None = None
+        # Rendered chart images by histogram key, shared by all documents showing them
+        self._charts: Dict[str, bytes] = {}
+        if chart_mode not in CHART_MODES:
+            raise ValueError(f"Unknown chart mode {chart_mode!r}; choose one of {', '.join(CHART_MODES)}.")
+        self.chart_mode = chart_mode
+        # Multi-year statistics archive the lecture histograms are recorded in, if any.
+        # The year defaults to the one of the latest response.
+        self.archive_path = archive_path
+        self.event = event
+        self.year = year
+        self._latest_happend_at: int | None = None
+        # Stage timings are only recorded when a profile file is requested; a relative
+        # path is taken relative to the output folder.
+        self.profile_path = profile_path
+        self.profiler = StageProfiler(enabled=profile_path is not None)
+        # Called with (stage, step, steps) as the analysis advances, e.g. from a
+        # worker thread of the GUI; cancel() stops the run at the next such step.
+        self.progress = progress
+        self._cancelled = threading.Event()
+        # Receives the messages of the run, one call per message (default: print)
+        self.log = log if log is not None else print
         self.BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        self.MODEL_PATH = os.path.join(self.BASE_DIR, "models", "all-MiniLM-L6-v2")
-        self.language_model = SentenceTransformer(self.MODEL_PATH)
+        # The language model is only loaded when the first embedding is needed; an
+        # explicit model_loader takes precedence over embedding_backend.
+        self.model_loader = model_loader if model_loader is not None else shared_model_loader(backend=embedding_backend)
+        self.MODEL_PATH = self.model_loader.model_path
         self.font_dir = os.path.join(self.BASE_DIR, "fonts")
-        self._add_custom_fonts()
 
-    def _add_custom_fonts(self):
-        pdf = FPDF()
-        pdf.add_font("dejavu-sans", style="", fname=os.path.join(self.font_dir, "DejaVuSans.ttf"))
-        pdf.add_font("dejavu-sans", style="B", fname=os.path.join(self.font_dir, "DejaVuSans-Bold.ttf"))
-        pdf.add_font("dejavu-sans", style="I", fname=os.path.join(self.font_dir, "DejaVuSans-Oblique.ttf"))
-        pdf.add_font("dejavu-sans", style="BI", fname=os.path.join(self.font_dir, "DejaVuSans-BoldOblique.ttf"))
-        self.pdf = pdf
+    @property
+    def language_model(self) -> TorchBackend | OnnxBackend:
+        return self.model_loader.get()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Rendering workers receive a copy of the analyzer without the language model,
+        # the embedding state and other process-local resources.
+        state = self.__dict__.copy()
+        state.update(model_loader=None, _embedding_cache=None, _embedding_memo={},
+                     _clusterings=None, _render_pool=None, _charts={}, profiler=StageProfiler(enabled=False),
+                     progress=None, _cancelled=None, log=print)
+        return state
 
     def _is_meaningful_comment(self, comment: str | None) -> bool:
         """Check if a comment is meaningful (not empty or just minimal characters)."""
@@ -108,6 +953,41 @@ class SurveyAnalyzer:
             return False
         return True
 
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed *texts* with the language model, computing every distinct text only once.
+
+        Embeddings computed earlier in this run, restored from the append-mode state
+        or found in the persistent embedding cache are reused instead of running the
+        model again.
+        """
+        missing = list(dict.fromkeys(t for t in texts if t not in self._embedding_memo))
+        self.profiler.count("texts embedded", len(texts))
+        cache = self._get_embedding_cache() if missing else None
+        if cache is not None:
+            cached = cache.lookup(missing)
+            self._embedding_memo.update((t, v) for t, v in zip(missing, cached) if v is not None)
+            self.profiler.count("embedding cache hits", sum(v is not None for v in cached))
+            missing = [t for t, v in zip(missing, cached) if v is None]
+        if missing:
+            if not self.model_loader.loaded:
+                self._report_progress("Loading the language model")
+                with self.profiler.stage("model load"):
+                    self.model_loader.get()
+            with self.profiler.stage("embedding", texts=len(missing), backend=self.model_loader.backend):
+                embeddings = self.language_model.encode(missing)
+            self.profiler.count("embeddings computed", len(missing))
+            self._embedding_memo.update(zip(missing, embeddings))
+            if cache is not None:
+                cache.store(missing, embeddings)
+                cache.flush()
+        return np.array([self._embedding_memo[t] for t in texts])
+
+    def _get_embedding_cache(self) -> EmbeddingCache | None:
+        if self._embedding_cache is None and self.use_embedding_cache:
+            self._embedding_cache = shared_embedding_cache(self.embedding_cache_dir, self._embedding_model_id())
+        return self._embedding_cache
+
     def _segment_by_semantic_similarity(self, text, similarity_threshold: float = 0.0) -> List[str]:
         """
         Segment text into semantically distinct units using Sentence Transformer embeddings.
@@ -129,39 +1009,36 @@ class SurveyAnalyzer:
         if isinstance(text, list):
             sentences = [s.strip() for s in text if s.strip()]
         else:
-            import re
             sentences = re.split(r'(?<=[.!?])\s+', text)
             sentences = [s.strip() for s in sentences if s.strip()]
-        
-        if len(sentences) <= 1:
-            return sentences
-        
-        # Get embeddings for all sentences
-        embeddings = self.language_model.encode(sentences, convert_to_numpy=True)
-        
-        # Calculate similarity between adjacent sentences
-        segments = []
-        current_segment = sentences[0]
-        
-        for i in range(1, len(sentences)):
-            # Cosine similarity
-            similarity = np.dot(embeddings[i-1], embeddings[i]) / (
-                np.linalg.norm(embeddings[i-1]) * np.linalg.norm(embeddings[i])
-            )
-            
-            # If similarity is below threshold, start a new segment
-            if similarity < similarity_threshold:
-                segments.append(current_segment)
-                current_segment = sentences[i]
-            else:
-                current_segment += " " + sentences[i]
-        
-        segments.append(current_segment)
-        return segments
+        return self._segment_batch([sentences], similarity_threshold)[0]
+
+    def _segment_batch(self, part_lists: List[List[str]], similarity_threshold: float = 0.0) -> List[List[str]]:
+        """
+        Segment many texts at once; batched counterpart of _segment_by_semantic_similarity.
 
-    def _append_answers(self, target: Dict[str, List], prefix: str, entry: Dict, comment_key: str | None = None) -> None:
-        for key in self.constants.answ_keys[:-1]:
-            target[key].append(entry[f"{prefix}{key}"])
+        The candidate parts of all texts are embedded in a single encode call and the
+        adjacent-merge decision is made for all of them in one vectorised step, instead
+        of paying the per-call model overhead once per text.
+
+        Args:
+            part_lists: Already split, stripped candidate parts of every text.
+            similarity_threshold: Cosine-similarity cutoff (0-1). Adjacent parts whose
+                similarity is *below* this value start a new segment.
+
+        Returns:
+            The segments of every text, in input order.
+        """
+        if all(len(parts) <= 1 for parts in part_lists):
+            return [list(parts) for parts in part_lists]
+        flat = [part for parts in part_lists for part in parts]
+        similarity = _adjacent_similarity(self._encode(flat))
+        spans = _segment_spans(part_lists, similarity, similarity_threshold)
+        return [[" ".join(flat[start:stop]) for start, stop in text_spans] for text_spans in spans]
+
+    def _append_answers(self, store: ResponseStore, titles: set[str], title: str, prefix: str, entry: Dict, comment_key: str | None = None) -> None:
+        titles.add(title)
+        store.append(title, [entry[f"{prefix}{key}"] for key in self.questions])
         if comment_key and "sugg_lectures" in entry:
             # Check if the comment_key exists in sugg_lectures before accessing
             if comment_key in entry["sugg_lectures"]:
@@ -169,129 +1046,321 @@ class SurveyAnalyzer:
                 # Only add meaningful comments; no semantic segmentation here —
                 # lecture comments are full sentences and should not be split apart.
                 if self._is_meaningful_comment(comment):
-                    target["comments"].append(comment)
+                    store.comments[title].append(comment)
 
-    def _read_data(self, data_path: str | None = None) -> Tuple[List[Dict],int]:
+    def _read_data(self, data_path: str | None = None) -> Iterator[Dict]:
         """
-        Load survey data from JSON file.
+        Stream the survey responses from a JSON file, one record at a time.
+
+        ``ResultCount`` is taken from the file header and stored in
+        ``self.overall_count``.  The ``Data`` array is never materialised as a
+        whole, so memory use does not grow with the number of responses.
 
         Change: made the path parameter explicit and defaulted to sys.argv[1]
         to keep existing CLI behavior while improving reusability.
         """
         filepath = data_path if data_path is not None else sys.argv[1]
-        with open(filepath, "r", encoding="utf-8") as f:
-            jfile = json.load(f)
-            data_tmp = jfile["Data"]
-            overall_count = jfile["ResultCount"]
-        return data_tmp, overall_count
+        header: Dict[str, Any] = {}
+        yield from _iter_json_array_items(filepath, "Data", header)
+        self.overall_count = header["ResultCount"]
+
+    def _create_overall_results(self) -> None:
+        # Merge the per-timeslot sufficient statistics instead of re-reading answers.
+        self.overall_results = (
+            self.ml_results.histograms.sum(axis=0)
+            + self.al_results.histograms.sum(axis=0)
+            + self.il_results.histograms.sum(axis=0)
+        )
+
+    def _create_overall_morning(self):
+        self.overall_morning = self.ml_results.histograms.sum(axis=0)
 
-    def _determine_lecture_titles(self) -> Tuple[set[str], set[str], set[str]]:
+    def _create_overall_afternoon(self):
+        self.overall_afternoon = self.al_results.histograms.sum(axis=0)
+
+    def _response_key(self, elem: Dict) -> Tuple[int, Any]:
+        match = _HAPPENED_AT_PATTERN.match(str(elem.get("HappendAt")))
+        if match is None:
+            raise ValueError("Append mode requires a HappendAt timestamp on every response.")
+        return int(match.group(1)), elem.get("InstanceId")
+
+    def _is_new_response(self, elem: Dict) -> bool:
         """
-        Extract morning and afternoon lecture titles.
+        Check whether *elem* was submitted after the last response seen by the previous
+        run, and advance the newest ``HappendAt``/``InstanceId`` read in this run.
+
+        Every response is compared with the state of the previous run only, so the
+        order of the responses in the export does not matter.
         """
-        ml_titles_tmp = set()
-        al_titles_tmp = set()
-        il_title_tmp = set()
-        for entry in self.data:
-            if entry["ml_title"]!="DnA":
-                ml_titles_tmp.add(entry["ml_title"])
-            if entry["al_title"]!="DnA":
-                al_titles_tmp.add(entry["al_title"])
-            if entry["il_title"]!="DnA":
-                il_title_tmp.add(entry["il_title"])
-        return ml_titles_tmp, al_titles_tmp, il_title_tmp
+        happend_at, instance_id = self._response_key(elem)
+        last = self._last_seen
+        if last["happend_at"] is not None and (
+            happend_at < last["happend_at"]
+            or (happend_at == last["happend_at"] and instance_id in last["instance_ids"])
+        ):
+            return False
+        newest = self._newest_seen
+        if newest["happend_at"] is None or happend_at > newest["happend_at"]:
+            self._newest_seen = {"happend_at": happend_at, "instance_ids": [instance_id]}
+        elif happend_at == newest["happend_at"]:
+            newest["instance_ids"].append(instance_id)
+        return True
 
-    def _create_lecture_dictionary(self) -> Dict[str, List[int]]:
+    def _track_survey_date(self, elem: Dict) -> None:
+        match = _HAPPENED_AT_PATTERN.match(str(elem.get("HappendAt")))
+        if match is not None and (self._latest_happend_at is None or int(match.group(1)) > self._latest_happend_at):
+            self._latest_happend_at = int(match.group(1))
+
+    def _survey_year(self) -> int:
+        if self.year is not None:
+            return self.year
+        if self._latest_happend_at is None:
+            raise ValueError("The survey year cannot be told from the responses; pass it explicitly (--year).")
+        return datetime.datetime.fromtimestamp(self._latest_happend_at / 1000, datetime.timezone.utc).year
+
+    def _archive_statistics(self) -> None:
+        """Record the lecture histograms of this survey in the trend archive."""
+        lectures = [(timeslot, lecture, store.histograms[i])
+                    for timeslot, store in (("morning", self.ml_results), ("afternoon", self.al_results),
+                                            ("industry", self.il_results))
+                    for i, lecture in enumerate(store.titles)]
+        year = self._survey_year()
+        TrendArchive(self.archive_path).record(
+            self.event, year, list(zip(self.questions, self.constants.answer_titles)), lectures,
+            responses=self.overall_count, source=os.path.abspath(self.data_path))
+        self.log(f"Archived the statistics of {self.event} {year} in {self.archive_path}.")
+
+    def _state_path(self) -> str:
+        return self.path_out + STATE_FILENAME
+
+    def _embedding_model_id(self) -> str:
+        if self._model_id is None:
+            self._model_id = model_identity(self.MODEL_PATH)
+        return self._model_id
+
+    def _load_state(self) -> bool:
         """
-        Create empty result dictionary for each lecture.
+        Restore the aggregated state written by a previous append-mode run.
+
+        Returns:
+            False if there is no state file in the output folder yet.
         """
-        return {key: [] for key in self.constants.answ_keys}
+        path = self._state_path()
+        if not os.path.isfile(path):
+            return False
+        with np.load(path, allow_pickle=False) as state:
+            meta = json.loads(str(state["meta"]))
+            if meta.get("version") != STATE_VERSION:
+                raise ValueError(f"Unsupported survey state version in {path}; delete it to start over.")
+            for prefix, store, titles in (("ml", self.ml_results, self.ml_titles),
+                                          ("al", self.al_results, self.al_titles),
+                                          ("il", self.il_results, self.il_title)):
+                timeslot = meta["timeslots"][prefix]
+                store.restore(timeslot["titles"], state[f"{prefix}_histograms"], timeslot["comments"])
+                titles.update(timeslot["titles"])
+            self.dna_morning, self.dna_afternoon, self.dna_il = meta["dna"]
+            self.organization = meta["organization"]
+            self.topics = meta["topics"]
+            self._last_seen = meta["last_seen"]
+            # Embeddings are only reusable when they come from the same model.
+            if meta["embedding_model"] == self._embedding_model_id():
+                self._embedding_memo = dict(zip(meta["embedding_texts"], state["embeddings"]))
+        return True
 
-    def _create_overall_results(self) -> None:
-        # Change: avoid mutating keys and build the totals in a single pass.
-        for question in self.constants.answ_keys[:-1]:
-            combined: list[int] = []
-            for title in self.ml_titles:
-                combined.extend(self.ml_results[title][question])
-            for title in self.al_titles:
-                combined.extend(self.al_results[title][question])
-            for title in self.il_title:
-                combined.extend(self.il_results[title][question])
-            self.overall_results[question] = combined
-        self.overall_results.pop("comments", None)
+    def _save_state(self) -> None:
+        """
+        Persist histograms, comments, embeddings and the last seen response next to
+        the outputs, so that the next append-mode run can resume from them.
+        """
+        meta = {
+            "version": STATE_VERSION,
+            "timeslots": {
+                prefix: {"titles": store.titles, "comments": store.comments}
+                for prefix, store in (("ml", self.ml_results), ("al", self.al_results), ("il", self.il_results))
+            },
+            "dna": [self.dna_morning, self.dna_afternoon, self.dna_il],
+            "organization": self.organization,
+            "topics": self.topics,
+            "last_seen": self._last_seen,
+            "embedding_model": self._embedding_model_id(),
+            "embedding_texts": list(self._embedding_memo),
+        }
+        embeddings = (np.stack(list(self._embedding_memo.values())) if self._embedding_memo
+                      else np.zeros((0, 0), dtype=np.float32))
+        tmp_path = self._state_path() + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                meta=np.array(json.dumps(meta)),
+                ml_histograms=self.ml_results.histograms,
+                al_histograms=self.al_results.histograms,
+                il_histograms=self.il_results.histograms,
+                embeddings=embeddings,
+            )
+        os.replace(tmp_path, self._state_path())
 
-    def _create_overall_morning(self):
-        for question in self.constants.answ_keys[:-1]:
-            combined: list[int] = []
-            for lecture in self.ml_results.values():
-                combined.extend(lecture[question])
-            self.overall_morning[question]=combined
-        self.overall_morning.pop("comments", None)
+    def _lecture_filename(self, title: str) -> str:
+        return f"results_{title.lower().replace(' ', '_')}.pdf"
 
-    def _create_overall_afternoon(self):
-        for question in self.constants.answ_keys[:-1]:
-            combined: list[int] = []
-            for lecture in self.al_results.values():
-                combined.extend(lecture[question])
-            self.overall_afternoon[question]=combined
-        self.overall_afternoon.pop("comments", None)
+    def _needs_render(self, filename: str, digest: str) -> bool:
+        """
+        Decide whether an output has to be (re-)written.
 
-    def _initialize_results_list(self) -> Tuple[Dict[str, Dict], Dict[str, Dict], Dict[str, Dict]]:
+        An output is skipped only if it exists and was rendered from inputs with the
+        same *digest* (see _output_digests).
+        """
+        return self._manifest.get(filename) != digest or not os.path.exists(self.path_out + filename)
+
+    def _load_manifest(self) -> None:
+        path = self.path_out + MANIFEST_FILENAME
+        self._manifest = {}
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == REPORT_FORMAT_VERSION:
+                self._manifest = manifest["outputs"]
+
+    def _save_manifest(self) -> None:
+        path = self.path_out + MANIFEST_FILENAME
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": REPORT_FORMAT_VERSION, "outputs": self._manifest}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _digest(self, *parts: Any) -> str:
+        """
+        Hash JSON-serialisable values and numpy arrays, together with the report
+        format version and the rendering settings every output depends on.
         """
-        Initialize lecture result dictionaries.
+        digest = hashlib.sha256(json.dumps([REPORT_FORMAT_VERSION, self.chart_mode]).encode("utf-8"))
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                digest.update(f"{part.dtype}{part.shape}".encode("utf-8"))
+                digest.update(np.ascontiguousarray(part).tobytes())
+            else:
+                digest.update(json.dumps(part, sort_keys=True).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _output_digests(self) -> Dict[str, str]:
         """
-        ml_results_tmp = {elem: self._create_lecture_dictionary() for elem in self.ml_titles}
-        al_results_tmp = {elem: self._create_lecture_dictionary() for elem in self.al_titles}
-        il_results_tmp = {elem:self._create_lecture_dictionary() for elem in self.il_title}
-        return ml_results_tmp, al_results_tmp, il_results_tmp
+        Hash exactly the inputs of every output file.
+
+        A lecture report depends on its title, answers and comments (and, for the
+        industry lecture, the number of non-attendees).  The combined files are hashed
+        from the hashes of their parts.  The overall report also depends on the
+        clustering inputs and settings.
+        """
+        lecture_digests = {}
+        for store in (self.ml_results, self.al_results, self.il_results):
+            for lecture in store:
+                dna = self.dna_il if store is self.il_results else None
+                lecture_digests[lecture] = self._digest("lecture", lecture, self.histograms[lecture],
+                                                        store.comments[lecture], dna)
+        ordered = self._ordered_lectures()
+        digests = {self._lecture_filename(lecture): lecture_digests[lecture] for lecture in lecture_digests}
+        digests["results_all_lectures_combined.pdf"] = self._digest(
+            "combined", [lecture_digests[lecture] for lecture, _ in ordered])
+        overview = self._digest(
+            "overview", [[title, self.histograms[title].tolist()] for title, _ in ordered],
+            [self.histograms[key].tolist() for key in
+             ("Overall Results", "Overall Morning Lecture Results", "Overall Afternoon Lecture Results")])
+        digests["statistics_overview.pdf"] = overview
+        digests["comments_all_lectures.pdf"] = self._digest(
+            "comments", overview, [[title, store.comments[title]] for title, store in ordered])
+        digests["results_overall.pdf"] = self._digest(
+            "overall", self.overall_results, self.overall_morning, self.overall_afternoon,
+            [self.overall_count, self.dna_morning, self.dna_afternoon],
+            lecture_digests.get(self._industry_lecture()),
+            self.organization, self.topics,
+            [self.cluster_distance_threshold, self.split_similarity_threshold, self.clustering_backend,
+             self.large_corpus_size, self.pool_merged_segments, self._embedding_model_id()])
+        return digests
 
     def _fill_results_list(self) -> None:
         """
-        Populate the result dictionaries from the raw survey data.
+        Populate the columnar result stores while streaming the raw survey data.
+
+        Lecture titles are collected on the fly, so the responses are read exactly once.
+        In append mode the previous state is restored first and only responses after
+        the last seen ``HappendAt``/``InstanceId`` are processed.
         """
-        for elem in self.data:
+        if self.append:
+            self.resumed = self._load_state()
+        unknown_attendance = 0
+        for elem in self._read_data(self.data_path):
+            if self.year is None:
+                # Also needed when a batch run archives the statistics afterwards
+                self._track_survey_date(elem)
+            if self.append and not self._is_new_response(elem):
+                continue
+            self.new_responses += 1
             ml_title_tmp = elem["ml_title"]
             al_title_tmp = elem["al_title"]
-            il_title_tmp = elem["il_title"]
+            il_title_tmp = elem.get("il_title")
+            if il_title_tmp is None:
+                # Some exports only say whether the industry lecture was attended
+                if "il_attended" not in elem:
+                    unknown_attendance += 1
+                il_title_tmp = DEFAULT_INDUSTRY_LECTURE if elem.get("il_attended") else "DnA"
 
             # Handle morning lecture
             if ml_title_tmp == "DnA":
                 self.dna_morning += 1
             else:
-                self._append_answers(self.ml_results[ml_title_tmp], "ml_", elem, "ml_comment")
+                self._append_answers(self.ml_results, self.ml_titles, ml_title_tmp, "ml_", elem, "ml_comment")
             
             # Handle afternoon lecture
             if al_title_tmp == "DnA":
                 self.dna_afternoon += 1
             else:
-                self._append_answers(self.al_results[al_title_tmp], "al_", elem, "al_comment")
+                self._append_answers(self.al_results, self.al_titles, al_title_tmp, "al_", elem, "al_comment")
             
             # Handle industry lecture
             if il_title_tmp == "DnA":
                 self.dna_il += 1
             else:
-                self._append_answers(self.il_results[il_title_tmp], "il_", elem, "il_comment")
+                self._append_answers(self.il_results, self.il_title, il_title_tmp, "il_", elem, "il_comment")
             
             # Handle organization and topics suggestions
             if "sugg_organization" in elem:
                 self.organization.append(elem["sugg_organization"])
             if "sugg_topics" in elem:
                 self.topics.append(elem["sugg_topics"])
-    
+
+        if unknown_attendance:
+            self.log(f"Warning: {unknown_attendance} responses have neither il_title nor il_attended; "
+                     "they are counted as not having attended the industry lecture.")
+        if self.append:
+            self._advance_last_seen()
+        for store in (self.ml_results, self.al_results, self.il_results):
+            store.finalize()
+
+    def _advance_last_seen(self) -> None:
+        """Move _last_seen to the newest response of the export once it has been read."""
+        last, newest = self._last_seen, self._newest_seen
+        if newest["happend_at"] is None:
+            return
+        if last["happend_at"] is None or newest["happend_at"] > last["happend_at"]:
+            self._last_seen = newest
+        else:
+            # Only responses at the previous latest timestamp were new
+            last["instance_ids"] += newest["instance_ids"]
+        self._newest_seen = {"happend_at": None, "instance_ids": []}
+
     def _change_pdf_font(self,pdf) -> None:
-        pdf.add_font("dejavu-sans", style="", fname=os.path.join(self.BASE_DIR, "fonts", "DejaVuSans.ttf"))
-        pdf.add_font("dejavu-sans", style="b", fname=os.path.join(self.BASE_DIR, "fonts", "DejaVuSans-Bold.ttf"))
-        pdf.add_font("dejavu-sans", style="i", fname=os.path.join(self.BASE_DIR, "fonts", "DejaVuSans-Oblique.ttf"))
-        pdf.add_font("dejavu-sans", style="bi", fname=os.path.join(self.BASE_DIR, "fonts", "DejaVuSans-BoldOblique.ttf"))
+        # The font files are parsed once per process and shared by all documents
+        add_shared_font(pdf, "dejavu-sans", "", os.path.join(self.font_dir, "DejaVuSans.ttf"))
+        add_shared_font(pdf, "dejavu-sans", "b", os.path.join(self.font_dir, "DejaVuSans-Bold.ttf"))
+        add_shared_font(pdf, "dejavu-sans", "i", os.path.join(self.font_dir, "DejaVuSans-Oblique.ttf"))
+        add_shared_font(pdf, "dejavu-sans", "bi", os.path.join(self.font_dir, "DejaVuSans-BoldOblique.ttf"))
 
     # Adapted from author Sean Benoit, retrieved at 09/02/2026: Source - https://www.fpdf.org/en/script/script56.php
-    def _create_comment_pdf(self, comments: List[str]) -> io.BytesIO:
+    def _write_comment_page(self, pdf: FPDF, comments: List[str]) -> None:
         """
-        Create a PDF page containing bullet list of comments.
+        Add a page containing bullet list of comments.
         """
-        pdf = FPDF(orientation="landscape")
-        pdf.add_page()
-        self._change_pdf_font(pdf)
+        pdf.add_page(orientation="landscape")
         pdf.set_font("dejavu-sans", style="B", size=18)
         pdf.write(text="Comments \n\n")
         for txt in comments:
@@ -302,69 +1371,63 @@ class SurveyAnalyzer:
             pdf.set_font("dejavu-sans", size=11)
             pdf.multi_cell(w=0, h=5, text=txt)
             pdf.ln()
-        page_output = io.BytesIO(pdf.output())
-        return page_output
-
-    # Based on ChatGPT Codex
-    def _save_image_in_ram(self, fig) -> io.BytesIO:
-        """
-        Save matplotlib figure to an in-memory PNG.
-        """
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
-        buf.seek(0)
-        return buf
 
     def _labels_for_question(self, question: str) -> Tuple[str, ...]:
         return self.constants.labels_level if question == "level" else self.constants.labels
 
-    def _calculate_lecture_statistics(self, results_dict: Dict[str, Dict[str, List[int]]]) -> None:
+    def _question_statistics(self, hist: np.ndarray) -> List[Dict[str, Tuple[float | None, float | None, int]]]:
         """
-        Calculate mean and standard deviation for all questions in each lecture.
-        
+        Mean, sample standard deviation and count for every question of every group.
+
         Only calculates statistics if the number of responses for a question exceeds 5.
-        
+
         Args:
-            results_dict: Dictionary with structure {lecture_title: {question: [answers]}}
+            hist: Answer histograms with shape (groups, questions, 5).
+
+        Returns:
+            One {question: (mean, std, n)} dictionary per group.
         """
-        for lecture_title, questions_dict in results_dict.items():
+        count, total, total_sq = _sufficient_statistics(hist)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+            # Sample variance (Bessel's correction, ddof=1) from exact integer sums
+            std = np.sqrt((count * total_sq - total * total) / (count * (count - 1)))
+        stats = []
+        for g in range(hist.shape[0]):
             # Use a dictionary to map questions to their stats for explicit ordering
             stats_dict = {}
-            for question in self.constants.answ_keys[:-1]:
-                results_arr = questions_dict[question]
-                n = len(results_arr)
+            for i, question in enumerate(self.questions):
+                n = int(count[g, i])
                 if n > 5:
-                    mean = float(np.mean(results_arr))
-                    # Use ddof=1 for sample standard deviation (Bessel's correction)
-                    std = float(np.std(results_arr, ddof=1))
+                    stats_dict[question] = (float(mean[g, i]), float(std[g, i]), n)
                 else:
-                    mean = None
-                    std = None
-                stats_dict[question] = (mean, std, n)
+                    stats_dict[question] = (None, None, n)
+            stats.append(stats_dict)
+        return stats
+
+    def _calculate_lecture_statistics(self, store: ResponseStore) -> None:
+        """
+        Calculate mean and standard deviation for all questions in each lecture.
+        
+        Only calculates statistics if the number of responses for a question exceeds 5.
+        
+        Args:
+            store: Columnar answers of one timeslot, including its histograms.
+        """
+        for lecture_title, hist, stats_dict in zip(store.titles, store.histograms, self._question_statistics(store.histograms)):
+            self.histograms[lecture_title] = hist
             self.statistics[lecture_title] = stats_dict
 
-    def _calculate_overall_statistics(self, results_dict: Dict[str, List[int]], key: str) -> None:
+    def _calculate_overall_statistics(self, hist: np.ndarray, key: str) -> None:
         """
-        Calculate mean and standard deviation for a single overall results dictionary.
+        Calculate mean and standard deviation for a single overall histogram.
         
         Args:
-            results_dict: Dictionary with structure {question: [answers]}
+            hist: Merged answer histogram (questions x Likert values)
             key: Key to store statistics under (e.g., "Overall Results", "Overall Morning Lecture Results")
         """
-        # Use a dictionary to map questions to their stats for explicit ordering
-        stats_dict = {}
-        for question in self.constants.answ_keys[:-1]:
-            results_arr = results_dict[question]
-            n = len(results_arr)
-            if n > 5:
-                mean = float(np.mean(results_arr))
-                # Use ddof=1 for sample standard deviation (Bessel's correction)
-                std = float(np.std(results_arr, ddof=1))
-            else:
-                mean = None
-                std = None
-            stats_dict[question] = (mean, std, n)
-        self.statistics[key] = stats_dict
+        self.histograms[key] = hist
+        self.statistics[key] = self._question_statistics(hist[np.newaxis])[0]
 
 
     # Depreceated, now displaying the mean and standard deviation directly under the horizontal bar plot using Matplotlib
@@ -377,6 +1440,9 @@ class SurveyAnalyzer:
 
         Below the table we add a note about the Likert scale.
         """
+        from fpdf import FPDF, FontFace
+        from fpdf.enums import CellBordersLayout, TableCellFillMode
+
         stats_dict = self.statistics.get(lecture_key)
 
         pdf_stats = FPDF(orientation="landscape")
@@ -426,94 +1492,37 @@ class SurveyAnalyzer:
 
         return io.BytesIO(pdf_stats.output())
 
-    def _create_likert_figure(self, results_dict: Dict[str, List[int]], title: str, lecture_key: str | None = None) -> io.BytesIO:
-        # Landscape A4 in inches
-        FIG_W, FIG_H = 11.69, 8.27
-
-        # How much vertical space (in figure-fraction) to reserve for the paragraph above
-        TOP_MARGIN    = 0.08   # blank top edge
-        BOTTOM_MARGIN = 0.05   # blank bottom edge
-        PARA_HEIGHT   = 0.10   # paragraph sits here — caller draws it separately,
-                               # so we just leave this space empty at the top
-
-        n_q = len(self.constants.answ_keys[:-1])
-
-        # Divide remaining height equally among questions
-        usable_height = 1.0 - TOP_MARGIN - BOTTOM_MARGIN - PARA_HEIGHT
-        slot_h = usable_height / n_q          # total slot per question
-        bar_frac  = 0.65                      # fraction of slot used by bar axes
-        stat_frac = 0.20                      # fraction used by stats text axes
-
-        LEFT   = 0.03
-        WIDTH  = 0.94
-
-        fig = plt.figure(figsize=(FIG_W, FIG_H))
-        
+    def _likert_chart_data(self, hist: np.ndarray, title: str, lecture_key: str | None = None
+                           ) -> Tuple[List[np.ndarray], List[List[str]], List[Tuple[float, float, int] | None]]:
+        """
+        Everything that differs between Likert charts: bar percentages, bar labels and
+        the (mean, std, n) shown under every bar, or None if there are too few votes.
+        """
         # Get precomputed statistics for this lecture
         # Use lecture_key (original name) if provided, otherwise try title
         stats_key = lecture_key if lecture_key is not None else title
         stats_dict = self.statistics.get(stats_key)
 
+        pcts = []
+        pct_labels = []
+        stats = []
         for i, question in enumerate(self.constants.answ_keys[:-1]):
-            # Slots are numbered top-to-bottom, so invert for matplotlib's
-            # bottom-origin coordinate system
-            slot_bottom = 1.0 - TOP_MARGIN - PARA_HEIGHT - (i + 1) * slot_h
-
-            bar_bottom  = slot_bottom + (1.0 - bar_frac - stat_frac) * slot_h
-            stat_bottom = slot_bottom + (1.0 - bar_frac - stat_frac * 1.4) * slot_h
-
-            ax_bar  = fig.add_axes((LEFT, bar_bottom,  WIDTH, bar_frac  * slot_h))
-            ax_stat = fig.add_axes((LEFT, stat_bottom, WIDTH, stat_frac * slot_h))
-
-            # ── bar axes ──────────────────────────────────────────────────────
-            ax_bar.invert_yaxis()
-            ax_bar.axis("off")
-            ax_bar.set_xlim(0, 100)
-
-            labels      = self._labels_for_question(question)
-            results_arr = results_dict[question]
-            n           = len(results_arr)
+            counts      = hist[i]  # number of answers per Likert value 1–5
+            n           = int(counts.sum())
 
             if n == 0:
                 pct = np.zeros(len(self._labels_for_question(question)))
                 pct_label = [""] * len(pct)
             else:
-                # Use bincount to always produce a count for every Likert value (1–5),
-                # even when some values are absent from the responses.
-                # np.unique would silently drop missing values, causing bars to receive
-                # wrong colors and labels (index-based k+1 ≠ actual Likert value).
-                counts    = np.bincount(results_arr, minlength=6)[1:]  # indices 1–5
+                # The histogram always has a count for every Likert value (1–5),
+                # even when some values are absent from the responses, so bars keep
+                # the right colors and labels.
                 pct       = np.round((counts / n) * 100, decimals=1)
                 pct_label = [f"{k+1} ({pct[k]}%)" if pct[k] != 0 else ""
                              for k in range(5)]
+            pcts.append(pct)
+            pct_labels.append(pct_label)
 
-            # start_pct für die linke Position jeder gestapelten Bar
-            start_pct = np.concatenate([[0], np.cumsum(pct)[:-1]]) if len(pct) > 0 else np.array([])
-
-            ax_bar.set_title(
-                f"Question {i+1}: {self.constants.answer_titles[i]}",
-                loc="left", pad=4, fontsize=9
-            )
-            rects = ax_bar.barh(
-                np.full(len(pct), 0),
-                width=pct,
-                left=start_pct,
-                height=0.5,
-                color=self.constants.likert_palette,
-                linewidth=0.02,
-            )
-            ax_bar.bar_label(rects, labels=pct_label, label_type="center", fontsize=8)
-            ax_bar.legend(
-                ncols=len(labels),
-                handles=rects,
-                labels=labels,
-                bbox_to_anchor=(1.0, 1.08),
-                loc="lower right",
-                bbox_transform=ax_bar.transAxes,
-                fontsize="small",
-            )
-
-            # ── stats axes ────────────────────────────────────────────────────
             if n > 5:
                 # Use precomputed statistics from self.statistics for consistency
                 # Look up stats by question name (not index) for correctness
@@ -529,39 +1538,131 @@ class SurveyAnalyzer:
                         n_stat = n_stats
 
                 if mean is None:
-                    mean = np.mean(results_arr)
-                    std = np.std(results_arr, ddof=1)
-
-                ax_stat.axis("off")
-                ax_stat.text(
-                    0.0, 0.1,
-                    f"Mean and standard deviation: ${mean:.2f} \\pm {std:.2f}$ $(n={n_stat})$",
-                    transform=ax_stat.transAxes,
-                    va="center", ha="left",
-                    fontsize=8, color="black",
-                )
+                    mean, std, _ = self._question_statistics(hist[np.newaxis])[0][question]
+
+                stats.append((mean, std, n_stat))
             else:
-                ax_stat.axis("off")
-                ax_stat.text(
-                    0.0, 0.1,
-                    "Not enough votes for meaningful statistics.",
-                    transform=ax_stat.transAxes,
-                    va="center", ha="left",
-                    fontsize=8, color="black",
-                )
+                stats.append(None)
+        return pcts, pct_labels, stats
 
+    def _create_likert_figure(self, hist: np.ndarray, title: str, lecture_key: str | None = None) -> io.BytesIO:
+        """
+        Render the Likert bars of *hist* with this thread's cached figure template.
+        """
+        pcts, pct_labels, stats = self._likert_chart_data(hist, title, lecture_key)
+        if self.chart_mode == "vector":
+            # Mathtext would be placed glyph by glyph in the SVG, so the line would not
+            # be selectable as text; plain text reads the same, as in "native" mode.
+            stat_format = "Mean and standard deviation: {0:.2f} \u00b1 {1:.2f} (n = {2})"
+        else:
+            stat_format = "Mean and standard deviation: ${0:.2f} \\pm {1:.2f}$ $(n={2})$"
+        stat_lines = ["Not enough votes for meaningful statistics." if stat is None else stat_format.format(*stat)
+                      for stat in stats]
+        return likert_figure_template(self.constants).render(pcts, pct_labels, stat_lines,
+                                                             vector=self.chart_mode == "vector")
 
-        img_buf = self._save_image_in_ram(fig)
-        plt.close(fig)
-        return img_buf
+    def _draw_likert_chart(self, pdf: FPDF, hist: np.ndarray, lecture_key: str, x: float, y: float, w: float) -> None:
+        """
+        Draw the Likert chart of *hist* directly into *pdf*, without matplotlib.
 
-    def _write_pdf_with_graphs(self, title: str, total_count: int, img_buf: io.BytesIO, overall : bool = False, dna : int = 0) -> io.BytesIO:
+        Mirrors the layout of LikertFigureTemplate (as it appears after the tight
+        crop) in a box of width *w* starting at (*x*, *y*).
+        """
+        template = LikertFigureTemplate
+        pad = 0.1 * 25.4                              # savefig pad_inches, in mm
+        bar_w = w - 2 * pad
+        mm = bar_w / (template.FIG_W * 25.4 * 0.94)   # mm per figure mm
+        pt = mm * 25.4 / 72                           # mm per (scaled) figure point
+        slot_h = (1.0 - template.TOP_MARGIN - template.BOTTOM_MARGIN - template.PARA_HEIGHT) / len(hist)
+        slot_h *= template.FIG_H * 25.4 * mm
+        axes_h = 0.65 * slot_h
+        # The autoscaled y-range adds 5 % margins around the bar of height 0.5 (axes
+        # spans 0.55 data units).
+        bar_h = axes_h * 0.5 / 0.55
+        palette = [tuple(int(c[k:k + 2], 16) for k in (1, 3, 5)) for c in self.constants.likert_palette]
+        size_scale = mm  # font sizes in pt scale like lengths
+        legend_fs = 10 * 0.833 * size_scale   # fontsize="small"
+        fs = legend_fs * pt
+        box_h = 1.3 * fs + 2 * 0.4 * fs       # legend text line plus borderpad
+
+        pcts, pct_labels, stats = self._likert_chart_data(hist, lecture_key, lecture_key)
+        bar_x = x + pad
+        # The legend of the first question reaches above its slot; that is where the
+        # cropped figure starts.
+        slot_top = y + pad + box_h + 0.5 * fs - (0.20 * slot_h - 0.08 * axes_h)
+        pdf.set_draw_color(204)
+        pdf.set_line_width(0.8 * pt)
+        # Text is positioned exactly, and the chart must stay on this page
+        c_margin, auto_page_break, b_margin = pdf.c_margin, pdf.auto_page_break, pdf.b_margin
+        pdf.c_margin = 0
+        pdf.set_auto_page_break(False)
+        for i, question in enumerate(self.constants.answ_keys[:-1]):
+            axes_top = slot_top + 0.20 * slot_h
+            bar_top = axes_top + (axes_h - bar_h) / 2
+
+            # Question title, 4 pt above the bar axes
+            pdf.set_text_color(0)
+            pdf.set_font("dejavu-sans", size=9 * size_scale)
+            pdf.set_xy(bar_x, axes_top - 4 * pt - 9 * size_scale * pt)
+            pdf.cell(text=f"Question {i+1}: {self.constants.answer_titles[i]}")
+
+            # Legend, right-aligned above the bar axes
+            labels = self._labels_for_question(question)
+            pdf.set_font("dejavu-sans", size=legend_fs)
+            entry_w = [2.0 * fs + 0.8 * fs + pdf.get_string_width(label) for label in labels]
+            box_w = sum(entry_w) + 2.0 * fs * (len(labels) - 1) + 2 * 0.4 * fs + 0.5 * fs
+            box_x = bar_x + bar_w - 0.5 * fs - box_w   # borderaxespad
+            box_y = axes_top - 0.08 * axes_h - 0.5 * fs - box_h
+            pdf.set_fill_color(255)
+            pdf.rect(box_x, box_y, box_w, box_h, style="DF", round_corners=True, corner_radius=0.2 * fs)
+            entry_x = box_x + 0.4 * fs + 0.25 * fs
+            for label, color, width in zip(labels, palette, entry_w):
+                pdf.set_fill_color(*color)
+                pdf.rect(entry_x, box_y + box_h / 2 - 0.35 * fs, 2.0 * fs, 0.7 * fs, style="F")
+                pdf.set_xy(entry_x + 2.8 * fs, box_y + box_h / 2 - 0.5 * fs)
+                pdf.cell(h=fs, text=label)
+                entry_x += width + 2.0 * fs
+
+            # Stacked bars with their percentage labels
+            pdf.set_font("dejavu-sans", size=8 * size_scale)
+            left = 0.0
+            for k, (pct, label) in enumerate(zip(pcts[i], pct_labels[i])):
+                seg_x = bar_x + bar_w * left / 100
+                seg_w = bar_w * pct / 100
+                if seg_w > 0:
+                    pdf.set_fill_color(*palette[k])
+                    pdf.rect(seg_x, bar_top, seg_w, bar_h, style="F")
+                if label:
+                    pdf.set_xy(seg_x, bar_top)
+                    pdf.cell(w=seg_w, h=bar_h, text=label, align="C")
+                left += pct
+
+            # Statistics line below the bar
+            pdf.set_xy(bar_x, slot_top + slot_h - 0.09 * slot_h - 4 * size_scale * pt)
+            h = 8 * size_scale * pt
+            stat = stats[i]
+            if stat is None:
+                pdf.cell(h=h, text="Not enough votes for meaningful statistics.")
+            else:
+                mean, std, n_stat = stat
+                pdf.cell(h=h, text=f"Mean and standard deviation: {mean:.2f} ± {std:.2f} (")
+                pdf.set_font("dejavu-sans", style="I", size=8 * size_scale)
+                pdf.cell(h=h, text="n")
+                pdf.set_font("dejavu-sans", size=8 * size_scale)
+                pdf.cell(h=h, text=f" = {n_stat})")
+            slot_top += slot_h
+        pdf.c_margin = c_margin
+        pdf.set_auto_page_break(auto_page_break, b_margin)
+
+    def _write_pdf_with_graphs(self, pdf_graphs: FPDF, title: str, total_count: int, lecture_key: str,
+                               overall : bool = False, dna : int = 0) -> None:
         """
         Change: extracted PDF rendering for graphs into a helper to remove duplication.
+
+        Adds a page with the chart of *lecture_key*, rendered beforehand by
+        _render_charts, or drawn natively in "native" chart mode.
         """
-        pdf_graphs = FPDF(orientation="landscape")
-        pdf_graphs.add_page()
-        self._change_pdf_font(pdf_graphs)
+        pdf_graphs.add_page(orientation="landscape")
         pdf_graphs.set_font("dejavu-sans", style="B", size=18)
         pdf_graphs.write(text=f"{title}\n\n")
         pdf_graphs.set_font("dejavu-sans", size=18)
@@ -574,82 +1675,164 @@ class SurveyAnalyzer:
             pdf_graphs.write(text=f"A total of {total_count} questionnaires have been submitted.")
         image_y = pdf_graphs.get_y() + 6
         image_x = pdf_graphs.l_margin
-        pdf_graphs.image(img_buf, x=image_x, y=image_y, w=pdf_graphs.w - 20)
-        return io.BytesIO(pdf_graphs.output())
-
-    def _create_results_pdf(self, lecture_dict: Dict, path:str) -> None:
-        """
-        Create PDFs for the given lecture dictionary (ML/AL/IL or overall).
-        """
-        if lecture_dict is self.overall_results:
-            # overall survey results page
-            img_buf = self._create_likert_figure(lecture_dict, "Overall Results", lecture_key="Overall Results")
-            pdf_output = self._write_pdf_with_graphs("Overall Results", self.overall_count, img_buf)
-            overall_pages = PdfReader(pdf_output).pages[0]
-
-            # overall morning lectures results page
-            img_buf = self._create_likert_figure(self.overall_morning, "Overall Morning Lecture Results", lecture_key="Overall Morning Lecture Results")
-            total = len(self.overall_morning["interesting"])
-            pdf_output = self._write_pdf_with_graphs("Overall Morning Lecture Results", total, img_buf, True, dna=self.dna_morning)
-            morning_pages = PdfReader(pdf_output).pages[0]
-
-            # overall afternoon lectures results page
-            img_buf = self._create_likert_figure(self.overall_afternoon, "Overall Afternoon Lecture Results", lecture_key="Overall Afternoon Lecture Results")
-            total = len(self.overall_afternoon["interesting"])
-            pdf_output = self._write_pdf_with_graphs("Overall Afternoon Lecture Results", total, img_buf, True, dna=self.dna_afternoon)
-            afternoon_pages = PdfReader(pdf_output).pages[0]
-
-            # read in other necessary pages
-            il_title_actual = list(self.il_title)[0]
-            industry_pages = PdfReader(path + f"results_{il_title_actual.lower().replace(' ','_')}.pdf").pages[0]
-            comment_pages = PdfReader(self._create_orga_topic_pdf()).pages
-
-            # write everythin to one output pdf 
-            writer = PdfWriter()
-            writer.add_page(overall_pages)
-            writer.add_page(morning_pages)
-            writer.add_page(afternoon_pages)
-            writer.add_page(industry_pages)
-            for page in comment_pages:
-                writer.add_page(page)
-            output_path = path + "results_overall.pdf"
-            writer.write(output_path)
+        if self.chart_mode == "native":
+            self._draw_likert_chart(pdf_graphs, self.histograms[lecture_key], lecture_key, image_x, image_y, pdf_graphs.w - 20)
         else:
-            for lecture in lecture_dict.keys():
-                title = f"Survey Results for {lecture}"
-                total = len(lecture_dict[lecture]["interesting"])
-                # Pass the original lecture name for statistics lookup, not the modified title
-                img_buf = self._create_likert_figure(lecture_dict[lecture], title, lecture_key=lecture)
-                if lecture_dict == self.il_results:
-                    pdf_output = self._write_pdf_with_graphs(title, total, img_buf, True, self.dna_il)
-                else:
-                    pdf_output = self._write_pdf_with_graphs(title, total, img_buf)
-                figure_page = PdfReader(pdf_output).pages[0]  
-                comment_page = PdfReader(self._create_comment_pdf(lecture_dict[lecture]["comments"])).pages[0]
-                writer = PdfWriter()
-                writer.add_page(figure_page)
-                writer.add_page(comment_page)
-                output_path = path + f"results_{lecture.lower().replace(' ','_')}.pdf"
-                writer.write(output_path)
-
-    def _create_orga_topic_pdf(self) -> io.BytesIO:
-        pdf_out = FPDF()
-        self._change_pdf_font(pdf_out)   # <-- Fonts für dieses PDF registrieren
-        
+            pdf_graphs.image(io.BytesIO(self._charts[lecture_key]), x=image_x, y=image_y, w=pdf_graphs.w - 20)
+
+    @contextlib.contextmanager
+    def _rendering(self) -> Iterator[None]:
+        """
+        Start the rendering worker processes for the duration of the block.
+
+        Each worker receives one copy of the analyzer (histograms, statistics and
+        comments, but not the language model) when it starts.
+        """
+        if self.render_workers <= 1:
+            yield
+            return
+        with ProcessPoolExecutor(self.render_workers, initializer=_init_render_worker, initargs=(self,)) as pool:
+            self._render_pool = pool
+            try:
+                yield
+            except BaseException:
+                # Drop the queued jobs instead of waiting for them, e.g. after cancel()
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                self._render_pool = None
+
+    def _render(self, jobs: List[Tuple[str, tuple]]) -> Iterator[bytes]:
+        """
+        Run rendering jobs, given as (method name, arguments), and yield their results in order.
+
+        With worker processes all jobs are submitted immediately, so the caller can
+        do other work (e.g. cluster comments) before consuming the results.
+        """
+        if self._render_pool is None:
+            return (getattr(self, method)(*args) for method, args in jobs)
+        return self._render_pool.map(_run_render_job, jobs)
+
+    def _chart_image(self, key: str) -> bytes:
+        """
+        Render the Likert chart for the histogram stored under *key* as image data.
+        """
+        with self.profiler.stage("chart", key=key):
+            return self._create_likert_figure(self.histograms[key], key, lecture_key=key).getvalue()
+
+    def _render_charts(self, keys: List[str], prepare_clusterings: bool = False) -> None:
+        """
+        Render the charts for *keys* once; every document showing them reuses the images.
+
+        With *prepare_clusterings*, the comments are embedded while the worker
+        processes render the charts.
+        """
+        keys = [key for key in dict.fromkeys(keys) if key not in self._charts]
+        with self.profiler.stage("charts", charts=len(keys), workers=self.render_workers):
+            images = self._render([("_chart_image", (key,)) for key in keys]) if self.chart_mode != "native" else None
+            if prepare_clusterings:
+                self._report_progress("Clustering the comments")
+                with self.profiler.stage("segmentation"):
+                    for clustering in self._comment_clusterings():
+                        clustering.segments(self.split_similarity_threshold)
+            if images is not None:
+                for i, (key, image) in enumerate(zip(keys, images)):
+                    self._report_progress("Rendering the charts", i, len(keys))
+                    self._charts[key] = image
+
+    def _lecture_pages(self, lecture: str, store: ResponseStore) -> List[Tuple[str, tuple]]:
+        """
+        Page recipes for one lecture: its Likert chart page and its comment page.
+        """
+        title = f"Survey Results for {lecture}"
+        total = int(self.histograms[lecture][0].sum())
+        # Pass the original lecture name for statistics lookup, not the modified title
+        if store is self.il_results:
+            graph_page = ("_write_pdf_with_graphs", (title, total, lecture, True, self.dna_il))
+        else:
+            graph_page = ("_write_pdf_with_graphs", (title, total, lecture))
+        return [graph_page, ("_write_comment_page", (store.comments[lecture],))]
+
+    def _overall_pages(self) -> List[Tuple[str, tuple]]:
+        """
+        Page recipes of the overall report.
+        """
+        pages = [
+            ("_write_pdf_with_graphs", ("Overall Results", self.overall_count, "Overall Results")),
+            ("_write_pdf_with_graphs", ("Overall Morning Lecture Results", int(self.overall_morning[0].sum()),
+                                        "Overall Morning Lecture Results", True, self.dna_morning)),
+            ("_write_pdf_with_graphs", ("Overall Afternoon Lecture Results", int(self.overall_afternoon[0].sum()),
+                                        "Overall Afternoon Lecture Results", True, self.dna_afternoon)),
+        ]
+        industry = self._industry_lecture()
+        if industry is not None:
+            # only the chart page of the industry lecture
+            pages.append(self._lecture_pages(industry, self.il_results)[0])
+        return pages + [("_write_orga_topic_pages", ())]
+
+    def _industry_lecture(self) -> str | None:
+        """Title of the industry lecture, or None if nobody attended it."""
+        return min(self.il_title) if self.il_title else None
+
+    def _ordered_lectures(self) -> List[Tuple[str, ResponseStore]]:
+        """
+        All lectures ordered morning → afternoon → industry, sorted by title within each group.
+        """
+        return ([(t, self.ml_results) for t in sorted(self.ml_titles)]
+                + [(t, self.al_results) for t in sorted(self.al_titles)]
+                + [(t, self.il_results) for t in sorted(self.il_title)])
+
+    def _write_document(self, filename: str, pages: List[Tuple[str, tuple]]) -> None:
+        """
+        Draw the page recipes (method name, arguments) into one new document and save it.
+
+        Every page is drawn straight into the document it belongs to, so no PDF
+        is written and parsed back in to be merged.
+        """
+        from fpdf import FPDF
+
+        with self.profiler.stage("document", file=filename) as info:
+            pdf = FPDF()
+            self._change_pdf_font(pdf)
+            for method, args in pages:
+                getattr(self, method)(pdf, *args)
+            pdf.output(self.path_out + filename)
+            if info is not None:
+                info.update(pages=pdf.pages_count, bytes=os.path.getsize(self.path_out + filename))
+                self.profiler.count("pages written", pdf.pages_count)
+                self.profiler.count("bytes written", info["bytes"])
+
+    def _clustering_note(self, label: str, n_entries: int, backend: str) -> str:
+        """
+        Report the clustering backend used for *label*.
+
+        Returns a sentence for the PDF when the scalable backend replaced the default
+        agglomerative clustering, and an empty string otherwise.
+        """
+        self.log(f"Clustered {n_entries} {label} with the {backend} backend.")
+        if backend == "leader":
+            return (f" Because of the large number of entries ({n_entries}), single-pass leader clustering"
+                    " was used instead of agglomerative clustering.")
+        return ""
+
+    def _write_orga_topic_pages(self, pdf_out: FPDF) -> None:
         # Get raw and clustered comments
-        comments_orga_raw, comments_orga_clustered = self._comment_grouper(
-            self.organization, use_semantic_split=False
+        orga_clustering, topics_clustering = self._comment_clusterings()
+        comments_orga_raw, comments_orga_clustered, orga_backend = orga_clustering.cut(
+            self.cluster_distance_threshold
         )
-        comments_topics_raw, comments_topics_clustered = self._comment_grouper(
-            self.topics, use_semantic_split=True
+        orga_note = self._clustering_note("general comments", len(comments_orga_raw), orga_backend)
+        comments_topics_raw, comments_topics_clustered, topics_backend = topics_clustering.cut(
+            self.cluster_distance_threshold, self.split_similarity_threshold
         )
+        topics_note = self._clustering_note("topic suggestions", len(comments_topics_raw), topics_backend)
         
         # Page 1: Clustered General Comments
         pdf_out.add_page()
         pdf_out.set_font("dejavu-sans", style="B", size=18)
         pdf_out.write(text="Clustered General Comments\n\n")
         pdf_out.set_font("dejavu-sans", size=10)
-        pdf_out.write(text="The clustering has been performed using the \"all-MiniLM-L6-v2\" sentence transformer model available at https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2.\n\n")
+        pdf_out.write(text="The clustering has been performed using the \"all-MiniLM-L6-v2\" sentence transformer model available at https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2." + orga_note + "\n\n")
         for txt in comments_orga_clustered:
             pdf_out.set_font("zapfdingbats", size=8)
             pdf_out.cell(w=5, h=5, text="l ")
@@ -662,7 +1845,7 @@ class SurveyAnalyzer:
         pdf_out.set_font("dejavu-sans", style="B", size=18)
         pdf_out.write(text="Clustered Topic Suggestions\n\n")
         pdf_out.set_font("dejavu-sans", size=10)
-        pdf_out.write(text="The clustering has been performed using the \"all-MiniLM-L6-v2\" sentence transformer model available at https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2.\n\n")
+        pdf_out.write(text="The clustering has been performed using the \"all-MiniLM-L6-v2\" sentence transformer model available at https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2." + topics_note + "\n\n")
         for txt in comments_topics_clustered:
             pdf_out.set_font("zapfdingbats", size=8)
             pdf_out.cell(w=5, h=5, text="l ")
@@ -691,32 +1874,25 @@ class SurveyAnalyzer:
             pdf_out.set_font("dejavu-sans", size=6)
             pdf_out.multi_cell(w=0, h=2, text=txt)
             pdf_out.ln()
-        
-        return io.BytesIO(pdf_out.output())
 
 
-    def _create_all_lecture_comments_pdf(self) -> None:
+    def _write_all_lecture_comments_pages(self, pdf: FPDF) -> None:
         """
-        Create a single PDF collecting the comments for every individual lecture,
-        grouped by timeslot (morning → afternoon → industry) and sorted by lecture
-        title within each group.
+        Add pages collecting the comments for every individual lecture, grouped by
+        timeslot (morning → afternoon → industry) and sorted by lecture title within
+        each group.
 
         Each lecture gets a bold heading followed by a numbered bullet list of its
         comments.  Lectures with no comments still appear with an explicit notice so
-        that the reader can see all lectures are accounted for.  The output file is
-        written to ``self.path_out`` as ``comments_all_lectures.pdf``.
+        that the reader can see all lectures are accounted for.  The pages follow the
+        statistics overview in ``comments_all_lectures.pdf``.
         """
         # Build an ordered list of (group_label, lecture_title, comments) triples.
-        sections: List[Tuple[str, str, List[str]]] = []
-        for title in sorted(self.ml_titles):
-            sections.append(("Morning Lecture", title, self.ml_results[title]["comments"]))
-        for title in sorted(self.al_titles):
-            sections.append(("Afternoon Lecture", title, self.al_results[title]["comments"]))
-        for title in sorted(self.il_title):
-            sections.append(("Industry Lecture", title, self.il_results[title]["comments"]))
-
-        pdf = FPDF()
-        self._change_pdf_font(pdf)
+        group_labels = {id(self.ml_results): "Morning Lecture", id(self.al_results): "Afternoon Lecture",
+                        id(self.il_results): "Industry Lecture"}
+        sections: List[Tuple[str, str, List[str]]] = [
+            (group_labels[id(store)], title, store.comments[title]) for title, store in self._ordered_lectures()
+        ]
 
         current_group: str | None = None
         for group_label, lecture_title, comments in sections:
@@ -750,49 +1926,11 @@ class SurveyAnalyzer:
 
             pdf.ln(4)
 
-        # Build the comments PDF in memory, then prepend the statistics overview
-        # so the combined file opens directly on the summary table.
-        comments_buf = io.BytesIO(pdf.output())
-        stats_buf    = self._create_statistics_overview_pdf()
-
-        writer = PdfWriter()
-        for page in PdfReader(stats_buf).pages:
-            writer.add_page(page)
-        for page in PdfReader(comments_buf).pages:
-            writer.add_page(page)
-        writer.write(self.path_out + "comments_all_lectures.pdf")
 
-
-    def _combine_lecture_pdfs(self) -> None:
-        """
-        Merge all individual lecture feedback PDFs into a single file.
-
-        Pages are ordered morning → afternoon → industry, with lecture titles
-        sorted alphabetically within each group (matching the order produced by
-        _create_all_lecture_comments_pdf).  ``results_overall.pdf`` is explicitly
-        excluded.  The merged file is written to ``self.path_out`` as
-        ``results_all_lectures_combined.pdf``.
+    def _write_statistics_overview_page(self, pdf: FPDF) -> None:
         """
-        ordered_titles = (
-            [(t, self.path_out) for t in sorted(self.ml_titles)]
-            + [(t, self.path_out) for t in sorted(self.al_titles)]
-            + [(t, self.path_out) for t in sorted(self.il_title)]
-        )
-
-        writer = PdfWriter()
-        for lecture_title, path in ordered_titles:
-            pdf_path = path + f"results_{lecture_title.lower().replace(' ', '_')}.pdf"
-            for page in PdfReader(pdf_path).pages:
-                writer.add_page(page)
-
-        output_path = self.path_out + "results_all_lectures_combined.pdf"
-        writer.write(output_path)
-
-
-    def _create_statistics_overview_pdf(self) -> io.BytesIO:
-        """
-        Create a single-page landscape PDF with a summary table of mean ± std for
-        every question and every lecture.
+        Add a landscape page with a summary table of mean ± std for every question
+        and every lecture.
 
         Layout
         ------
@@ -803,8 +1941,12 @@ class SurveyAnalyzer:
                 there is only one lecture in that slot.
         Columns: Lecture name | Q1 … Q6 (abbreviated labels, full titles in footer).
 
-        The file is written to ``self.path_out`` as ``statistics_overview.pdf``.
+        The page is saved as ``statistics_overview.pdf`` and also opens
+        ``comments_all_lectures.pdf``.
         """
+        from fpdf import FontFace
+        from fpdf.enums import TableCellFillMode
+
         questions      = self.constants.answ_keys[:-1]   # excludes "comments"
         short_q_labels = ("Interesting", "New", "As Expected",
                           "Exciting", "Structured", "Level")
@@ -819,9 +1961,7 @@ class SurveyAnalyzer:
             mean, std, _ = entry
             return "N/A" if mean is None else f"{mean:.2f} \u00b1 {std:.2f}"
 
-        pdf = FPDF(orientation="landscape")
-        pdf.add_page()
-        self._change_pdf_font(pdf)
+        pdf.add_page(orientation="landscape")
 
         pdf.set_font("dejavu-sans", style="B", size=18)
         pdf.write(text="Statistics Summary\n\n")
@@ -920,40 +2060,208 @@ class SurveyAnalyzer:
             "Individual n values are shown in the per-lecture Likert figures."
         ))
 
-        pdf_bytes = io.BytesIO(pdf.output())
-        with open(self.path_out + "statistics_overview.pdf", "wb") as f:
-            f.write(pdf_bytes.getvalue())
-        return pdf_bytes
+    def _prepare_results(self) -> None:
+        """
+        Read the survey data and compute all statistics; later calls do nothing.
+        """
+        if self._prepared:
+            return
+        self._report_progress("Reading the responses")
+        with self.profiler.stage("read responses") as info:
+            self._fill_results_list()
+            if info is not None:
+                info.update(responses=self.new_responses)
+        with self.profiler.stage("statistics"):
+            self._create_overall_results()
+            self._create_overall_morning()
+            self._create_overall_afternoon()
+
+            # Calculate statistics for individual lectures
+            self._calculate_lecture_statistics(self.ml_results)
+            self._calculate_lecture_statistics(self.al_results)
+            self._calculate_lecture_statistics(self.il_results)
+
+            # Calculate statistics for overall results
+            self._calculate_overall_statistics(self.overall_results, "Overall Results")
+            self._calculate_overall_statistics(self.overall_morning, "Overall Morning Lecture Results")
+            self._calculate_overall_statistics(self.overall_afternoon, "Overall Afternoon Lecture Results")
+        self._prepared = True
+
+    def _report_progress(self, stage: str, step: int = 0, steps: int = 1) -> None:
+        """
+        Pass the progress to the ``progress`` callback, unless the run was cancelled.
 
-    def _perform_automated_analysis(self) -> None:
-        self._fill_results_list()
-        self._create_overall_results()
-        self._create_overall_morning()
-        self._create_overall_afternoon()
-        
-        # Calculate statistics for individual lectures
-        self._calculate_lecture_statistics(self.ml_results)
-        self._calculate_lecture_statistics(self.al_results)
-        self._calculate_lecture_statistics(self.il_results)
-        
-        # Calculate statistics for overall results
-        self._calculate_overall_statistics(self.overall_results, "Overall Results")
-        self._calculate_overall_statistics(self.overall_morning, "Overall Morning Lecture Results")
-        self._calculate_overall_statistics(self.overall_afternoon, "Overall Afternoon Lecture Results")
+        Raises:
+            AnalysisCancelled: if ``cancel`` was called since the run started.
+        """
+        if self._cancelled.is_set():
+            raise AnalysisCancelled("The analysis was cancelled.")
+        if self.progress is not None:
+            self.progress(stage, step, steps)
+
+    def cancel(self) -> None:
+        """
+        Stop a running analysis (from another thread) at its next step.
+
+        Documents that are already written are kept, but the manifest and the
+        append-mode state are not updated, so the next run writes them again.
+        """
+        self._cancelled.set()
+
+    def _perform_automated_analysis(self) -> List[str]:
+        """Write all outputs whose inputs changed and return their file names."""
+        try:
+            with self.profiler.stage("analysis"):
+                written = self._write_outputs()
+        finally:
+            self._cancelled.clear()
+        if self.profile_path is not None:
+            path = os.path.join(self.path_out, self.profile_path)
+            self.profiler.write(path)
+            self.log(self.profiler.summary())
+            self.log(f"Profile written to {path}.")
+        return written
+
+    def _write_outputs(self) -> List[str]:
+        self._prepare_results()
 
         if not os.path.exists(self.path_out):
             os.makedirs(self.path_out, exist_ok=True)
 
-        self._create_results_pdf(self.ml_results, self.path_out)
-        self._create_results_pdf(self.al_results, self.path_out)
-        self._create_results_pdf(self.il_results, self.path_out)
-        self._create_results_pdf(self.overall_results, self.path_out)
-        self._create_all_lecture_comments_pdf()  # also writes statistics_overview.pdf
-        self._combine_lecture_pdfs()
+        if self.resumed and self.new_responses == 0:
+            self.log("No new responses since the last run.")
+        if not self.il_title:
+            self.log("Warning: no response attended the industry lecture, so it gets no report and no page "
+                     "in the overall report.")
+        # Outputs whose inputs are unchanged since they were written are kept, e.g.
+        # the lectures that no new response in append mode refers to.
+        self._report_progress("Checking for changed inputs")
+        with self.profiler.stage("input digests"):
+            self._load_manifest()
+            digests = self._output_digests()
+        lectures = []
+        for store in (self.ml_results, self.al_results, self.il_results):
+            for lecture in store:
+                filename = self._lecture_filename(lecture)
+                if self._needs_render(filename, digests[filename]):
+                    lectures.append((lecture, store))
+        write_overall = self._needs_render("results_overall.pdf", digests["results_overall.pdf"])
+        write_comments = (self._needs_render("comments_all_lectures.pdf", digests["comments_all_lectures.pdf"])
+                          or self._needs_render("statistics_overview.pdf", digests["statistics_overview.pdf"]))
+        write_combined = self._needs_render("results_all_lectures_combined.pdf",
+                                            digests["results_all_lectures_combined.pdf"])
+
+        # Every chart is rendered once, whichever documents show it
+        chart_keys = [lecture for lecture, _ in lectures]
+        if write_combined:
+            chart_keys += [lecture for lecture, _ in self._ordered_lectures()]
+        if write_overall:
+            chart_keys += ["Overall Results", "Overall Morning Lecture Results", "Overall Afternoon Lecture Results"]
+            chart_keys += [self._industry_lecture()] if self.il_title else []
+        with self._rendering():
+            self._render_charts(chart_keys, prepare_clusterings=write_overall)
+            documents = self._documents_to_write(lectures, write_overall, write_comments, write_combined)
+            self._write_documents(documents)
+        written = [filename for filename, _ in documents]
+        self.log(f"Wrote {len(written)} of {len(digests)} outputs ({len(digests) - len(written)} unchanged).")
+        with self.profiler.stage("save state"):
+            self._manifest.update((filename, digests[filename]) for filename in written)
+            self._save_manifest()
+            if self.append:
+                self._save_state()
+            if self.archive_path is not None:
+                self._archive_statistics()
+        return written
+
+    def _documents_to_write(self, lectures: List[Tuple[str, ResponseStore]], write_overall: bool,
+                            write_comments: bool, write_combined: bool) -> List[Tuple[str, List[Tuple[str, tuple]]]]:
+        """
+        The (filename, page recipes) of every document that is written in this run.
+        """
+        documents = [(self._lecture_filename(lecture), self._lecture_pages(lecture, store)) for lecture, store in lectures]
+        if write_overall:
+            documents.append(("results_overall.pdf", self._overall_pages()))
+        if write_comments:
+            documents.append(("statistics_overview.pdf", [("_write_statistics_overview_page", ())]))
+            # The statistics overview opens the comments file, so it opens directly on the summary table.
+            documents.append(("comments_all_lectures.pdf", [("_write_statistics_overview_page", ()),
+                                                            ("_write_all_lecture_comments_pages", ())]))
+        if write_combined:
+            documents.append(("results_all_lectures_combined.pdf",
+                              [page for lecture, store in self._ordered_lectures()
+                               for page in self._lecture_pages(lecture, store)]))
+        return documents
+
+    def _write_documents(self, documents: List[Tuple[str, List[Tuple[str, tuple]]]]) -> None:
+        """
+        Draw and save *documents*, in the rendering worker processes where possible.
+
+        Pages are drawn and fonts subset in the process that saves the document, so
+        with worker processes every document that does not need the comment
+        clusterings (which live only in this process, next to the language model) is
+        sent to a worker with the chart images it shows.  This process meanwhile
+        writes the overall report.  Must be called inside ``_rendering``.
+        """
+        local, remote = [], []
+        for filename, pages in documents:
+            needs_clusterings = any(method in _CLUSTERING_PAGES for method, _ in pages)
+            (local if self._render_pool is None or needs_clusterings else remote).append((filename, pages))
+        with self.profiler.stage("documents", documents=len(documents), workers=self.render_workers):
+            done = self._render([("_write_document_with_charts", (filename, pages, self._document_charts(pages)))
+                                 for filename, pages in remote])
+            for i, (filename, pages) in enumerate(local):
+                self._report_progress("Writing the reports", i, len(documents))
+                self._write_document(filename, pages)
+            for i, _ in enumerate(done, start=len(local)):
+                self._report_progress("Writing the reports", i, len(documents))
+
+    def _document_charts(self, pages: List[Tuple[str, tuple]]) -> Dict[str, bytes]:
+        """The rendered chart images the page recipes show (none in "native" chart mode)."""
+        return {args[2]: self._charts[args[2]] for method, args in pages
+                if method == "_write_pdf_with_graphs" and args[2] in self._charts}
+
+    def _write_document_with_charts(self, filename: str, pages: List[Tuple[str, tuple]],
+                                    charts: Dict[str, bytes]) -> None:
+        """
+        Rendering worker side of _write_documents: write one document showing *charts*.
+        """
+        self._charts = charts
+        try:
+            self._write_document(filename, pages)
+        finally:
+            self._charts = {}
+
+    def _clustering_backend_for(self, n_entries: int) -> str:
+        """
+        Resolve the configured clustering backend for a corpus of *n_entries*.
+
+        "agglomerative" is Ward clustering cut at the distance threshold; it needs
+        quadratic time and memory.  "leader" is single-pass threshold clustering with
+        radius threshold / sqrt(2) (the distance to a large cluster's centroid at
+        which Ward would still merge a single comment into it).  "auto" uses
+        "leader" once the corpus exceeds ``large_corpus_size`` entries.
+        """
+        if self.clustering_backend == "auto":
+            return "leader" if n_entries > self.large_corpus_size else "agglomerative"
+        return self.clustering_backend
+
+    def _merge_tree(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fit the full Ward merge tree once; see _cut_merge_tree for applying thresholds.
+
+        Returns:
+            The ``children_`` and ``distances_`` of the fitted clustering.
+        """
+        from sklearn.cluster import AgglomerativeClustering
+
+        clustering_model = AgglomerativeClustering(n_clusters=1, compute_full_tree=True, compute_distances=True)
+        clustering_model.fit(embeddings)
+        return clustering_model.children_, clustering_model.distances_
 
     # This method is based on Tom Aarsen's agglomerative.py sample code, retrieved at 10.02.2026: Source - https://github.com/huggingface/sentence-transformers/blob/main/examples/sentence_transformer/applications/clustering/agglomerative.py
     def _comment_grouper(self, corpus: List[str], use_semantic_split: bool = False,
-                         split_similarity_threshold: float = 0.2):
+                         split_similarity_threshold: float = 0.2, pool_merged_segments: bool = False,
+                         distance_threshold: float = 0.5):
         """
         Prepare *corpus* for agglomerative clustering and return both the raw and the
         clustered comment lists.
@@ -971,43 +2279,193 @@ class SurveyAnalyzer:
             split_similarity_threshold: Cosine-similarity threshold passed to
                 _segment_by_semantic_similarity when use_semantic_split is True.
                 Parts below this value are treated as distinct topics (default 0.4).
+            pool_merged_segments: With use_semantic_split, cluster segments merged
+                from several parts on a pooled embedding of their parts instead of
+                embedding them again.
+            distance_threshold: Clusters are not merged at or above this distance.
         """
-        corpus_masked = [x for x in corpus if x is not None]
-        corpus_split = []
-        for comment in corpus_masked:
-            if use_semantic_split:
-                # Split on commas to get candidate segments, then let semantic
-                # similarity decide which adjacent ones belong together.
-                parts = [p.strip() for p in comment.split(",") if p.strip()]
-                segments = self._segment_by_semantic_similarity(
-                    parts, similarity_threshold=split_similarity_threshold
-                )
-                corpus_split.extend(segments)
-            else:
-                # Keep the full response intact; commas are punctuation here.
-                stripped = comment.strip()
-                if stripped:
-                    corpus_split.append(stripped)
-        corpus_embeddings = self.language_model.encode(corpus_split)
-        clustering_model = AgglomerativeClustering(n_clusters=None, distance_threshold=0.5)
-        clustering_model.fit(corpus_embeddings)
-        cluster_assignment = clustering_model.labels_
+        clustering = CommentClustering(self, corpus, use_semantic_split, pool_merged_segments)
+        grouped_answers, clustered_answers, self.last_clustering_backend = clustering.cut(
+            distance_threshold, split_similarity_threshold
+        )
+        return grouped_answers, clustered_answers
 
-        clustered_sentences: Dict[int, List[str]] = {}
-        for sentence_id, cluster_id in enumerate(cluster_assignment):
-            clustered_sentences.setdefault(cluster_id, []).append(corpus_split[sentence_id])
+    def _comment_clusterings(self) -> Tuple[CommentClustering, CommentClustering]:
+        """
+        Cached clusterings of the organisation comments and the topic suggestions.
 
-        clustered_answers = []
-        grouped_answers = []
-        for _, cluster in clustered_sentences.items():
-            answ = f"{cluster[0]} (x{len(cluster)})"
-            clustered_answers.append(answ)
-            grouped_answers += cluster
-        return grouped_answers, clustered_answers
+        They keep their embeddings and merge trees, so the PDF and any number of
+        previews with different thresholds share the same model inference and fits.
+        """
+        if self._clusterings is None:
+            self._clusterings = (
+                CommentClustering(self, self.organization, use_semantic_split=False),
+                CommentClustering(self, self.topics, use_semantic_split=True,
+                                  pool_merged_segments=self.pool_merged_segments),
+            )
+        return self._clusterings
+
+    def preview_clusters(self, distance_threshold: float | None = None,
+                         split_similarity_threshold: float | None = None) -> Dict[str, List[str]]:
+        """
+        Clustered organisation comments and topic suggestions at the given thresholds,
+        without writing any PDF.
+
+        The survey data is read on the first call.  Afterwards a new distance threshold
+        only cuts the cached merge trees, while the first call with a new split
+        threshold embeds the merged topic segments again and fits their merge tree
+        (both are cached per split threshold), so callers with a user interface
+        should not make calls on its thread.  Missing thresholds default to the
+        analyzer's current settings.  Like a full run, a call reports its progress and
+        can be stopped with ``cancel``.
+        """
+        if distance_threshold is None:
+            distance_threshold = self.cluster_distance_threshold
+        if split_similarity_threshold is None:
+            split_similarity_threshold = self.split_similarity_threshold
+        try:
+            self._prepare_results()
+            orga, topics = self._comment_clusterings()
+            self._report_progress("Clustering the comments")
+            return {
+                "organization": orga.cut(distance_threshold)[1],
+                "topics": topics.cut(distance_threshold, split_similarity_threshold)[1],
+            }
+        finally:
+            self._cancelled.clear()
+
+
+def _add_analysis_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options shared by the single-export and the batch command line."""
+    parser.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="do not read or write the persistent comment embedding cache",
+    )
+    parser.add_argument(
+        "--pool-merged-segments",
+        action="store_true",
+        help="cluster merged topic segments on the pooled embeddings of their parts instead of embedding them "
+             "again: faster, but approximate, so some topics may land in different clusters",
+    )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default=DEFAULT_EMBEDDING_BACKEND,
+        help="engine computing the comment embeddings: the sentence-transformers model, or the int8 ONNX export "
+             "of it (see embedding_backends.py); auto uses onnx if it is available (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--clustering-backend",
+        choices=CLUSTERING_BACKENDS,
+        default="auto",
+        help="comment clustering algorithm (default: agglomerative, leader above --large-corpus-size comments)",
+    )
+    parser.add_argument(
+        "--large-corpus-size",
+        type=int,
+        default=DEFAULT_LARGE_CORPUS_SIZE,
+        help="corpus size above which the auto backend switches to leader clustering (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cluster-threshold",
+        type=float,
+        default=0.5,
+        help="distance at or above which comment clusters are not merged (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--split-threshold",
+        type=float,
+        default=0.2,
+        help="cosine similarity below which comma-separated topic parts are kept apart (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=1,
+        help="number of processes rendering the report pages; 0 uses one per CPU core (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--chart-mode",
+        choices=CHART_MODES,
+        default="raster",
+        help="embed the Likert charts as PNG images, as vector graphics with selectable text, or draw them "
+             "natively without matplotlib (fastest) (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help=f"only process responses newer than the previous run, using the {STATE_FILENAME} state in the output folder",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.json",
+        default=None,
+        metavar="FILE",
+        help="record the time, CPU time and memory of every stage and write them as a trace-event file "
+             "(default FILE: profile.json in the output folder)",
+    )
+    parser.add_argument(
+        "--archive",
+        default=None,
+        help="SQLite trend archive the lecture statistics are recorded in (see trend_archive.py)",
+    )
+    parser.add_argument(
+        "--event",
+        default=DEFAULT_EVENT,
+        help="event name the statistics are archived under (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--year",
+        type=int,
+        default=None,
+        help="year the statistics are archived under (default: year of the latest response)",
+    )
+
+
+def _analyzer_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """SurveyAnalyzer keyword arguments for the options of _add_analysis_arguments."""
+    return dict(
+        append=args.append,
+        use_embedding_cache=not args.no_embedding_cache,
+        pool_merged_segments=args.pool_merged_segments,
+        embedding_backend=args.embedding_backend,
+        clustering_backend=args.clustering_backend,
+        large_corpus_size=args.large_corpus_size,
+        cluster_distance_threshold=args.cluster_threshold,
+        split_similarity_threshold=args.split_threshold,
+        render_workers=args.render_workers,
+        chart_mode=args.chart_mode,
+        archive_path=args.archive,
+        event=args.event,
+        year=args.year,
+        profile_path=args.profile,
+    )
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyse an HGSFP Graduate Days survey export and write the PDF reports.")
+    parser.add_argument("data_path", help="survey export (JSON)")
+    parser.add_argument("output_path", help="folder the PDFs are written to")
+    _add_analysis_arguments(parser)
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="analyse in this process even if the analysis service (survey_service.py) is running",
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
+    args = _parse_args()
+    options = _analyzer_options(args)
     print("Starting script.")
-    obj = SurveyAnalyzer()
-    obj._perform_automated_analysis()
+    # A running analysis service has the model and the fonts loaded already
+    from survey_service import RemoteAnalysis, service_available, supports_remote
+    if not args.local and supports_remote(options) and service_available():
+        RemoteAnalysis(args.data_path, args.output_path, **options).run()
+    else:
+        obj = SurveyAnalyzer(args.data_path, args.output_path, **options)
+        obj._perform_automated_analysis()
     print("Finished script.")
\ No newline at end of file
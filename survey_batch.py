@@ -0,0 +1,183 @@
+# Analyse many survey exports in one process, sharing the model and the fonts.
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+from embedding_backends import DEFAULT_EMBEDDING_BACKEND
+from survey_analyzer import SurveyAnalyzer, _add_analysis_arguments, _analyzer_options, shared_model_loader
+
+# Messages of all exports of a batch; each one is a single record prefixed with
+# its export, so lines of exports analysed at the same time do not interleave.
+logger = logging.getLogger("survey_batch")
+
+
+@dataclass
+class BatchResult:
+    """Outcome of analysing one export of a batch."""
+
+    data_path: str
+    output_path: str
+    seconds: float = 0.0
+    responses: int = 0
+    written: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def collect_inputs(paths: Sequence[str]) -> List[str]:
+    """Expand *paths* (export files or folders of ``*.json`` exports) into a sorted list of files."""
+    inputs: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            inputs += sorted(os.path.join(path, name) for name in os.listdir(path)
+                             if name.lower().endswith(".json") and os.path.isfile(os.path.join(path, name)))
+        else:
+            inputs.append(path)
+    # The same export given twice would be written twice into the same folder
+    return list(dict.fromkeys(os.path.abspath(path) for path in inputs))
+
+
+def output_folders(inputs: Sequence[str], output_root: str) -> List[str]:
+    """One output folder per export, named after the file; equal names get a numeric suffix."""
+    folders, used = [], set()
+    for path in inputs:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, n = stem, 2
+        while name.lower() in used:
+            name, n = f"{stem}-{n}", n + 1
+        used.add(name.lower())
+        folders.append(os.path.join(output_root, name))
+    return folders
+
+
+def _analyse(data_path: str, output_path: str, options: dict) -> Tuple[BatchResult, SurveyAnalyzer | None]:
+    result = BatchResult(data_path, output_path)
+    name = os.path.basename(data_path)
+    start = time.perf_counter()
+    analyzer = None
+    try:
+        analyzer = SurveyAnalyzer(data_path, output_path, log=lambda message: logger.info("[%s] %s", name, message),
+                                  **options)
+        result.written = len(analyzer._perform_automated_analysis())
+        result.responses = analyzer.new_responses
+        # Only the statistics are archived later; the chart images and clusterings are not needed
+        analyzer._charts, analyzer._clusterings = {}, None
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        logger.exception("[%s] Analysis failed.", name)
+        analyzer = None
+    result.seconds = time.perf_counter() - start
+    return result, analyzer
+
+
+def _archive(runs: Sequence[Tuple[BatchResult, SurveyAnalyzer | None]], archive_path: str) -> None:
+    """
+    Record the statistics of the analysed exports in the trend archive, in input order.
+
+    The archive keeps one record per event and year, so an export whose event and
+    year were already recorded by an earlier export of the batch would silently
+    replace that record; it is reported as failed instead.
+    """
+    archived: Dict[Tuple[str, int], str] = {}
+    for result, analyzer in runs:
+        if analyzer is None:
+            continue
+        name = os.path.basename(result.data_path)
+        try:
+            key = (analyzer.event, analyzer._survey_year())
+            if key in archived:
+                raise ValueError(f"{archived[key]} is archived as {key[0]} {key[1]} already; archive this export "
+                                 f"on its own with a different --event or --year.")
+            analyzer.archive_path = archive_path
+            analyzer._archive_statistics()
+            archived[key] = name
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            logger.error("[%s] Not archived: %s", name, e)
+
+
+def run_batch(inputs: Sequence[str], output_root: str, workers: int = 2, **options: Any) -> List[BatchResult]:
+    """
+    Analyse every export in *inputs*, writing the reports of ``name.json`` to ``output_root/name``.
+
+    The exports are processed by at most *workers* threads of this process, so the
+    language model, the parsed fonts and the embedding cache are loaded only once.
+    A failing export is recorded in its result and does not stop the others.
+    *options* are passed on to every ``SurveyAnalyzer``; with ``archive_path``, the
+    statistics are archived once all exports are analysed (see _archive).  Messages
+    go to the "survey_batch" logger.
+
+    Returns:
+        The results in the order of *inputs*.
+    """
+    folders = output_folders(inputs, output_root)
+    if not inputs:
+        return []
+    # Load the model while the first exports are read and tallied
+    loader = options.get("model_loader") or shared_model_loader(
+        backend=options.get("embedding_backend", DEFAULT_EMBEDDING_BACKEND))
+    loader.warm_up()
+    archive_path = options.get("archive_path")
+    options = {**options, "archive_path": None}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(inputs))), thread_name_prefix="batch") as pool:
+        runs = list(pool.map(lambda job: _analyse(*job, options), zip(inputs, folders)))
+    if archive_path is not None:
+        _archive(runs, archive_path)
+    return [result for result, _ in runs]
+
+
+def format_summary(results: Sequence[BatchResult]) -> str:
+    """Per-export table of status, run time, new responses and written outputs, plus the failures."""
+    rows: List[Tuple[str, ...]] = [("Export", "Status", "Time", "Responses", "Written")]
+    for r in results:
+        rows.append((os.path.basename(r.data_path), "ok" if r.ok else "FAILED", f"{r.seconds:.1f} s",
+                     str(r.responses) if r.ok else "-", str(r.written) if r.ok else "-"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(width) if i < 2 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths)))
+             for row in rows]
+    failed = [r for r in results if not r.ok]
+    lines.append(f"{len(results) - len(failed)} of {len(results)} exports analysed, "
+                 f"{sum(r.seconds for r in results):.1f} s in total.")
+    lines += [f"{r.data_path}: {r.error}" for r in failed]
+    return "\n".join(lines)
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyse many HGSFP survey exports, writing each one's PDFs to its own folder.")
+    parser.add_argument("inputs", nargs="+", help="survey exports (JSON) or folders containing them")
+    parser.add_argument("output_root", help="folder receiving one subfolder per export")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="number of exports analysed at the same time (default: 2)",
+    )
+    _add_analysis_arguments(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        sys.exit("No survey exports found.")
+    start = time.perf_counter()
+    results = run_batch(inputs, args.output_root, workers=args.workers, **_analyzer_options(args))
+    print()
+    print(format_summary(results))
+    print(f"Finished batch in {time.perf_counter() - start:.1f} s.")
+    sys.exit(0 if all(r.ok for r in results) else 1)
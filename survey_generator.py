@@ -0,0 +1,169 @@
+# Synthetic survey exports in the input format of survey_analyzer.py, for testing and benchmarks.
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+QUESTIONS = ("interesting", "new", "expected", "exciting", "structure", "level")
+
+# Building blocks of the generated comments; each comment is one opening phrase
+# followed by filler clauses until it has the requested number of words.
+_LECTURE_OPENINGS = (
+    "great lecture", "boring", "not helpful", "very clear explanations", "too fast",
+    "didn't understand the last part", "excellent speaker", "slides were hard to read",
+    "more examples would help", "perfect level of detail", "too much material for one session",
+    "really inspiring", "the derivations were confusing", "nice connection to current research",
+)
+_ORGANIZATION_OPENINGS = (
+    "well organized", "everything fine", "could be improved", "more coffee breaks please",
+    "the room was too small", "great venue", "schedule was too tight", "registration was easy",
+    "lunch options were limited", "longer discussion sessions", "the online material came late",
+    "good mix of talks and exercises", "start later in the morning", "excellent social event",
+)
+_TOPIC_OPENINGS = (
+    "quantum field theory", "machine learning in physics", "dark matter", "gravitational waves",
+    "string theory", "lattice QCD", "cosmology", "neutrino physics", "statistics for physicists",
+    "condensed matter", "quantum computing", "scientific writing", "career outside academia",
+    "numerical methods", "particle detectors", "general relativity",
+)
+_FILLERS = (
+    "in my opinion", "especially in the second half", "compared to last year", "for beginners",
+    "with more time for questions", "and the exercises", "if possible", "overall",
+    "for the PhD students", "with practical examples", "as discussed", "in the future",
+)
+
+
+def _comment(rng: np.random.Generator, openings: Sequence[str], words: int) -> str:
+    parts = [openings[rng.integers(len(openings))]]
+    n_words = len(parts[0].split())
+    while n_words < words:
+        filler = _FILLERS[rng.integers(len(_FILLERS))]
+        parts.append(filler)
+        n_words += len(filler.split())
+    return ", ".join(parts)
+
+
+def _answer_model(rng: np.random.Generator, n_lectures: int) -> np.ndarray:
+    """Cumulative 1-5 answer distribution (lectures x questions x 5), different for every lecture."""
+    probabilities = rng.dirichlet(np.full(5, 2.0), size=(n_lectures, len(QUESTIONS)))
+    return np.cumsum(probabilities, axis=-1)
+
+
+def _answers(rng: np.random.Generator, cdf: np.ndarray, lecture_ids: np.ndarray) -> np.ndarray:
+    u = rng.random((len(lecture_ids), len(QUESTIONS)))
+    return np.minimum((u[..., np.newaxis] > cdf[lecture_ids]).sum(axis=-1) + 1, 5)
+
+
+def iter_responses(responses: int, morning_lectures: int = 5, afternoon_lectures: int = 5,
+                   industry_lecture: str = "Industry Talk", comment_rate: float = 0.67,
+                   organization_rate: float = 0.66, topic_rate: float = 0.45,
+                   comment_words: Tuple[int, int] = (2, 12), dna_rate: float = 0.05,
+                   year: int = 2024, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield *responses* schema-valid survey responses.
+
+    Every lecture gets its own answer distribution, so the statistics and charts
+    differ between lectures.  Comments are composed from a fixed phrase list and
+    padded to a uniformly drawn length within *comment_words*, so they form
+    clusters of similar texts like real feedback does.  Responses are spread over
+    the first week of October of *year* in ascending ``HappendAt`` order.
+
+    Args:
+        responses: Number of responses.
+        morning_lectures: Number of morning lectures (titled MC1, MC2, ...).
+        afternoon_lectures: Number of afternoon lectures (titled AC1, AC2, ...).
+        industry_lecture: Title of the industry lecture.
+        comment_rate: Probability of a lecture comment on each attended lecture.
+        organization_rate: Probability of an organisation comment per response.
+        topic_rate: Probability of a topic suggestion per response.
+        comment_words: Inclusive range of the number of words of a comment.
+        dna_rate: Probability that a lecture was not attended ("DnA").
+        year: Year of the ``HappendAt`` timestamps.
+        seed: Seed of the random generator; equal arguments give equal surveys.
+    """
+    rng = np.random.default_rng(seed)
+    slots = (
+        ("ml", [f"MC{i + 1}" for i in range(morning_lectures)]),
+        ("al", [f"AC{i + 1}" for i in range(afternoon_lectures)]),
+        ("il", [industry_lecture]),
+    )
+    start_ms = int(datetime.datetime(year, 10, 1, 8, tzinfo=datetime.timezone.utc).timestamp() * 1000)
+    timestamps = start_ms + np.cumsum(rng.integers(1, 2 * 7 * 86_400_000 // max(responses, 1) + 2, size=responses))
+    # Draw all answers of a timeslot at once; None marks a lecture that was not attended.
+    columns: Dict[str, Tuple[List[str], np.ndarray, np.ndarray]] = {}
+    for prefix, titles in slots:
+        lecture_ids = rng.integers(len(titles), size=responses)
+        attended = rng.random(responses) >= dna_rate
+        columns[prefix] = (titles, np.where(attended, lecture_ids, -1), _answers(rng, _answer_model(rng, len(titles)), lecture_ids))
+    low, high = comment_words
+
+    for r in range(responses):
+        elem: Dict[str, Any] = {}
+        comments: Dict[str, str | None] = {}
+        for prefix, (titles, lecture_ids, answers) in columns.items():
+            lecture_id = int(lecture_ids[r])
+            elem[f"{prefix}_title"] = titles[lecture_id] if lecture_id >= 0 else "DnA"
+            if prefix == "il":
+                elem["il_attended"] = lecture_id >= 0
+            if lecture_id >= 0:
+                elem.update((f"{prefix}_{q}", int(a)) for q, a in zip(QUESTIONS, answers[r]))
+            comments[f"{prefix}_comment"] = (
+                _comment(rng, _LECTURE_OPENINGS, int(rng.integers(low, high + 1)))
+                if lecture_id >= 0 and rng.random() < comment_rate else None
+            )
+        elem["HappendAt"] = f"/Date({int(timestamps[r])})/"
+        elem["InstanceId"] = None
+        if any(comment is not None for comment in comments.values()):
+            elem["sugg_lectures"] = comments
+        if rng.random() < organization_rate:
+            elem["sugg_organization"] = _comment(rng, _ORGANIZATION_OPENINGS, int(rng.integers(low, high + 1)))
+        if rng.random() < topic_rate:
+            n_topics = int(rng.integers(1, 4))
+            elem["sugg_topics"] = ", ".join(_TOPIC_OPENINGS[i] for i in rng.choice(len(_TOPIC_OPENINGS), n_topics, replace=False))
+        yield elem
+
+
+def write_survey(path: str, responses: int, **options: Any) -> None:
+    """
+    Write a synthetic survey export to *path*, one response per line.
+
+    The responses are generated and written one at a time, so even very large
+    exports need little memory.  *options* are those of ``iter_responses``.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'{{\n"ResultCount": {responses},\n"Data": [\n')
+        for i, elem in enumerate(iter_responses(responses, **options)):
+            f.write(("" if i == 0 else ",\n") + json.dumps(elem, ensure_ascii=False))
+        f.write("\n]\n}\n")
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write a synthetic HGSFP survey export for testing and benchmarking.")
+    parser.add_argument("output", help="JSON file to write")
+    parser.add_argument("--responses", type=int, default=100, help="number of responses (default: %(default)s)")
+    parser.add_argument("--morning-lectures", type=int, default=5, help="number of morning lectures (default: %(default)s)")
+    parser.add_argument("--afternoon-lectures", type=int, default=5, help="number of afternoon lectures (default: %(default)s)")
+    parser.add_argument("--comment-rate", type=float, default=0.67,
+                        help="probability of a comment on an attended lecture (default: %(default)s)")
+    parser.add_argument("--organization-rate", type=float, default=0.66,
+                        help="probability of an organisation comment (default: %(default)s)")
+    parser.add_argument("--topic-rate", type=float, default=0.45,
+                        help="probability of a topic suggestion (default: %(default)s)")
+    parser.add_argument("--comment-words", type=int, nargs=2, default=(2, 12), metavar=("MIN", "MAX"),
+                        help="range of the number of words per comment (default: 2 12)")
+    parser.add_argument("--year", type=int, default=2024, help="year of the response timestamps (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    write_survey(args.output, args.responses, morning_lectures=args.morning_lectures,
+                 afternoon_lectures=args.afternoon_lectures, comment_rate=args.comment_rate,
+                 organization_rate=args.organization_rate, topic_rate=args.topic_rate,
+                 comment_words=tuple(args.comment_words), year=args.year, seed=args.seed)
+    print(f"Wrote {args.responses} responses to {args.output}.")
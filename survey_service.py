@@ -0,0 +1,446 @@
+"""
+A long-running local HTTP service around SurveyAnalyzer.
+
+Every run of the command line pays for the imports, the model load and the font
+parsing again.  The service pays them once: jobs run in threads of one process,
+so the model (see shared_model_loader), the parsed fonts and the embedding cache
+stay loaded between them.  Jobs beyond --workers wait in a queue.
+
+API (JSON unless noted):
+
+* ``GET /health``: service status, used by clients to detect the service.
+* ``POST /jobs?<options>``: the body is a survey export; returns the job id.  The
+  options are SurveyAnalyzer keyword arguments (see ``REMOTE_OPTIONS``).
+* ``GET /jobs/<id>``: status (queued, running, done, failed, cancelled) and progress.
+* ``GET /jobs/<id>/result``: the reports of a finished job and their report manifest as a zip file.
+* ``DELETE /jobs/<id>``: cancel a queued or running job.
+
+The service only listens on localhost by default and has no authentication.
+
+Usage:
+    python survey_service.py [--port 8765] [--workers 1] [--embedding-backend torch]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+from embedding_backends import DEFAULT_EMBEDDING_BACKEND, EMBEDDING_BACKENDS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Clients look for the service here unless HGSFP_SERVICE_URL says otherwise
+DEFAULT_SERVICE_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+SERVICE_NAME = "hgsfp-survey-service"
+API_VERSION = 1
+
+
+def _flag(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+# SurveyAnalyzer options a job may set, with the parser of their query value
+REMOTE_OPTIONS: Dict[str, Callable[[str], Any]] = {
+    "use_embedding_cache": _flag,
+    "pool_merged_segments": _flag,
+    "embedding_backend": str,
+    "clustering_backend": str,
+    "large_corpus_size": int,
+    "cluster_distance_threshold": float,
+    "split_similarity_threshold": float,
+    "render_workers": int,
+    "chart_mode": str,
+}
+# Options that need the caller's output folder or files, so a run using them stays local
+_LOCAL_ONLY_OPTIONS = ("append", "archive_path", "profile_path", "model_loader", "embedding_cache_dir")
+# Finished jobs whose results are kept for download
+_MAX_FINISHED_JOBS = 32
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class Job:
+    """One analysis request and its state."""
+
+    id: str
+    options: Dict[str, Any]
+    data_path: str
+    status: str = "queued"
+    stage: str = ""
+    step: int = 0
+    steps: int = 1
+    error: str | None = None
+    written: List[str] = field(default_factory=list)
+    result: bytes | None = None
+    submitted: float = field(default_factory=time.time)
+    finished: float | None = None
+    analyzer: Any = None
+    future: Future | None = None
+    cancel_requested: bool = False
+
+    def describe(self) -> Dict[str, Any]:
+        return {"id": self.id, "status": self.status, "stage": self.stage, "step": self.step, "steps": self.steps,
+                "error": self.error, "written": self.written,
+                "seconds": round((self.finished or time.time()) - self.submitted, 3)}
+
+
+class AnalysisService:
+    """The job queue behind the HTTP server; usable on its own from Python."""
+
+    def __init__(self, workers: int = 1, embedding_backend: str = DEFAULT_EMBEDDING_BACKEND) -> None:
+        self.embedding_backend = embedding_backend
+        self.workers = max(1, workers)
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._workdir = tempfile.mkdtemp(prefix="hgsfp-service-")
+
+    def warm_up(self) -> threading.Thread:
+        """Import the analysis code, load the model and parse the fonts in a background thread."""
+        def load() -> None:
+            try:
+                from fpdf import FPDF
+                from survey_analyzer import SurveyAnalyzer, shared_model_loader
+                shared_model_loader(backend=self.embedding_backend).get()
+                SurveyAnalyzer("", self._workdir)._change_pdf_font(FPDF())
+            except Exception:
+                # Failures are reported by the first job that needs the resource
+                traceback.print_exc()
+        thread = threading.Thread(target=load, name="service-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def submit(self, upload: io.BufferedIOBase, length: int, options: Dict[str, Any]) -> Job:
+        """Queue the analysis of the survey export read from *upload*."""
+        job_id = uuid.uuid4().hex
+        folder = os.path.join(self._workdir, job_id)
+        os.makedirs(folder)
+        data_path = os.path.join(folder, "survey.json")
+        try:
+            with open(data_path, "wb") as f:
+                remaining = length
+                while remaining > 0:
+                    chunk = upload.read(min(_UPLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise ValueError("The upload ended early.")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+        except BaseException:
+            # No job refers to the folder, so nothing else would remove it before shutdown
+            shutil.rmtree(folder, ignore_errors=True)
+            raise
+        job = Job(job_id, {"embedding_backend": self.embedding_backend, **options}, data_path)
+        with self._lock:
+            self.jobs[job_id] = job
+            self._forget_old_jobs()
+        job.future = self._pool.submit(self._run, job)
+        return job
+
+    def cancel(self, job: Job) -> None:
+        with self._lock:
+            job.cancel_requested = True
+            if job.status == "queued" and job.future is not None and job.future.cancel():
+                self._finish(job, "cancelled")
+                shutil.rmtree(os.path.dirname(job.data_path), ignore_errors=True)
+            elif job.status == "running" and job.analyzer is not None:
+                job.analyzer.cancel()
+
+    def status(self) -> Dict[str, Any]:
+        from survey_analyzer import shared_model_loader
+
+        with self._lock:
+            states = [job.status for job in self.jobs.values()]
+        return {"service": SERVICE_NAME, "api": API_VERSION, "pid": os.getpid(), "workers": self.workers,
+                "embedding_backend": self.embedding_backend,
+                "model_loaded": shared_model_loader(backend=self.embedding_backend).loaded,
+                "queued": states.count("queued"), "running": states.count("running")}
+
+    def close(self) -> None:
+        with self._lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            self.cancel(job)
+        self._pool.shutdown(wait=True)
+        shutil.rmtree(self._workdir, ignore_errors=True)
+
+    def _run(self, job: Job) -> None:
+        from survey_analyzer import MANIFEST_FILENAME, AnalysisCancelled, SurveyAnalyzer, shared_model_loader
+
+        folder = os.path.dirname(job.data_path)
+        output = os.path.join(folder, "output")
+        try:
+            options = dict(job.options)
+            loader = shared_model_loader(backend=options.pop("embedding_backend"))
+            with self._lock:
+                job.analyzer = SurveyAnalyzer(job.data_path, output, model_loader=loader,
+                                              progress=lambda stage, step, steps: self._progress(job, stage, step, steps),
+                                              **options)
+                job.status = "running"
+                if job.cancel_requested:
+                    # Cancelled between leaving the queue and getting here
+                    job.analyzer.cancel()
+            written = job.analyzer._perform_automated_analysis()
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                for name in written:
+                    archive.write(os.path.join(output, name), name)
+                # Lets the client's later local runs skip the reports that are still current
+                archive.write(os.path.join(output, MANIFEST_FILENAME), MANIFEST_FILENAME)
+            job.written, job.result = written, buffer.getvalue()
+            status = "done"
+        except AnalysisCancelled:
+            status = "cancelled"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+            status = "failed"
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+        with self._lock:
+            self._finish(job, status)
+        print(f"Job {job.id}: {status} after {job.finished - job.submitted:.1f} s.")
+
+    def _progress(self, job: Job, stage: str, step: int, steps: int) -> None:
+        job.stage, job.step, job.steps = stage, step, steps
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status, job.finished, job.analyzer = status, time.time(), None
+
+    def _forget_old_jobs(self) -> None:
+        finished = sorted((job for job in self.jobs.values() if job.finished is not None), key=lambda job: job.finished)
+        for job in finished[:max(0, len(finished) - _MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def do_GET(self) -> None:
+        parts = self._path_parts()
+        if parts == ["health"]:
+            self._send_json(200, self.server.service.status())
+            return
+        job = self._job(parts)
+        if job is None:
+            return
+        if len(parts) == 2:
+            self._send_json(200, job.describe())
+        elif len(parts) == 3 and parts[2] == "result":
+            if job.status != "done":
+                self._send_json(409, {"error": f"job is {job.status}"})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Content-Length", str(len(job.result)))
+            self.end_headers()
+            self.wfile.write(job.result)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        if self._path_parts() != ["jobs"]:
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            options = {}
+            for key, value in urllib.parse.parse_qsl(url.query):
+                if key not in REMOTE_OPTIONS:
+                    raise ValueError(f"Unsupported option {key!r}")
+                options[key] = REMOTE_OPTIONS[key](value)
+            if "render_workers" in options:
+                # 0 is one process per core, like on the command line; more than that only costs memory
+                if options["render_workers"] < 0:
+                    raise ValueError("render_workers must not be negative")
+                options["render_workers"] = min(options["render_workers"], os.cpu_count() or 1)
+            job = self.server.service.submit(self.rfile, int(self.headers.get("Content-Length", 0)), options)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(202, job.describe())
+
+    def do_DELETE(self) -> None:
+        parts = self._path_parts()
+        job = self._job(parts) if len(parts) == 2 else None
+        if job is not None:
+            self.server.service.cancel(job)
+            self._send_json(202, job.describe())
+        elif len(parts) != 2:
+            self._send_json(404, {"error": "not found"})
+
+    def _path_parts(self) -> List[str]:
+        return [part for part in urllib.parse.urlsplit(self.path).path.split("/") if part]
+
+    def _job(self, parts: List[str]) -> Job | None:
+        job = self.server.service.jobs.get(parts[1]) if len(parts) >= 2 and parts[0] == "jobs" else None
+        if job is None:
+            self._send_json(404, {"error": "no such job"})
+        return job
+
+    def _send_json(self, code: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Status polls would flood the console
+        if self.command != "GET":
+            super().log_message(format, *args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: AnalysisService) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 1,
+          embedding_backend: str = DEFAULT_EMBEDDING_BACKEND) -> None:
+    """Run the service until interrupted."""
+    service = AnalysisService(workers, embedding_backend)
+    server = _Server((host, port), service)
+    service.warm_up()
+    print(f"Survey analysis service listening on http://{host}:{port} ({service.workers} worker(s)); "
+          f"press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def service_url() -> str:
+    """Address clients use for the service."""
+    return os.environ.get("HGSFP_SERVICE_URL", DEFAULT_SERVICE_URL).rstrip("/")
+
+
+def service_available(url: str | None = None, timeout: float = 0.5) -> bool:
+    """Whether the service answers at *url* (default: ``service_url()``)."""
+    try:
+        with urllib.request.urlopen(f"{url or service_url()}/health", timeout=timeout) as response:
+            return json.load(response).get("service") == SERVICE_NAME
+    except (OSError, ValueError):
+        return False
+
+
+def supports_remote(options: Dict[str, Any]) -> bool:
+    """Whether a run with these SurveyAnalyzer *options* can be done by the service."""
+    return not any(options.get(name) for name in _LOCAL_ONLY_OPTIONS)
+
+
+class RemoteAnalysis:
+    """
+    Client side of one service job, used like a SurveyAnalyzer by the CLI and the GUI.
+
+    ``run`` uploads the export, reports the job's progress to *progress* like
+    SurveyAnalyzer does, and unpacks the reports into *output_path*.  ``cancel``
+    may be called from another thread; ``run`` then raises AnalysisCancelled.
+    Options the service does not accept (see REMOTE_OPTIONS) are ignored.
+    """
+
+    def __init__(self, data_path: str, output_path: str, url: str | None = None,
+                 progress: Callable[[str, int, int], None] | None = None, poll_interval: float = 0.25,
+                 **options: Any) -> None:
+        self.data_path = data_path
+        self.output_path = output_path
+        self.url = url or service_url()
+        self.progress = progress
+        self.poll_interval = poll_interval
+        self.options = {key: value for key, value in options.items() if key in REMOTE_OPTIONS}
+        self._job_id: str | None = None
+        self._cancelled = threading.Event()
+
+    def run(self) -> List[str]:
+        """Analyse the export on the service and return the names of the unpacked files."""
+        from survey_analyzer import MANIFEST_FILENAME, STATE_FILENAME, AnalysisCancelled
+
+        query = urllib.parse.urlencode({key: int(value) if isinstance(value, bool) else value
+                                        for key, value in self.options.items()})
+        with open(self.data_path, "rb") as f:
+            job = self._request("POST", f"/jobs?{query}", f, os.path.getsize(self.data_path))
+        self._job_id = job["id"]
+        if self._cancelled.is_set():
+            self._request("DELETE", f"/jobs/{self._job_id}")
+        last = None
+        while job["status"] in ("queued", "running"):
+            time.sleep(self.poll_interval)
+            job = self._request("GET", f"/jobs/{self._job_id}")
+            position = (job["stage"] or "Waiting for the service", job["step"], job["steps"])
+            if self.progress is not None and position != last:
+                self.progress(*position)
+                last = position
+        if job["status"] == "cancelled":
+            raise AnalysisCancelled()
+        if job["status"] != "done":
+            raise RuntimeError(f"The analysis service failed: {job['error']}")
+        with urllib.request.urlopen(f"{self.url}/jobs/{self._job_id}/result") as response:
+            archive = zipfile.ZipFile(io.BytesIO(response.read()))
+        os.makedirs(self.output_path, exist_ok=True)
+        # The reports replace the local ones, so the manifest they were written with
+        # replaces the local manifest, and an append-mode state no longer matches them.
+        state = os.path.join(self.output_path, STATE_FILENAME)
+        if os.path.exists(state):
+            os.remove(state)
+        archive.extractall(self.output_path)
+        reports = [name for name in archive.namelist() if name != MANIFEST_FILENAME]
+        print(f"Wrote {len(reports)} outputs to {self.output_path} (analysed by the service at {self.url}).")
+        return reports
+
+    def cancel(self) -> None:
+        """Stop the job; like SurveyAnalyzer.cancel, it stops at the job's next step."""
+        self._cancelled.set()
+        if self._job_id is not None:
+            try:
+                self._request("DELETE", f"/jobs/{self._job_id}")
+            except OSError:
+                pass
+
+    def _request(self, method: str, path: str, body: Any = None, length: int | None = None) -> Dict[str, Any]:
+        request = urllib.request.Request(f"{self.url}{path}", data=body, method=method)
+        if length is not None:
+            request.add_header("Content-Length", str(length))
+            request.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"The analysis service rejected the request: {json.load(e).get('error')}") from e
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Run the local survey analysis service.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="jobs analysed at the same time (default: %(default)s)")
+    parser.add_argument("--embedding-backend", choices=EMBEDDING_BACKENDS, default=DEFAULT_EMBEDDING_BACKEND,
+                        help="default embedding backend of the jobs (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    serve(args.host, args.port, args.workers, args.embedding_backend)
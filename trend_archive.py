@@ -0,0 +1,345 @@
+# Multi-year archive of the per-lecture answer histograms and the trend report built from it.
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import os
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+# fpdf2 is only needed for the report, not for recording statistics during an analysis
+if TYPE_CHECKING:
+    from fpdf import FPDF
+
+ARCHIVE_VERSION = 1
+DEFAULT_EVENT = "HGSFP Graduate Days"
+
+# Timeslots as stored in the archive, with their report headings
+TIMESLOTS: Tuple[Tuple[str, str], ...] = (
+    ("morning", "Morning Lectures"),
+    ("afternoon", "Afternoon Lectures"),
+    ("industry", "Industry Lecture"),
+)
+
+# Line colours of the questions in the trend charts
+_TREND_PALETTE: Tuple[Tuple[int, int, int], ...] = (
+    (31, 119, 180),
+    (255, 127, 14),
+    (44, 160, 44),
+    (214, 39, 40),
+    (148, 103, 189),
+    (140, 86, 75),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS questions (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS surveys (
+    event TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    responses INTEGER NOT NULL,
+    source TEXT,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (event, year)
+);
+CREATE TABLE IF NOT EXISTS lecture_answers (
+    event TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    timeslot TEXT NOT NULL,
+    lecture TEXT NOT NULL,
+    question TEXT NOT NULL,
+    a1 INTEGER NOT NULL, a2 INTEGER NOT NULL, a3 INTEGER NOT NULL, a4 INTEGER NOT NULL, a5 INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    total_sq INTEGER NOT NULL,
+    PRIMARY KEY (event, year, timeslot, lecture, question)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lecture_answers_by_lecture ON lecture_answers (lecture, event, year);
+"""
+
+# Sums of the histograms and sufficient statistics of a group of archive rows
+_SUMS = "SUM(a1), SUM(a2), SUM(a3), SUM(a4), SUM(a5), SUM(n), SUM(total), SUM(total_sq)"
+
+
+class TrendStatistics:
+    """
+    Answer statistics of one group (e.g. a timeslot) for every archived year.
+
+    ``histograms`` has shape (years, questions, 5); ``count``, ``total`` and
+    ``total_sq`` are the sufficient statistics (years x questions) they imply.
+    """
+
+    def __init__(self, years: List[int], questions: List[str], histograms: np.ndarray, sums: np.ndarray) -> None:
+        self.years = years
+        self.questions = questions
+        self.histograms = histograms
+        self.count, self.total, self.total_sq = sums[..., 0], sums[..., 1], sums[..., 2]
+
+    def mean_std(self, min_count: int = 6) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mean and sample standard deviation (ddof=1) per year and question.
+
+        Entries with fewer than *min_count* answers are NaN, as in the reports.
+        """
+        count = self.count.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self.total / count
+            std = np.sqrt((count * self.total_sq - self.total.astype(np.float64) ** 2) / (count * (count - 1)))
+        too_few = self.count < min_count
+        mean[too_few] = np.nan
+        std[too_few] = np.nan
+        return mean, std
+
+
+class TrendArchive:
+    """
+    SQLite archive of the per-lecture answer histograms of every analysed survey.
+
+    Every (event, year, timeslot, lecture, question) is one row holding the number of
+    1-5 answers together with their count, sum and sum of squares, so statistics of
+    any group of lectures and years are plain SQL sums.  Recording a survey replaces
+    what was archived for the same event and year, which keeps re-runs and append
+    runs idempotent.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            version = conn.execute("SELECT value FROM archive_meta WHERE key = 'version'").fetchone()
+            if version is None:
+                conn.execute("INSERT INTO archive_meta VALUES ('version', ?)", (str(ARCHIVE_VERSION),))
+            elif int(version[0]) != ARCHIVE_VERSION:
+                raise ValueError(f"{path} is a version {version[0]} trend archive; version {ARCHIVE_VERSION} is required.")
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection whose changes are committed on success; waits for concurrent writers."""
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, event: str, year: int, questions: Sequence[Tuple[str, str]],
+               lectures: Sequence[Tuple[str, str, np.ndarray]], responses: int, source: str | None = None) -> None:
+        """
+        Archive the answers of one survey, replacing any earlier record of *event* and *year*.
+
+        Args:
+            event: Name of the event, e.g. DEFAULT_EVENT.
+            year: Year the survey took place.
+            questions: (key, title) of every question, in questionnaire order.
+            lectures: (timeslot, lecture title, histograms) of every lecture, where the
+                histograms have shape (questions, 5).
+            responses: Number of survey responses.
+            source: Export the answers were read from, for reference.
+        """
+        keys = [key for key, _ in questions]
+        rows = []
+        for timeslot, lecture, hist in lectures:
+            hist = np.asarray(hist, dtype=np.int64)
+            values = np.arange(1, 6, dtype=np.int64)
+            stats = np.stack([hist.sum(axis=-1), hist @ values, hist @ (values * values)], axis=-1)
+            rows += [(event, year, timeslot, lecture, key, *map(int, hist[i]), *map(int, stats[i]))
+                     for i, key in enumerate(keys)]
+        recorded_at = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO questions VALUES (?, ?, ?)",
+                             [(key, i, title) for i, (key, title) in enumerate(questions)])
+            conn.execute("DELETE FROM lecture_answers WHERE event = ? AND year = ?", (event, year))
+            conn.executemany(f"INSERT INTO lecture_answers VALUES ({', '.join('?' * 13)})", rows)
+            conn.execute("INSERT OR REPLACE INTO surveys VALUES (?, ?, ?, ?, ?)",
+                         (event, year, responses, source, recorded_at))
+
+    def events(self) -> List[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT event FROM surveys ORDER BY event")]
+
+    def surveys(self, event: str) -> List[Tuple[int, int]]:
+        """(year, number of responses) of every archived survey of *event*."""
+        with self._connect() as conn:
+            return conn.execute("SELECT year, responses FROM surveys WHERE event = ? ORDER BY year", (event,)).fetchall()
+
+    def questions(self) -> List[Tuple[str, str]]:
+        """(key, title) of every archived question, in questionnaire order."""
+        with self._connect() as conn:
+            return conn.execute("SELECT key, title FROM questions ORDER BY position").fetchall()
+
+    def lectures(self, event: str) -> List[Tuple[str, str, int]]:
+        """(timeslot, lecture, number of years) of every archived lecture of *event*."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT timeslot, lecture, COUNT(DISTINCT year) FROM lecture_answers WHERE event = ? "
+                "GROUP BY timeslot, lecture ORDER BY timeslot, lecture", (event,)).fetchall()
+
+    def statistics(self, event: str, timeslot: str | None = None, lecture: str | None = None) -> TrendStatistics:
+        """
+        Year-by-year statistics of all lectures of *event*, optionally restricted to
+        one *timeslot* and/or one *lecture*.
+        """
+        where, params = "event = ?", [event]
+        if timeslot is not None:
+            where, params = where + " AND timeslot = ?", params + [timeslot]
+        if lecture is not None:
+            where, params = where + " AND lecture = ?", params + [lecture]
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT year, question, {_SUMS} FROM lecture_answers WHERE {where} "
+                                "GROUP BY year, question", params).fetchall()
+            questions = [row[0] for row in conn.execute("SELECT key FROM questions ORDER BY position")]
+        years = sorted({row[0] for row in rows})
+        year_index = {year: i for i, year in enumerate(years)}
+        question_index = {key: i for i, key in enumerate(questions)}
+        sums = np.zeros((len(years), len(questions), 8), dtype=np.int64)
+        for year, question, *values in rows:
+            sums[year_index[year], question_index[question]] = values
+        return TrendStatistics(years, questions, sums[..., :5], sums[..., 5:])
+
+
+class TrendReport:
+    """Year-over-year tables and charts of one event, drawn from a TrendArchive only."""
+
+    def __init__(self, archive: TrendArchive, event: str, font_dir: str | None = None) -> None:
+        self.archive = archive
+        self.event = event
+        self.font_dir = font_dir if font_dir is not None else os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+        self.titles = dict(archive.questions())
+
+    def write(self, path: str) -> None:
+        from fpdf import FPDF
+
+        pdf = FPDF()
+        pdf.add_font("dejavu-sans", style="", fname=os.path.join(self.font_dir, "DejaVuSans.ttf"))
+        pdf.add_font("dejavu-sans", style="b", fname=os.path.join(self.font_dir, "DejaVuSans-Bold.ttf"))
+        surveys = self.archive.surveys(self.event)
+        if not surveys:
+            raise ValueError(f"The archive holds no surveys of {self.event!r}.")
+        responses = ", ".join(f"{year}: {n}" for year, n in surveys)
+        self._write_group_page(pdf, f"{self.event}: All Lectures", self.archive.statistics(self.event),
+                               f"Responses per year ({responses}).")
+        for timeslot, heading in TIMESLOTS:
+            stats = self.archive.statistics(self.event, timeslot=timeslot)
+            if stats.years:
+                self._write_group_page(pdf, f"{self.event}: {heading}", stats)
+        # Lectures given in several years, e.g. a recurring course, get their own trend
+        for timeslot, lecture, n_years in self.archive.lectures(self.event):
+            if n_years > 1:
+                self._write_group_page(pdf, f"{lecture} ({dict(TIMESLOTS)[timeslot]})",
+                                       self.archive.statistics(self.event, timeslot=timeslot, lecture=lecture))
+        pdf.output(path)
+
+    def _write_group_page(self, pdf: FPDF, heading: str, stats: TrendStatistics, note: str = "") -> None:
+        """Add a landscape page with the mean ± std table of *stats* and a chart of the means."""
+        from fpdf import FontFace
+        from fpdf.enums import TableCellFillMode
+
+        mean, std = stats.mean_std()
+        pdf.add_page(orientation="landscape")
+        pdf.set_font("dejavu-sans", style="B", size=18)
+        pdf.write(text=f"{heading}\n\n")
+        pdf.set_font("dejavu-sans", size=9)
+        pdf.write(text=(
+            "Mean ± sample standard deviation (n) per question and year.  "
+            f"Cells show N/A when fewer than 6 responses were recorded.  {note}\n\n"
+        ))
+
+        table_width = int(pdf.w - 2 * pdf.l_margin)
+        question_col_w = int(table_width * 0.3)
+        year_col_w = int((table_width - question_col_w) / max(len(stats.years), 1))
+        with pdf.table(
+            borders_layout="SINGLE_TOP_LINE",
+            cell_fill_color=(224, 235, 255),
+            cell_fill_mode=TableCellFillMode.ROWS,
+            col_widths=tuple([question_col_w] + [year_col_w] * len(stats.years)),
+            headings_style=FontFace(emphasis="BOLD", color=255, fill_color=(50, 100, 160)),
+            line_height=6,
+            text_align="CENTER",
+            width=question_col_w + year_col_w * len(stats.years),
+        ) as table:
+            row = table.row()
+            row.cell("Question", align="LEFT")
+            for year in stats.years:
+                row.cell(str(year))
+            for q, question in enumerate(stats.questions):
+                row = table.row()
+                row.cell(self.titles.get(question, question), align="LEFT")
+                for y in range(len(stats.years)):
+                    row.cell("N/A" if np.isnan(mean[y, q])
+                             else f"{mean[y, q]:.2f} ± {std[y, q]:.2f} ({stats.count[y, q]})")
+
+        top = pdf.get_y() + 8
+        self._draw_trend_chart(pdf, stats, mean, pdf.l_margin, top, table_width, pdf.h - pdf.b_margin - top)
+
+    def _draw_trend_chart(self, pdf: FPDF, stats: TrendStatistics, mean: np.ndarray,
+                          x: float, y: float, w: float, h: float) -> None:
+        """Draw the mean of every question over the years as lines on a 1-5 axis."""
+        if h < 40:
+            return
+        legend_w = 62
+        plot_x, plot_w = x + 10, w - legend_w - 14
+        plot_y, plot_h = y + 2, h - 12
+
+        def to_x(i: int) -> float:
+            return plot_x + plot_w / 2 if len(stats.years) == 1 else plot_x + plot_w * i / (len(stats.years) - 1)
+
+        def to_y(value: float) -> float:
+            return plot_y + plot_h * (5 - value) / 4
+
+        pdf.set_font("dejavu-sans", size=8)
+        pdf.set_line_width(0.1)
+        pdf.set_draw_color(200)
+        for value in range(1, 6):
+            pdf.line(plot_x, to_y(value), plot_x + plot_w, to_y(value))
+            pdf.text(x + 4, to_y(value) + 1, str(value))
+        for i, year in enumerate(stats.years):
+            pdf.text(to_x(i) - pdf.get_string_width(str(year)) / 2, plot_y + plot_h + 6, str(year))
+
+        pdf.set_line_width(0.6)
+        for q, question in enumerate(stats.questions):
+            color = _TREND_PALETTE[q % len(_TREND_PALETTE)]
+            pdf.set_draw_color(*color)
+            pdf.set_fill_color(*color)
+            points = [(to_x(i), to_y(mean[i, q])) for i in range(len(stats.years)) if not np.isnan(mean[i, q])]
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                pdf.line(x0, y0, x1, y1)
+            for px, py in points:
+                pdf.circle(px, py, 0.9, style="F")
+            legend_y = plot_y + 6 * q
+            pdf.line(plot_x + plot_w + 6, legend_y, plot_x + plot_w + 12, legend_y)
+            pdf.text(plot_x + plot_w + 14, legend_y + 1, self.titles.get(question, question))
+        pdf.set_draw_color(0)
+        pdf.set_fill_color(255)
+        pdf.set_line_width(0.2)
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write the year-over-year trend report of a survey statistics archive.")
+    parser.add_argument("archive", help="trend archive written with survey_analyzer.py --archive")
+    parser.add_argument("output", help="PDF file the report is written to")
+    parser.add_argument("--event", default=None, help="event to report on (default: the only one in the archive)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    start = time.perf_counter()
+    if not os.path.isfile(args.archive):
+        raise SystemExit(f"No trend archive at {args.archive}.")
+    archive = TrendArchive(args.archive)
+    event = args.event
+    if event is None:
+        events = archive.events()
+        if len(events) != 1:
+            raise SystemExit(f"Choose one of the archived events with --event: {', '.join(events) or 'none'}.")
+        event = events[0]
+    TrendReport(archive, event).write(args.output)
+    print(f"Wrote the trend report of {event} in {time.perf_counter() - start:.2f} s.")